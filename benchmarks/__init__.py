@@ -0,0 +1 @@
+"""성능 벤치마크와 합성 문제 은행 생성기"""
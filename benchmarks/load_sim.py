@@ -0,0 +1,329 @@
+"""
+동시 사용자 부하 시뮬레이터 - Streamlit 앱 테스트 API로 실제 페이지를 프로세스 안에서 실행
+
+가상 사용자 N명이 각자 스레드에서 메인 페이지 -> 시험 모드(번호 범위 선택, 시험 시작, 답변, 결과 확인)
+-> 학습 모드 순서로 생각 시간(think time)을 두고 페이지를 조작한다.
+AppTest는 전역 런타임을 공유해 동시에 실행할 수 없으므로 스크립트 실행은 잠금으로 한 번에 하나씩 처리한다.
+GIL 때문에 한 서버 프로세스도 스크립트를 사실상 하나씩 실행하므로, 대기 시간을 포함한 응답 시간이
+동시 사용자 수에 따른 지연을 나타낸다 (서비스 시간은 잠금 안에서의 실행 시간).
+사용자 수 단계별로 재실행(rerun) 지연 시간 분포, 세션당 메모리, 전체 RSS를 측정해
+용량 보고서(JSON)로 저장하며, 이전 보고서와 비교할 수 있다. 네트워크 없이 한 대의 Linux 서버에서 실행된다.
+
+사용법:
+    python -m benchmarks.load_sim --users 1 5 10 20 [--bank-size 1000] [-o capacity.json] [--compare prev.json]
+"""
+import argparse
+import gc
+import json
+import logging
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from collections import defaultdict
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PAGES = {
+    'app': os.path.join(ROOT, "app.py"),
+    'learning': os.path.join(ROOT, "pages", "learning_mode.py"),
+    'exam': os.path.join(ROOT, "pages", "exam_mode.py"),
+}
+DEFAULT_USERS = (1, 5, 10)
+DEFAULT_BANK_SIZE = 1000
+DEFAULT_EXAM_SIZE = 20
+DEFAULT_THINK = (0.2, 1.0)
+DEFAULT_TIMEOUT = 60
+
+_run_lock = threading.Lock()
+
+
+# 현재 프로세스의 RSS (MB, /proc/self/status 기준)
+def rss_mb():
+    try:
+        with open("/proc/self/status", encoding='ascii') as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    import resource
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+class Recorder:
+    """재실행 응답/서비스 시간과 오류를 스레드 안전하게 모으는 객체"""
+
+    def __init__(self):
+        self.samples = defaultdict(list)
+        self.service = []
+        self.errors = []
+        self._lock = threading.Lock()
+
+    def add(self, action, response_ms, service_ms):
+        with self._lock:
+            self.samples[action].append(response_ms)
+            self.service.append(service_ms)
+
+    def error(self, message):
+        with self._lock:
+            self.errors.append(message)
+
+    def all_samples(self):
+        return [ms for samples in self.samples.values() for ms in samples]
+
+
+class VirtualUser:
+    """한 명의 가상 사용자 - 페이지별 AppTest 인스턴스를 끝까지 보관 (세션 메모리 측정용)"""
+
+    def __init__(self, uid, recorder, rnd, max_number, exam_size, think, timeout):
+        self.uid = uid
+        self.recorder = recorder
+        self.rnd = rnd
+        self.max_number = max_number
+        self.exam_size = exam_size
+        self.think_range = think
+        self.timeout = timeout
+        self.apps = []
+
+    def think(self):
+        time.sleep(self.rnd.uniform(*self.think_range))
+
+    def _open(self, page):
+        from streamlit.testing.v1 import AppTest
+        at = AppTest.from_file(PAGES[page], default_timeout=self.timeout)
+        self.apps.append(at)
+        self.run(at, f"{page}.open")
+        return at
+
+    # AppTest 재실행 한 번의 응답 시간(대기 포함)과 서비스 시간 기록 (스크립트 예외는 오류로 집계)
+    def run(self, at, action):
+        queued = time.perf_counter()
+        with _run_lock:
+            started = time.perf_counter()
+            at.run()
+            finished = time.perf_counter()
+        self.recorder.add(action, (finished - queued) * 1000, (finished - started) * 1000)
+        if at.exception:
+            raise RuntimeError(f"{action}: {at.exception[0].message}")
+
+    # 단일 선택은 선택지 버튼, 다중 선택은 체크박스 두 개 + 제출 버튼
+    def _answer(self, at, prefix, submit_key):
+        buttons = [b for b in at.button if b.key and b.key.startswith(f"{prefix}_opt_")]
+        if buttons:
+            self.rnd.choice(buttons).click()
+            return True
+        checkboxes = [c for c in at.checkbox if c.key and c.key.startswith(f"{prefix}_chk_")]
+        if not checkboxes:
+            return False
+        for checkbox in self.rnd.sample(checkboxes, min(2, len(checkboxes))):
+            checkbox.check()
+        at.button(key=submit_key).click()
+        return True
+
+    def exam_session(self):
+        at = self._open('exam')
+        self.think()
+        start = self.rnd.randint(1, max(1, self.max_number - self.exam_size + 1))
+        at.text_area(key="question_numbers_input").input(f"{start}~{start + self.exam_size - 1}")
+        at.button(key="apply_input_numbers").click()
+        self.run(at, "exam.select")
+        self.think()
+        at.button(key="start_exam_btn").click()
+        self.run(at, "exam.start")
+
+        for _ in range(self.exam_size):
+            if at.session_state["show_exam_result"]:
+                break
+            self.think()
+            if not self._answer(at, "exam", "exam_submit_btn"):
+                break
+            self.run(at, "exam.answer")
+
+        if at.session_state["show_exam_result"]:
+            self.think()
+            next_page = at.button(key="results_next_page")
+            if not next_page.disabled:
+                next_page.click()
+                self.run(at, "exam.results")
+
+    def learning_session(self, answers=3):
+        at = self._open('learning')
+        for _ in range(answers):
+            self.think()
+            if not self._answer(at, "learning", "submit_answer_btn"):
+                break
+            self.run(at, "learning.answer")
+            at.button(key="next_btn").click()
+            self.run(at, "learning.next")
+
+    def __call__(self):
+        try:
+            self._open('app')
+            self.think()
+            self.exam_session()
+            self.learning_session()
+        except Exception as e:
+            self.recorder.error(f"user {self.uid}: {e}")
+
+
+def _summary(samples):
+    if not samples:
+        return {'count': 0}
+    from benchmarks.run import percentile
+    return {
+        'count': len(samples),
+        'p50_ms': round(percentile(samples, 50), 2),
+        'p95_ms': round(percentile(samples, 95), 2),
+        'p99_ms': round(percentile(samples, 99), 2),
+        'max_ms': round(max(samples), 2),
+        'mean_ms': round(statistics.fmean(samples), 2),
+    }
+
+
+# 사용자 수 한 단계 실행 (ramp_up초 동안 나누어 시작)
+def run_level(users, max_number, args, seed):
+    recorder = Recorder()
+    gc.collect()
+    rss_before = rss_mb()
+    virtual_users = [
+        VirtualUser(uid, recorder, random.Random(seed * 1000 + uid), max_number,
+                    args.exam_size, tuple(args.think), args.timeout)
+        for uid in range(users)
+    ]
+    threads = []
+    started = time.perf_counter()
+    for user in virtual_users:
+        thread = threading.Thread(target=user, name=f"virtual-user-{user.uid}", daemon=True)
+        threads.append(thread)
+        thread.start()
+        time.sleep(args.ramp_up / users)
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    # 세션(AppTest)이 살아 있는 동안 측정
+    gc.collect()
+    rss_after = rss_mb()
+    reruns = recorder.all_samples()
+    level = {
+        'users': users,
+        'elapsed_s': round(elapsed, 2),
+        'reruns_per_s': round(len(reruns) / elapsed, 2) if elapsed else 0,
+        'errors': len(recorder.errors),
+        'error_samples': recorder.errors[:5],
+        'latency': _summary(reruns),
+        'service': _summary(recorder.service),
+        'actions': {action: _summary(samples) for action, samples in sorted(recorder.samples.items())},
+        'rss_mb': round(rss_after, 1),
+        'per_session_mb': round(max(rss_after - rss_before, 0) / users, 2),
+    }
+    del virtual_users
+    return level
+
+
+def _git_revision():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True,
+                              text=True, timeout=5).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def print_report(report, previous=None):
+    previous_levels = {level['users']: level for level in (previous or {}).get('levels', [])}
+    print(f"{'users':>6} {'reruns':>7} {'rerun/s':>8} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} "
+          f"{'svc p50':>9} {'RSS MB':>8} {'MB/세션':>8} {'errors':>7}")
+    for level in report['levels']:
+        latency = level['latency']
+        line = (f"{level['users']:>6} {latency.get('count', 0):>7} {level['reruns_per_s']:>8.1f} "
+                f"{latency.get('p50_ms', 0):>9.1f} {latency.get('p95_ms', 0):>9.1f} "
+                f"{latency.get('p99_ms', 0):>9.1f} {level['service'].get('p50_ms', 0):>9.1f} "
+                f"{level['rss_mb']:>8.1f} {level['per_session_mb']:>8.2f} {level['errors']:>7}")
+        before = previous_levels.get(level['users'])
+        if before and before['latency'].get('p95_ms'):
+            change = (latency.get('p95_ms', 0) / before['latency']['p95_ms'] - 1) * 100
+            line += f"   p95 {change:+.0f}% (이전 {before['latency']['p95_ms']:.1f} ms)"
+        print(line)
+        for message in level['error_samples']:
+            print(f"         ! {message}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="가상 사용자로 앱 페이지에 동시 부하를 주고 용량 보고서를 만듭니다.")
+    parser.add_argument('--users', type=int, nargs='+', default=list(DEFAULT_USERS), help="단계별 동시 사용자 수")
+    parser.add_argument('--bank-size', type=int, default=DEFAULT_BANK_SIZE, help="합성 문제 은행 크기")
+    parser.add_argument('--bank', help="합성 문제 대신 사용할 문제 JSON 파일")
+    parser.add_argument('--exam-size', type=int, default=DEFAULT_EXAM_SIZE, help="가상 사용자별 시험 문제 수")
+    parser.add_argument('--think', type=float, nargs=2, default=list(DEFAULT_THINK), metavar=('MIN', 'MAX'),
+                        help="조작 사이 생각 시간 범위 (초)")
+    parser.add_argument('--ramp-up', type=float, default=2.0, help="사용자를 나누어 시작하는 시간 (초)")
+    parser.add_argument('--timeout', type=float, default=DEFAULT_TIMEOUT, help="재실행 한 번의 제한 시간 (초)")
+    parser.add_argument('--seed', type=int, default=0, help="난수 seed")
+    parser.add_argument('-o', '--output', help="용량 보고서 JSON 파일")
+    parser.add_argument('--compare', help="비교할 이전 용량 보고서")
+    args = parser.parse_args(argv)
+    # AppTest를 사용자 스레드에서 조작할 때 나오는 bare mode 경고 숨김
+    logging.getLogger("streamlit.runtime.scriptrunner_utils.script_run_context").addFilter(
+        lambda record: "missing ScriptRunContext" not in record.getMessage())
+
+    with tempfile.TemporaryDirectory() as workdir:
+        bank_path = args.bank
+        if bank_path is None:
+            from benchmarks.synthetic import generate_questions
+            bank_path = os.path.join(workdir, "questions.json")
+            with open(bank_path, 'w', encoding='utf-8') as f:
+                json.dump(generate_questions(args.bank_size, seed=args.seed), f, ensure_ascii=False)
+        # 페이지가 import하기 전에 문제 파일과 세션 저장 위치를 지정
+        os.environ['SAP_QUIZ_BANK'] = os.path.abspath(bank_path)
+        os.environ['SAP_QUIZ_SESSION_DIR'] = os.path.join(workdir, "session_data")
+        sys.path.insert(0, ROOT)
+
+        from quiz.bank import load_bank
+        bank = load_bank(os.environ['SAP_QUIZ_BANK'])
+        max_number = bank.available_numbers[-1] if len(bank.available_numbers) else 1
+
+        report = {
+            'meta': {
+                'created_at': time.strftime("%Y-%m-%dT%H:%M:%S"),
+                'revision': _git_revision(),
+                'python': platform.python_version(),
+                'streamlit': __import__('streamlit').__version__,
+                'bank_size': len(bank),
+                'exam_size': args.exam_size,
+                'think_s': args.think,
+            },
+            'levels': [],
+        }
+        # 모듈 import와 문제 은행 로드 비용이 첫 단계의 세션 메모리에 섞이지 않도록 한 번 미리 실행
+        run_level(1, max_number, argparse.Namespace(**{**vars(args), 'think': [0, 0]}), args.seed)
+        for users in args.users:
+            report['levels'].append(run_level(users, max_number, args, args.seed))
+
+        # 임시 디렉터리를 지우기 전에 대기 중인 세션, 문제 통계, 시험 기록을 저장
+        from quiz.autosave import get_autosaver
+        from quiz.history import get_history_store
+        from quiz.stats import get_stats_store
+        get_autosaver().flush()
+        get_stats_store().flush()
+        get_history_store().flush()
+
+    previous = None
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            previous = json.load(f)
+    print_report(report, previous)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"용량 보고서를 {args.output}에 저장했습니다.")
+    return 1 if any(level['errors'] for level in report['levels']) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,179 @@
+"""
+성능 벤치마크 - 합성 문제 은행으로 로드, 선택, 필터링, 채점, 저장 단계를 측정
+
+각 단계의 처리량(문제/초), 지연 시간 백분위(p50/p95/p99), 최대 메모리(tracemalloc)를 출력하고
+benchmarks/baselines.json의 기준값보다 허용 범위 이상 느려지거나 메모리를 더 쓰면 실패(종료 코드 1)한다.
+
+사용법:
+    python -m benchmarks.run [--sizes 1000 10000] [--tolerance 0.5] [--update-baselines]
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from benchmarks.synthetic import generate_questions
+from quiz.bank import QuestionBank
+from quiz.compiled import MappedQuestionBank, compile_bank
+from quiz.grading import option_bit
+from quiz.scoring import score_attempt
+from quiz.selection import parse_question_numbers
+from quiz.session_store import SQLiteSessionStore, save_session_state
+from quiz.views import select_questions
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baselines.json")
+DEFAULT_SIZES = (1000, 10000)
+DEFAULT_TOLERANCE = 0.5
+MIN_ITERATIONS = 5
+TIME_BUDGET = 1.0
+# 이보다 작은 차이는 측정 오차로 보고 회귀로 판단하지 않음
+MIN_DELTA_MS = 0.05
+MIN_DELTA_KB = 64
+
+
+# 최소 반복 횟수와 시간 예산 안에서 반복 실행한 지연 시간(ms) 목록
+def _time(func):
+    samples = []
+    started = time.perf_counter()
+    while len(samples) < MIN_ITERATIONS or time.perf_counter() - started < TIME_BUDGET:
+        t0 = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - t0) * 1000)
+        if len(samples) >= 1000:
+            break
+    return samples
+
+
+def _peak_kb(func):
+    tracemalloc.start()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1] / 1024
+    finally:
+        tracemalloc.stop()
+
+
+# 최근접 순위 방식의 백분위 값
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+# 크기별 벤치마크 대상 함수 준비 (이름 -> 인자 없는 함수)
+def build_cases(size, workdir):
+    questions = generate_questions(size)
+    data = json.dumps(questions, ensure_ascii=False).encode('utf-8')
+    qbank_path = os.path.join(workdir, f"bench_{size}.qbank")
+    compile_bank(questions, qbank_path)
+
+    bank = QuestionBank(questions)
+    # 약 100개 구간으로 된 선택 입력 (예: "1~5,11~15,...")
+    step = max(size // 100, 2)
+    selection_text = ",".join(f"{start}~{start + step // 2}" for start in range(1, size + 1, step))
+    selection = parse_question_numbers(selection_text) & bank.available_intervals
+    view = select_questions(bank, selection)
+    answers = {pos: option_bit('A') for pos in view.positions}
+    store = SQLiteSessionStore(path=os.path.join(workdir, f"bench_{size}.db"))
+    state = {
+        'selected_question_numbers': selection,
+        'filtered_exam_questions': view,
+        'exam_user_answers': answers,
+        'current_exam_index': len(view) - 1,
+        'show_exam_result': True,
+    }
+
+    return {
+        'load.json': lambda: QuestionBank(json.loads(data.decode('utf-8'))),
+        'load.qbank': lambda: MappedQuestionBank(qbank_path).answer_mask(1),
+        'select': lambda: parse_question_numbers(selection_text) & bank.available_intervals,
+        'filter': lambda: select_questions(bank, selection),
+        'grade': lambda: score_attempt(view, answers),
+        'persist': lambda: save_session_state(state, "bench", bank, store=store),
+    }
+
+
+def run(sizes):
+    results = {}
+    with tempfile.TemporaryDirectory() as workdir:
+        for size in sizes:
+            for name, func in build_cases(size, workdir).items():
+                samples = _time(func)
+                mean_ms = statistics.fmean(samples)
+                results[f"{name}@{size}"] = {
+                    'iterations': len(samples),
+                    'p50_ms': percentile(samples, 50),
+                    'p95_ms': percentile(samples, 95),
+                    'p99_ms': percentile(samples, 99),
+                    'throughput': size / (mean_ms / 1000) if mean_ms else float('inf'),
+                    'peak_kb': _peak_kb(func),
+                }
+    return results
+
+
+# 기준값과 비교해 회귀한 항목의 설명 목록 반환
+def compare(results, baselines, tolerance):
+    regressions = []
+    for key, result in results.items():
+        base = baselines.get(key)
+        if base is None:
+            continue
+        if result['p50_ms'] > base['p50_ms'] * (1 + tolerance) and \
+                result['p50_ms'] - base['p50_ms'] > MIN_DELTA_MS:
+            regressions.append(f"{key}: p50 {base['p50_ms']:.3f} ms -> {result['p50_ms']:.3f} ms")
+        if result['peak_kb'] > base['peak_kb'] * (1 + tolerance) and \
+                result['peak_kb'] - base['peak_kb'] > MIN_DELTA_KB:
+            regressions.append(f"{key}: peak {base['peak_kb']:.0f} KB -> {result['peak_kb']:.0f} KB")
+    return regressions
+
+
+def print_results(results):
+    print(f"{'benchmark':<20} {'iter':>6} {'p50 ms':>10} {'p95 ms':>10} {'p99 ms':>10} "
+          f"{'문제/초':>14} {'peak KB':>10}")
+    for key, r in results.items():
+        print(f"{key:<20} {r['iterations']:>6} {r['p50_ms']:>10.3f} {r['p95_ms']:>10.3f} "
+              f"{r['p99_ms']:>10.3f} {r['throughput']:>14,.0f} {r['peak_kb']:>10.0f}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="문제 은행 처리 단계별 성능을 측정합니다.")
+    parser.add_argument('--sizes', type=int, nargs='+', default=list(DEFAULT_SIZES), help="문제 수 목록")
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE,
+                        help="기준값 대비 허용 증가율 (0.5 = 50%%)")
+    parser.add_argument('--baselines', default=BASELINE_PATH, help="기준값 파일")
+    parser.add_argument('--update-baselines', action='store_true', help="이번 결과를 기준값으로 저장")
+    args = parser.parse_args(argv)
+
+    results = run(args.sizes)
+    print_results(results)
+
+    try:
+        with open(args.baselines, 'r', encoding='utf-8') as f:
+            baselines = json.load(f)
+    except FileNotFoundError:
+        baselines = {}
+
+    if args.update_baselines:
+        for key, r in results.items():
+            baselines[key] = {'p50_ms': round(r['p50_ms'], 4), 'peak_kb': round(r['peak_kb'], 1)}
+        with open(args.baselines, 'w', encoding='utf-8') as f:
+            json.dump(dict(sorted(baselines.items())), f, indent=2)
+            f.write("\n")
+        print(f"기준값을 {args.baselines}에 저장했습니다.")
+        return 0
+
+    regressions = compare(results, baselines, args.tolerance)
+    if regressions:
+        print("\n성능 회귀:")
+        for line in regressions:
+            print(f"  - {line}")
+        return 1
+    print("\n기준값 대비 회귀 없음")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
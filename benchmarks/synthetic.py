@@ -0,0 +1,115 @@
+"""
+벤치마크용 합성 SAP 문제 은행 생성기
+
+같은 (문제 수, seed)에 대해 항상 같은 문제 목록을 만든다.
+단일/다중 정답, 4~6개 선택지, 한국어와 영어가 섞인 긴 지문을 포함한다.
+
+사용법:
+    python -m benchmarks.synthetic 10000 -o bench_questions.json [--seed 0] [--compile]
+"""
+import argparse
+import json
+import random
+import sys
+
+from quiz.grading import OPTION_LETTERS
+
+MODULES = ["MM", "SD", "FI", "CO", "PP", "WM", "QM", "PM", "HCM", "EWM"]
+TRANSACTIONS = ["MIGO", "ME21N", "VA01", "VL01N", "FB60", "F-28", "CO01", "MD04", "MM60", "KS01", "VF01", "ME2M"]
+OBJECTS = ["구매 오더", "판매 오더", "자재 마스터", "고객 마스터", "코스트 센터", "생산 오더",
+           "입고 문서", "청구 문서", "출하 문서", "회계 전표", "공급업체 송장", "BOM"]
+KO_SENTENCES = [
+    "회사는 {module} 모듈에서 {obj}를 관리하고 있습니다.",
+    "컨설턴트는 트랜잭션 {tcode}를 사용하여 {obj}를 생성하려고 합니다.",
+    "{obj}가 저장된 후 후속 문서가 자동으로 생성되어야 합니다.",
+    "사용자는 {obj}의 상태를 변경할 권한이 없다는 메시지를 받았습니다.",
+    "플랜트 {plant}의 저장 위치 {sloc}에서 재고 이동이 발생했습니다.",
+    "월말 마감 전에 {obj}와 관련된 미결 항목을 정리해야 합니다.",
+]
+EN_SENTENCES = [
+    "The business process requires posting a {obj_en} with movement type {mvt}.",
+    "Which configuration step in SPRO ensures that {tcode} derives the correct account?",
+    "A user reports that the {obj_en} cannot be released because of a missing condition record.",
+    "The system should determine the output automatically when the {obj_en} is saved.",
+    "Consider the integration between {module} and FI when the goods movement is posted.",
+]
+OBJECTS_EN = ["purchase order", "sales order", "material document", "billing document",
+              "delivery", "production order", "vendor invoice", "journal entry"]
+QUESTION_ENDINGS = [
+    "다음 중 올바른 설명은 무엇입니까?",
+    "이 요구 사항을 충족하려면 무엇을 설정해야 합니까?",
+    "What should the consultant do? (Choose the correct answer.)",
+    "Which of the following statements are true? (Choose all that apply.)",
+]
+OPTION_TEMPLATES = [
+    "{tcode}에서 {obj}의 필드 선택 그룹을 변경합니다.",
+    "Maintain the {obj_en} type in customizing and assign it to the plant {plant}.",
+    "{module} 모듈의 번호 범위를 {obj}에 대해 새로 정의합니다.",
+    "Create a condition record for output type {mvt} using {tcode}.",
+    "{obj}의 계정 결정 규칙을 수정하고 이동 유형 {mvt}를 할당합니다.",
+    "Run the report {tcode} in background mode for plant {plant}.",
+    "사용자 권한 프로필에 {obj} 변경 권한을 추가합니다.",
+    "No configuration is required; the standard system handles the {obj_en}.",
+]
+
+
+def _fill(rnd, template):
+    return template.format(
+        module=rnd.choice(MODULES),
+        tcode=rnd.choice(TRANSACTIONS),
+        obj=rnd.choice(OBJECTS),
+        obj_en=rnd.choice(OBJECTS_EN),
+        plant=rnd.randint(1000, 1999),
+        sloc=rnd.randint(1, 99),
+        mvt=rnd.randint(101, 699),
+    )
+
+
+# 문제 하나 생성 (number는 정수 번호, multi_ratio는 다중 정답 문제 비율)
+def generate_question(rnd, number, multi_ratio=0.25):
+    sentences = [_fill(rnd, rnd.choice(KO_SENTENCES + EN_SENTENCES)) for _ in range(rnd.randint(2, 8))]
+    multi = rnd.random() < multi_ratio
+    ending = QUESTION_ENDINGS[rnd.choice((1, 3)) if multi else rnd.choice((0, 2))]
+    option_count = rnd.choice((4, 4, 5, 5, 6))
+    letters = OPTION_LETTERS[:option_count]
+    options = {letter: _fill(rnd, rnd.choice(OPTION_TEMPLATES)) for letter in letters}
+    answer_count = rnd.choice((2, 2, 3)) if multi else 1
+    answer = ",".join(sorted(rnd.sample(letters, answer_count)))
+    return {
+        "number": str(number),
+        "question": " ".join(sentences) + " " + ending,
+        "options": options,
+        "answer": answer,
+    }
+
+
+# count개의 문제 목록 생성 (같은 count, seed이면 항상 같은 결과)
+def generate_questions(count, seed=0, multi_ratio=0.25):
+    rnd = random.Random(seed)
+    return [generate_question(rnd, number, multi_ratio) for number in range(1, count + 1)]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="벤치마크용 합성 문제 은행을 생성합니다.")
+    parser.add_argument('count', type=int, help="문제 수 (예: 1000 ~ 1000000)")
+    parser.add_argument('-o', '--output', default="bench_questions.json", help="출력 JSON 파일")
+    parser.add_argument('--seed', type=int, default=0, help="난수 seed")
+    parser.add_argument('--multi-ratio', type=float, default=0.25, help="다중 정답 문제 비율")
+    parser.add_argument('--compile', action='store_true', help=".qbank 파일도 함께 생성")
+    args = parser.parse_args(argv)
+
+    questions = generate_questions(args.count, seed=args.seed, multi_ratio=args.multi_ratio)
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(questions, f, ensure_ascii=False)
+    print(f"{len(questions)}개 문제를 {args.output}에 저장했습니다.")
+
+    if args.compile:
+        from quiz.bank import compiled_path
+        from quiz.compiled import compile_bank
+        compile_bank(questions, compiled_path(args.output))
+        print(f"컴파일된 문제 은행: {compiled_path(args.output)}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
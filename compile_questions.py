@@ -0,0 +1,49 @@
+"""
+questions.json을 mmap으로 여는 컴파일된 문제 은행(.qbank)으로 변환하는 스크립트
+
+사용법:
+    python compile_questions.py [questions.json] [-o questions.qbank] [--no-index]
+
+기본 출력 경로로 컴파일하면 검색 색인(questions.idx)도 함께 만들어 둔다.
+"""
+import argparse
+import json
+import sys
+import time
+
+from quiz.bank import compiled_path, default_bank_path, load_bank
+from quiz.compiled import compile_bank
+from quiz.search import get_index, index_path
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="문제 JSON 파일을 .qbank 형식으로 컴파일합니다.")
+    parser.add_argument('source', nargs='?', default=default_bank_path(), help="원본 문제 JSON 파일")
+    parser.add_argument('-o', '--output', help="출력 파일 (기본값: 원본과 같은 이름의 .qbank)")
+    parser.add_argument('--no-index', action='store_true', help="검색 색인을 만들지 않음")
+    args = parser.parse_args(argv)
+
+    output = args.output or compiled_path(args.source)
+    started = time.perf_counter()
+    try:
+        with open(args.source, 'r', encoding='utf-8') as f:
+            questions = json.load(f)
+        count = compile_bank(questions, output)
+    except (OSError, ValueError) as e:
+        print(f"컴파일 실패: {e}", file=sys.stderr)
+        return 1
+
+    elapsed = time.perf_counter() - started
+    print(f"{count}개 문제를 {output}에 컴파일했습니다. ({elapsed:.2f}초)")
+
+    # 앱이 여는 것과 같은 문제 은행(컴파일 결과)으로 색인을 만들어야 첫 실행에서 다시 만들지 않음
+    if not args.no_index and output == compiled_path(args.source):
+        started = time.perf_counter()
+        get_index(load_bank(args.source))
+        elapsed = time.perf_counter() - started
+        print(f"검색 색인을 {index_path(args.source)}에 저장했습니다. ({elapsed:.2f}초)")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,54 @@
+"""
+시험 기록(session_data/history)을 답안 한 행씩 CSV 또는 Parquet 파일로 내보내는 스크립트
+
+사용법:
+    python export_history.py history.csv [--bank BANK_ID] [--format csv|parquet] [--compact]
+
+세그먼트 파일을 하나씩 변환해 이어 쓰므로 기록이 커도 메모리를 일정하게 쓴다.
+Parquet으로 내보내려면 pyarrow가 필요하다.
+"""
+import argparse
+import sys
+import time
+
+from quiz.history import HistoryStore, export_csv, export_parquet
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="시험 기록을 CSV 또는 Parquet 파일로 내보냅니다.")
+    parser.add_argument('output', help="출력 파일 (- 이면 표준 출력으로 CSV)")
+    parser.add_argument('--bank', help="이 문제 은행(카탈로그 id)의 기록만 내보냄")
+    parser.add_argument('--format', choices=('csv', 'parquet'),
+                        help="출력 형식 (기본값: 출력 파일 확장자, .parquet이 아니면 csv)")
+    parser.add_argument('--compact', action='store_true', help="내보내기 전에 세그먼트를 하나로 합침")
+    args = parser.parse_args(argv)
+
+    output_format = args.format or ('parquet' if args.output.endswith('.parquet') else 'csv')
+    store = HistoryStore()
+    started = time.perf_counter()
+    if args.compact:
+        store.compact()
+
+    try:
+        if output_format == 'parquet':
+            rows = export_parquet(store, args.output, args.bank)
+        elif args.output == '-':
+            rows = export_csv(store, sys.stdout, args.bank)
+        else:
+            with open(args.output, 'w', encoding='utf-8', newline='') as f:
+                rows = export_csv(store, f, args.bank)
+    except ImportError:
+        print("Parquet으로 내보내려면 pyarrow를 설치하세요: pip install pyarrow", file=sys.stderr)
+        return 1
+    except OSError as e:
+        print(f"내보내기 실패: {e}", file=sys.stderr)
+        return 1
+
+    elapsed = time.perf_counter() - started
+    if args.output != '-':
+        print(f"답안 {rows:,}행을 {args.output}에 내보냈습니다. ({elapsed:.2f}초)")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,339 @@
+"""
+PDF 문제집에서 문제를 추출해 questions.json 형식으로 저장하는 스크립트
+
+- 페이지 텍스트 추출(PyPDF2)은 프로세스 풀에서 병렬로 처리하고, 페이지 순서대로 받아 바로 파싱한다.
+- 완성된 문제는 하나씩 출력 파일에 쓰므로 전체 문제 목록을 메모리에 만들지 않는다.
+  (임시 파일에 쓴 뒤 마지막에 교체하므로 실행 중인 앱이 쓰다 만 파일을 읽지 않음)
+- 페이지 텍스트는 페이지 내용 해시로 캐시(.extract_cache/pages.db)해 두어, PDF를 고친 뒤 다시 실행하면
+  바뀐 페이지만 다시 추출한다.
+- 답이나 선택지가 이상한 문제는 검증 보고서(<출력>.report.json)에 기록한다.
+
+인식하는 형식 (영문/한글):
+
+    QUESTION 12            문제 12
+    문제 본문 ...           문제 본문 ...
+    A. 선택지              A) 선택지
+    B. 선택지              B) 선택지
+    Answer: A, C           정답: A,C
+
+사용법:
+    python extract_questions.py dump.pdf [more.pdf ...] [-o questions.json] [-j 4] [--no-cache]
+"""
+import argparse
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import PyPDF2
+
+from quiz.bank import DEFAULT_BANK_PATH, normalize_number
+from quiz.grading import OPTION_LETTERS
+
+CACHE_DIR = ".extract_cache"
+CHUNK_SIZE = 8
+CACHE_BATCH = 64
+# 추출기 버전이 바뀌면 캐시된 텍스트를 쓰지 않음
+EXTRACTOR_VERSION = f"PyPDF2-{PyPDF2.__version__}"
+
+QUESTION_PATTERN = re.compile(r'^\s*(?:QUESTION|Question|문제)\s*(?:NO\.?|No\.?|#)?\s*(\d+)\s*[.:)]?\s*(.*)$')
+OPTION_PATTERN = re.compile(r'^\s*([A-Z])\s*[.)]\s+(.*)$')
+ANSWER_PATTERN = re.compile(r'^\s*(?:Correct\s+Answer|Answer|ANSWER|정답)\s*[:：]?\s*([A-Z](?:\s*[,/&]?\s*[A-Z])*)\s*\.?\s*$')
+# 해설 이후 다음 문제까지는 문제 내용이 아님
+EXPLANATION_PATTERN = re.compile(r'^\s*(?:Explanation|EXPLANATION|Reference|해설)\b')
+# 머리말/꼬리말 (쪽 번호)
+NOISE_PATTERN = re.compile(r'^\s*(?:Page\s+\d+(?:\s+of\s+\d+)?|\d+\s*/\s*\d+|\d+)\s*$', re.IGNORECASE)
+
+
+# 정답 문자열을 정렬된 'A,C' 형식으로 정규화
+def normalize_answer(text):
+    return ",".join(sorted(set(re.findall(r'[A-Z]', text)), key=OPTION_LETTERS.index))
+
+
+class QuestionParser:
+    """
+    페이지 텍스트를 순서대로 받아 문제 레코드를 만드는 상태 기계
+    (문제가 여러 페이지에 걸쳐 있어도 다음 문제 머리글이 나올 때 완성된 것으로 봄)
+    """
+
+    def __init__(self):
+        self._current = None
+        self._target = None
+
+    def _start(self, number, first_line):
+        finished = self._finish()
+        self._current = {'number': number, 'question': [first_line] if first_line else [],
+                         'options': {}, 'answer': None, 'page': self._page}
+        self._target = self._current['question']
+        return finished
+
+    def _finish(self):
+        current, self._current, self._target = self._current, None, None
+        if current is None:
+            return None
+        current['question'] = " ".join(current['question']).strip()
+        current['options'] = {key: " ".join(lines).strip() for key, lines in current['options'].items()}
+        return current
+
+    def feed(self, page_number, text):
+        """페이지 하나의 텍스트를 파싱하고 이 페이지에서 완성된 문제 목록 반환"""
+        self._page = page_number
+        finished = []
+        for line in text.splitlines():
+            line = line.strip()
+            if not line or NOISE_PATTERN.match(line):
+                continue
+            match = QUESTION_PATTERN.match(line)
+            if match:
+                record = self._start(match.group(1), match.group(2).strip())
+                if record is not None:
+                    finished.append(record)
+                continue
+            if self._current is None:
+                continue
+            match = ANSWER_PATTERN.match(line)
+            if match:
+                self._current['answer'] = normalize_answer(match.group(1))
+                self._target = None
+                continue
+            if EXPLANATION_PATTERN.match(line):
+                self._target = None
+                continue
+            match = OPTION_PATTERN.match(line)
+            if match and self._current['answer'] is None and (self._current['question'] or self._current['options']):
+                key = match.group(1)
+                self._target = self._current['options'].setdefault(key, [])
+                if match.group(2):
+                    self._target.append(match.group(2).strip())
+                continue
+            # 줄바꿈된 본문/선택지는 마지막 항목에 이어 붙임
+            if self._target is not None:
+                self._target.append(line)
+        return finished
+
+    def close(self):
+        """마지막 문제 반환 (없으면 None)"""
+        return self._finish()
+
+
+# 문제 하나의 검증 - (수준, 내용) 목록
+def validate(record):
+    issues = []
+    options = record['options']
+    if not record['question']:
+        issues.append(('error', "문제 본문이 없습니다"))
+    if not options:
+        issues.append(('error', "선택지가 없습니다"))
+    elif len(options) < 2:
+        issues.append(('warning', "선택지가 하나뿐입니다"))
+    else:
+        keys = sorted(options, key=OPTION_LETTERS.index)
+        if "".join(keys) != OPTION_LETTERS[:len(keys)]:
+            issues.append(('warning', f"선택지 기호가 연속되지 않습니다: {','.join(keys)}"))
+    empty = [key for key, text in options.items() if not text]
+    if empty:
+        issues.append(('warning', f"내용이 없는 선택지: {','.join(empty)}"))
+    if not record['answer']:
+        issues.append(('error', "정답이 없습니다"))
+    else:
+        missing = [key for key in record['answer'].split(',') if key not in options]
+        if missing:
+            issues.append(('error', f"선택지에 없는 정답: {','.join(missing)}"))
+    return issues
+
+
+# ---- 페이지 텍스트 추출 (작업 프로세스) ----
+
+_readers = {}
+_cache_conn = None
+
+
+def _init_worker(cache_path):
+    global _cache_conn
+    if cache_path and os.path.exists(cache_path):
+        _cache_conn = sqlite3.connect(f"file:{cache_path}?mode=ro", uri=True, timeout=10)
+
+
+# 페이지 내용 해시 - 내용 스트림과 글꼴 이름 (텍스트 추출 결과를 결정하는 부분)
+def page_hash(page):
+    digest = hashlib.sha1(EXTRACTOR_VERSION.encode('ascii'))
+    contents = page.get_contents()
+    if contents is not None:
+        digest.update(contents.get_data())
+    resources = page.get('/Resources')
+    fonts = resources.get_object().get('/Font') if resources is not None else None
+    if fonts is not None:
+        fonts = fonts.get_object()
+        for name in sorted(fonts):
+            digest.update(name.encode('utf-8'))
+            digest.update(str(fonts[name].get_object().get('/BaseFont', '')).encode('utf-8'))
+    return digest.hexdigest()
+
+
+# 페이지 하나의 (해시, 텍스트, 캐시 사용 여부)
+def _extract_page(task):
+    path, index = task
+    reader = _readers.get(path)
+    if reader is None:
+        reader = _readers[path] = PyPDF2.PdfReader(path)
+    page = reader.pages[index]
+    key = page_hash(page)
+    if _cache_conn is not None:
+        row = _cache_conn.execute("SELECT text FROM pages WHERE hash = ?", (key,)).fetchone()
+        if row is not None:
+            return key, row[0], True
+    return key, page.extract_text() or "", False
+
+
+class PageCache:
+    """페이지 내용 해시 -> 추출 텍스트 (SQLite, 주 프로세스만 씀)"""
+
+    def __init__(self, path):
+        self.path = path
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path, timeout=10)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("CREATE TABLE IF NOT EXISTS pages (hash TEXT PRIMARY KEY, text TEXT NOT NULL)")
+        self._conn.commit()
+        self._pending = []
+
+    def add(self, key, text):
+        self._pending.append((key, text))
+        if len(self._pending) >= CACHE_BATCH:
+            self.flush()
+
+    def flush(self):
+        if self._pending:
+            with self._conn:
+                self._conn.executemany("INSERT OR REPLACE INTO pages (hash, text) VALUES (?, ?)", self._pending)
+            self._pending = []
+
+    def close(self):
+        self.flush()
+        self._conn.close()
+
+
+# ---- 출력 ----
+
+class JSONArrayWriter:
+    """레코드를 하나씩 JSON 배열로 쓰는 출력 (임시 파일에 쓰고 close에서 원자적으로 교체)"""
+
+    def __init__(self, path):
+        self.path = path
+        self.count = 0
+        fd, self._tmp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)), suffix='.json.tmp')
+        self._file = os.fdopen(fd, 'w', encoding='utf-8')
+        self._file.write("[")
+
+    def write(self, record):
+        self._file.write(",\n    " if self.count else "\n    ")
+        self._file.write(json.dumps(record, ensure_ascii=False))
+        self.count += 1
+
+    def close(self):
+        self._file.write("\n]\n" if self.count else "]\n")
+        self._file.close()
+        os.replace(self._tmp_path, self.path)
+
+    def abort(self):
+        self._file.close()
+        os.unlink(self._tmp_path)
+
+
+def extract(pdf_paths, output, report_path, jobs=None, cache_path=None, skip_invalid=False, log=print):
+    """PDF 목록에서 문제를 추출해 output에 쓰고 (문제 수, 검증 보고서) 반환"""
+    tasks = []
+    for path in pdf_paths:
+        tasks.extend((path, index) for index in range(len(PyPDF2.PdfReader(path).pages)))
+
+    cache = PageCache(cache_path) if cache_path else None
+    writer = JSONArrayWriter(output)
+    parser = QuestionParser()
+    report = {'pages': len(tasks), 'cached_pages': 0, 'questions': 0, 'skipped': 0, 'issues': []}
+    seen_numbers = set()
+
+    def emit(record):
+        source_page = record.pop('page')
+        issues = validate(record)
+        if record['number'] in seen_numbers:
+            issues.append(('warning', "중복된 문제 번호입니다"))
+        seen_numbers.add(record['number'])
+        for level, message in issues:
+            report['issues'].append({'number': record['number'], 'page': source_page,
+                                     'level': level, 'message': message})
+        if skip_invalid and any(level == 'error' for level, _ in issues):
+            report['skipped'] += 1
+            return
+        # load_bank가 읽는 형식 그대로 (number, question, options, answer)
+        writer.write({'number': record['number'], 'question': record['question'],
+                      'options': record['options'], 'answer': record['answer'] or ""})
+
+    try:
+        with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker, initargs=(cache_path,)) as pool:
+            # map은 제출 순서대로 결과를 돌려주므로 받은 페이지부터 바로 파싱하고 쓸 수 있음
+            for done, ((path, index), (key, text, cached)) in enumerate(
+                    zip(tasks, pool.map(_extract_page, tasks, chunksize=CHUNK_SIZE)), start=1):
+                if cached:
+                    report['cached_pages'] += 1
+                elif cache is not None:
+                    cache.add(key, text)
+                for record in parser.feed(f"{os.path.basename(path)}:{index + 1}", text):
+                    emit(record)
+                if done % 100 == 0:
+                    log(f"  {done}/{len(tasks)} 페이지 처리 (문제 {writer.count}개)")
+        record = parser.close()
+        if record is not None:
+            emit(record)
+    except BaseException:
+        writer.abort()
+        raise
+    finally:
+        if cache is not None:
+            cache.close()
+    writer.close()
+
+    report['questions'] = writer.count
+    # 번호가 비어 있는 구간 (문제가 빠졌을 가능성)
+    numbers = sorted(n for n in map(normalize_number, seen_numbers) if n is not None)
+    report['missing_numbers'] = [n for a, b in zip(numbers, numbers[1:]) for n in range(a + 1, b)][:1000]
+    with open(report_path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    return writer.count, report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="PDF 문제집에서 문제를 추출해 questions.json을 만듭니다.")
+    parser.add_argument('pdfs', nargs='+', help="문제 PDF 파일 (여러 개면 순서대로 이어 붙임)")
+    parser.add_argument('-o', '--output', default=DEFAULT_BANK_PATH, help="출력 JSON 파일")
+    parser.add_argument('-j', '--jobs', type=int, help="작업 프로세스 수 (기본값: CPU 수)")
+    parser.add_argument('--report', help="검증 보고서 파일 (기본값: <출력>.report.json)")
+    parser.add_argument('--cache-dir', default=CACHE_DIR, help="페이지 텍스트 캐시 디렉터리")
+    parser.add_argument('--no-cache', action='store_true', help="페이지 캐시를 쓰지 않음")
+    parser.add_argument('--skip-invalid', action='store_true', help="정답/선택지 오류가 있는 문제는 쓰지 않음")
+    args = parser.parse_args(argv)
+
+    report_path = args.report or os.path.splitext(args.output)[0] + ".report.json"
+    cache_path = None if args.no_cache else os.path.join(args.cache_dir, "pages.db")
+    started = time.perf_counter()
+    try:
+        count, report = extract(args.pdfs, args.output, report_path, args.jobs, cache_path, args.skip_invalid)
+    except (OSError, PyPDF2.errors.PdfReadError) as e:
+        print(f"추출 실패: {e}", file=sys.stderr)
+        return 1
+
+    elapsed = time.perf_counter() - started
+    errors = sum(1 for issue in report['issues'] if issue['level'] == 'error')
+    warnings = len(report['issues']) - errors
+    print(f"{report['pages']}개 페이지(캐시 {report['cached_pages']}개)에서 {count}개 문제를 "
+          f"{args.output}에 저장했습니다. ({elapsed:.2f}초)")
+    print(f"검증: 오류 {errors}건, 경고 {warnings}건, 제외 {report['skipped']}개 -> {report_path}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
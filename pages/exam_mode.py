@@ -1,8 +1,21 @@
 import streamlit as st
-import json
-import random
 import pandas as pd
-import os
+import time
+
+import numpy as np
+
+from quiz.grading import OPTION_LETTERS, option_bit, popcount
+from quiz.history import bank_version, get_history_store
+from quiz.render import question_html, review_html
+from quiz.scoring import score_attempt
+from quiz.search import get_index, search_selection
+from quiz.sampling import sample_questions
+from quiz.stats import get_stats_store, hardest_selection, miss_weights
+from quiz.selection import IntervalSet, parse_question_numbers
+from quiz.tracing import span
+from quiz.ui import (autosave, bank_selector, countdown, ensure_session, get_bank, inject_styles, notify,
+                     request_app_rerun, select_exam_questions, show_trace, start_fragment, start_trace)
+from quiz.views import QuestionView, select_questions
 
 # 페이지 기본 설정
 st.set_page_config(
@@ -11,112 +24,37 @@ st.set_page_config(
     layout="centered"
 )
 
-# 스타일 설정
-st.markdown("""
-<style>
-    .main {
-        padding: 2rem;
-    }
-    .question-box {
-        background-color: #f8f9fa;
-        padding: 1.5rem;
-        border-radius: 10px;
-        margin-bottom: 1rem;
-        box-shadow: 0 0 5px rgba(0,0,0,0.1);
-    }
-    .option-box {
-        padding: 0.5rem;
-        border-radius: 5px;
-        margin-bottom: 0.5rem;
-    }
-    .option-box:hover {
-        background-color: #e9ecef;
-    }
-    .correct {
-        background-color: #d4edda;
-    }
-    .incorrect {
-        background-color: #f8d7da;
-    }
-    .result-box {
-        padding: 1rem;
-        border-radius: 5px;
-        text-align: center;
-        font-weight: bold;
-        margin-top: 1rem;
-    }
-    .result-correct {
-        background-color: #d4edda;
-        color: #155724;
-    }
-    .result-incorrect {
-        background-color: #f8d7da;
-        color: #721c24;
-    }
-    .smaller-question {
-        font-size: 0.95rem;
-    }
-</style>
-""", unsafe_allow_html=True)
-
-# 문제 데이터 로드 함수
-@st.cache_data
-def load_questions():
-    try:
-        with open('questions.json', 'r', encoding='utf-8') as f:
-            return json.load(f)
-    except Exception as e:
-        st.error(f"문제 데이터를 불러오는 데 실패했습니다: {e}")
-        return []
-
-# 문제 셔플 함수
-def shuffle_questions(questions):
-    shuffled = questions.copy()
-    random.shuffle(shuffled)
-    return shuffled
-
-# 정답 비교 함수 - 다중 정답 지원
-def check_exam_answer(user_answer, correct_answer):
-    # 정답이 쉼표로 구분된 여러 답변인 경우 처리
-    if ',' in correct_answer:
-        correct_options = correct_answer.split(',')
-        
-        # 사용자 응답이 목록인 경우
-        if isinstance(user_answer, list):
-            user_options = user_answer
-        else:
-            user_options = user_answer.split(',')
-        
-        # 정답 수와 사용자 답변 수가 같은지 확인
-        if len(correct_options) != len(user_options):
-            return False
-        
-        # 모든 정답이 사용자 답변에 포함되어 있는지 확인
-        for option in correct_options:
-            if option.strip() not in [opt.strip() for opt in user_options]:
-                return False
-        
-        return True
-    else:
-        # 단일 정답인 경우
-        if isinstance(user_answer, list):
-            return len(user_answer) == 1 and user_answer[0] == correct_answer
-        else:
-            return user_answer == correct_answer
+# 구간 추적 (?trace=1 일 때만)
+start_trace("exam_mode")
+
+# 공용 스타일 설정
+inject_styles()
+
+# 공유 문제 은행 (프로세스 전체에서 한 번만 로드)
+bank = get_bank()
+
+# 세션 식별자 준비 및 저장된 세션 복원
+ensure_session(bank)
 
 # 세션 상태 초기화
 if 'exam_questions' not in st.session_state:
-    st.session_state.exam_questions = load_questions()
+    st.session_state.exam_questions = QuestionView(bank)
     
+# 선택된 문제 번호는 구간 집합으로 보관 (예: 1~50, 70)
 if 'selected_question_numbers' not in st.session_state:
-    st.session_state.selected_question_numbers = []
+    st.session_state.selected_question_numbers = IntervalSet()
+elif not isinstance(st.session_state.selected_question_numbers, IntervalSet):
+    # 번호 목록으로 저장된 이전 세션
+    st.session_state.selected_question_numbers = IntervalSet.from_sorted_numbers(
+        sorted(st.session_state.selected_question_numbers))
     
 if 'filtered_exam_questions' not in st.session_state:
-    st.session_state.filtered_exam_questions = []
+    st.session_state.filtered_exam_questions = QuestionView(bank, [])
     
 if 'current_exam_index' not in st.session_state:
     st.session_state.current_exam_index = 0
     
+# 문제 은행 위치 -> 선택한 답 비트마스크 (quiz.grading 참고)
 if 'exam_user_answers' not in st.session_state:
     st.session_state.exam_user_answers = {}
     
@@ -125,82 +63,153 @@ if 'show_exam_result' not in st.session_state:
     
 if 'exam_score' not in st.session_state:
     st.session_state.exam_score = 0
+
+# 채점 결과 캐시 (마지막 문제 답변 시 한 번만 계산하고 결과 화면에서 재사용)
+if 'exam_result' not in st.session_state:
+    st.session_state.exam_result = None
+
+# 결과 화면은 한 페이지씩 표시
+RESULTS_PAGE_SIZE = 20
+RESULT_LABEL_LENGTH = 60
+RESULT_FILTERS = ["전체", "오답만", "다중 정답만"]
     
 if 'exam_shuffled' not in st.session_state:
     st.session_state.exam_shuffled = False
 
+# 제한 시간 (초, 0이면 제한 없음)과 마감 시각 - 마감 시각은 서버 시각으로 세션에 저장하고 판정도 서버에서만 함
+if 'exam_time_limit' not in st.session_state:
+    st.session_state.exam_time_limit = 0
+
+if 'exam_deadline' not in st.session_state:
+    st.session_state.exam_deadline = None
+
+if 'exam_timed_out' not in st.session_state:
+    st.session_state.exam_timed_out = False
+
+# 무작위 출제 조건과 seed (선택 문제를 무작위로 뽑았을 때만, 같은 조건과 seed로 다시 뽑을 수 있음)
+if 'exam_sample' not in st.session_state:
+    st.session_state.exam_sample = None
+
+# 시험 시작 시각 (시험 기록에 남김)
+if 'exam_started_at' not in st.session_state:
+    st.session_state.exam_started_at = None
+
+# 제출 요청이 서버에 닿기까지의 지연을 감안한 여유 시간
+DEADLINE_GRACE_SECONDS = 2
+
 # 선택된 문제들로 필터링하는 함수 수정 - 안전한 타입 변환
 def filter_questions_by_selection():
     if st.session_state.selected_question_numbers:
-        # 선택된 번호와 일치하는 문제들만 필터링 - 안전한 변환
-        filtered_questions = []
-        for q in st.session_state.exam_questions:
-            try:
-                # 안전하게 숫자로 변환
-                question_num = q.get('number', '')
-                if question_num and str(question_num).strip():  # 빈 값이 아닌지 확인
-                    num = int(str(question_num).strip())
-                    if num in st.session_state.selected_question_numbers:
-                        filtered_questions.append(q)
-            except (ValueError, TypeError):
-                # 변환할 수 없는 값은 무시
-                continue
-        
-        st.session_state.filtered_exam_questions = filtered_questions
-        print(f"Debug: 선택된 번호: {st.session_state.selected_question_numbers}")
-        print(f"Debug: 필터링된 문제 수: {len(st.session_state.filtered_exam_questions)}")
+        # 선택 구간마다 정렬된 번호 배열을 이분 탐색해 위치를 번호 순서대로 모음 (위치 배열 뷰만 저장)
+        with span("filter"):
+            st.session_state.filtered_exam_questions = select_questions(bank, st.session_state.selected_question_numbers)
     else:
-        st.session_state.filtered_exam_questions = []
+        st.session_state.filtered_exam_questions = QuestionView(bank, [])
 
-# 선택된 문제들로 시험 시작하는 함수 수정
+# 시험 시각 기록 시작 (제한 시간이 없으면 마감 시각도 없음)
+def start_exam_clock():
+    time_limit = st.session_state.exam_time_limit
+    st.session_state.exam_started_at = time.time()
+    st.session_state.exam_deadline = st.session_state.exam_started_at + time_limit if time_limit else None
+    st.session_state.exam_timed_out = False
+
+# 제한 시간이 지났는지 서버 시각으로 확인 (화면 갱신 횟수와 무관)
+def exam_time_expired():
+    deadline = st.session_state.exam_deadline
+    return deadline is not None and time.time() > deadline + DEADLINE_GRACE_SECONDS
+
+# 선택된 문제들로 시험 시작하는 함수 수정 (사이드바 조각의 콜백 - 문제 화면도 바뀌므로 전체 실행 요청)
+# 제한 시간을 입력했으면 시간 제한 시험으로 시작
 def start_selected_exam():
-    print(f"Debug: 시험 시작 함수 호출됨")
-    print(f"Debug: 선택된 문제 번호: {st.session_state.selected_question_numbers}")
-    
     filter_questions_by_selection()
     
-    print(f"Debug: 필터링 후 문제 수: {len(st.session_state.filtered_exam_questions)}")
-    
     if st.session_state.filtered_exam_questions:
+        request_app_rerun()
+        # 새로 고른 문제는 번호 순서이므로 섞기 상태도 초기화
+        st.session_state.exam_shuffled = False
         st.session_state.current_exam_index = 0
         st.session_state.exam_user_answers = {}
         st.session_state.show_exam_result = False
         st.session_state.exam_score = 0
-        st.toast(f"{len(st.session_state.filtered_exam_questions)}개 문제로 시험을 시작합니다!", icon="🎯")
-        print(f"Debug: 시험 시작 성공!")
+        st.session_state.exam_result = None
+        st.session_state.exam_time_limit = int(st.session_state.get('exam_time_limit_input', 0)) * 60
+        start_exam_clock()
+        reset_results_view()
+        autosave(bank, 'selected_question_numbers', 'exam_sample', 'filtered_exam_questions', 'exam_shuffled',
+                 'current_exam_index', 'exam_user_answers', 'show_exam_result', 'exam_score',
+                 'exam_time_limit', 'exam_deadline', 'exam_timed_out', 'exam_started_at')
+        message = f"{len(st.session_state.filtered_exam_questions)}개 문제로 시험을 시작합니다!"
+        if st.session_state.exam_time_limit:
+            message += f" (제한 시간 {st.session_state.exam_time_limit // 60}분)"
+        notify(message, icon="🎯")
     else:
-        st.toast("문제를 선택해주세요!", icon="⚠️")
-        print(f"Debug: 필터링된 문제가 없음")
+        notify("문제를 선택해주세요!", icon="⚠️")
+
+# 시험을 마치고 채점하는 함수 (마지막 문제 답변, 제한 시간 종료, 직접 종료)
+def finish_exam():
+    # 이미 채점한 시험 (자동 채점 뒤 늦게 온 제출, 종료 버튼 두 번 클릭)은 통계와 기록에 다시 더하지 않음
+    if st.session_state.show_exam_result:
+        return
+    calculate_exam_score()
+    st.session_state.show_exam_result = True
+    st.session_state.exam_timed_out = exam_time_expired()
+    # 채점한 답안을 문제별 통계에 더함 (답하지 않은 문제는 제외)
+    get_stats_store().record_attempt(st.session_state.bank_id, st.session_state.exam_result)
+    # 문제별 답안 전체를 시험 기록에 추가 (백그라운드에서 모아 세그먼트 파일로 저장)
+    get_history_store().record_attempt(
+        st.session_state.session_id, st.session_state.bank_id,
+        bank_version(st.session_state.filtered_exam_questions.bank), st.session_state.exam_result,
+        st.session_state.exam_started_at, time.time(), st.session_state.exam_timed_out,
+        st.session_state.filtered_exam_questions.shuffle_seed)
+    autosave(st.session_state.filtered_exam_questions.bank,
+             'exam_user_answers', 'current_exam_index', 'show_exam_result', 'exam_score', 'exam_timed_out')
 
 # 사용자 응답 처리 함수 (수정)
-def handle_exam_answer(question_number, selected_options):
-    st.session_state.exam_user_answers[question_number] = selected_options
+def handle_exam_answer(position, selected_mask):
+    # 채점이 끝난 뒤 이전 화면에서 온 답은 무시
+    if st.session_state.show_exam_result:
+        return
+    # 제한 시간이 지난 뒤 제출한 답은 받지 않고 그때까지의 답으로 채점
+    if exam_time_expired():
+        finish_exam()
+        notify("제한 시간이 지나 마지막 답은 반영되지 않았습니다.", icon="⏰")
+        return
+    st.session_state.exam_user_answers[position] = selected_mask
     if st.session_state.current_exam_index < len(st.session_state.filtered_exam_questions) - 1:
         st.session_state.current_exam_index += 1
+        # 바뀐 키만 자동 저장 (시험 문제 뷰가 가리키는 문제 은행 기준)
+        autosave(st.session_state.filtered_exam_questions.bank, 'exam_user_answers', 'current_exam_index')
     else:
-        calculate_exam_score()
-        st.session_state.show_exam_result = True
+        finish_exam()
+
+# 다중 선택 문제의 정답 제출 콜백 - 체크박스 값을 모아 답변 처리
+def submit_exam_answer(position, question_number, option_keys):
+    selected_mask = 0
+    for opt_key in option_keys:
+        if st.session_state.get(f"exam_chk_{question_number}_{opt_key}"):
+            selected_mask |= option_bit(opt_key)
+    if selected_mask:
+        handle_exam_answer(position, selected_mask)
+    else:
+        notify("최소한 하나의 답을 선택해주세요.", icon="⚠️")
 
 # 점수 계산 함수 (수정)
 def calculate_exam_score():
-    correct_count = 0
-    for q_num, answers in st.session_state.exam_user_answers.items():
-        correct_answer = next((q['answer'] for q in st.session_state.filtered_exam_questions if q['number'] == q_num), None)
-        
-        # 다중 정답 지원
-        if ',' in correct_answer:
-            # 사용자 응답을 정렬하여 비교
-            user_sorted = ','.join(sorted(answers))
-            correct_sorted = ','.join(sorted(correct_answer.split(',')))
-            if user_sorted == correct_sorted:
-                correct_count += 1
-        else:
-            # 단일 정답
-            if len(answers) == 1 and answers[0] == correct_answer:
-                correct_count += 1
-    
-    st.session_state.exam_score = correct_count
-    return correct_count
+    # 시험 문제 뷰가 가리키는 문제 은행 기준으로 시험 전체를 한 번에 채점 (시험 도중 문제 파일이 바뀌어도 유지)
+    with span("grade"):
+        result = score_attempt(st.session_state.filtered_exam_questions, st.session_state.exam_user_answers)
+    st.session_state.exam_result = result
+    st.session_state.exam_score = result.score
+    return result.score
+
+# 결과 화면 페이지 이동 함수
+def set_results_page(page):
+    st.session_state.results_page = page
+
+# 결과 화면 필터/페이지 초기화 함수 (새 시험에는 이전 시험의 번호 범위를 쓰지 않음)
+def reset_results_view():
+    for key in ('results_page', 'results_filter', 'results_from', 'results_to'):
+        st.session_state.pop(key, None)
 
 # 퀴즈 재시작 함수 (수정)
 def restart_exam():
@@ -208,80 +217,103 @@ def restart_exam():
     st.session_state.exam_user_answers = {}
     st.session_state.show_exam_result = False
     st.session_state.exam_score = 0
+    st.session_state.exam_result = None
+    start_exam_clock()
+    reset_results_view()
+    autosave(st.session_state.filtered_exam_questions.bank, 'filtered_exam_questions', 'exam_shuffled',
+             'current_exam_index', 'exam_user_answers', 'show_exam_result', 'exam_score',
+             'exam_deadline', 'exam_timed_out', 'exam_started_at')
 
 # 문제 섞기 함수 (수정)
 def shuffle_and_restart_exam():
     if st.session_state.filtered_exam_questions:
-        st.session_state.filtered_exam_questions = shuffle_questions(st.session_state.filtered_exam_questions)
+        st.session_state.filtered_exam_questions = st.session_state.filtered_exam_questions.shuffled()
         st.session_state.exam_shuffled = True
         restart_exam()
 
-# 범위 문자열 파싱 함수 추가 (기존 함수들 다음에 추가)
-def parse_question_numbers(input_text):
-    """
-    입력 문자열을 파싱하여 문제 번호 리스트 반환
-    예시: 
-    - "1,2,3,5" -> [1, 2, 3, 5]
-    - "1~10" -> [1, 2, 3, ..., 10]
-    - "1,5~8,12" -> [1, 5, 6, 7, 8, 12]
-    """
-    try:
-        numbers = []
-        input_text = input_text.strip()
-        
-        # 쉼표로 구분된 각 부분 처리
-        parts = input_text.split(',')
-        
-        for part in parts:
-            part = part.strip()
-            if '~' in part or '-' in part:
-                # 범위 처리
-                separator = '~' if '~' in part else '-'
-                start, end = part.split(separator)
-                start_num = int(start.strip())
-                end_num = int(end.strip())
-                numbers.extend(list(range(start_num, end_num + 1)))
-            else:
-                # 단일 번호
-                numbers.append(int(part))
-        
-        # 중복 제거 및 정렬
-        return sorted(list(set(numbers)))
-    except (ValueError, AttributeError):
-        return []
+# 문제 순서 초기화 함수 - 지금 시험 문제를 섞기 전 순서(선택한 번호 순서)로 되돌리고 seed도 지움
+def reset_exam_order():
+    st.session_state.filtered_exam_questions = st.session_state.filtered_exam_questions.unshuffled()
+    st.session_state.exam_shuffled = False
+    restart_exam()
 
-# 메인 앱 UI - 시험 모드
-st.title("📝 시험 모드")
+# 선택 문제를 바꾸는 콜백 (선택 상태 표시는 같은 사이드바 조각 안에 있으므로 조각만 다시 실행)
+def set_selection(numbers, message=None, icon="✅"):
+    select_exam_questions(numbers)
+    if message:
+        notify(message, icon)
 
-# 사이드바
-with st.sidebar:
+# 입력한 번호로 선택하는 콜백 - 실제 존재하는 문제만 선택 (유효 번호 구간과의 교집합)
+def apply_input_numbers():
+    question_input = st.session_state.question_numbers_input
+    if not question_input.strip():
+        notify("❌ 문제 번호를 입력해주세요!", icon="❌")
+        return
+    with span("selection.parse"):
+        parsed_numbers = parse_question_numbers(question_input)
+    if not parsed_numbers:
+        notify("❌ 올바른 형식으로 입력해주세요!", icon="❌")
+        return
+    valid_numbers = parsed_numbers & bank.available_intervals
+    invalid_numbers = parsed_numbers - bank.available_intervals
+    if not valid_numbers:
+        notify("❌ 유효한 문제가 없습니다!", icon="❌")
+        return
+    set_selection(valid_numbers, f"✅ {len(valid_numbers)}개 문제가 선택되었습니다!")
+    if invalid_numbers:
+        notify(f"⚠️ 존재하지 않는 문제 번호: {invalid_numbers.format()}", icon="⚠️")
+
+# 정답률이 가장 낮은 문제로 선택하는 콜백 (문제별 통계 기준)
+def select_hardest():
+    valid_numbers = hardest_selection(get_stats_store(), st.session_state.bank_id) & bank.available_intervals
+    if valid_numbers:
+        set_selection(valid_numbers, f"어려운 문제: {len(valid_numbers)}개 문제가 선택되었습니다!", icon="🔥")
+    else:
+        notify("아직 문제 통계가 없습니다!", icon="ℹ️")
+
+# 무작위 출제 콜백 - 입력한 번호 범위(비어 있으면 전체 문제)에서 조건대로 뽑아 선택 문제로 사용
+# 번호 목록을 펼치지 않고 구간에서 바로 뽑으므로 범위가 커도 뽑는 문제 수만큼의 시간만 걸림
+def draw_sample_selection():
+    question_input = st.session_state.question_numbers_input
+    source = parse_question_numbers(question_input) if question_input.strip() else bank.available_intervals
+    source &= bank.available_intervals
+    if not source:
+        notify("❌ 뽑을 문제가 없습니다! 문제 번호 범위를 확인해주세요.", icon="❌")
+        return
+    seed_text = st.session_state.sample_seed_input.strip()
+    if seed_text and not seed_text.isdigit():
+        notify("❌ seed는 0 이상의 정수로 입력해주세요!", icon="❌")
+        return
+    multi_ratio = st.session_state.get('sample_multi_percent', 30) / 100 if st.session_state.sample_stratify else None
+    weighted = st.session_state.sample_weighted
+    weights = miss_weights(get_stats_store(), st.session_state.bank_id) if weighted else None
+    with span("sample"):
+        sample = sample_questions(bank, source, st.session_state.sample_size, multi_ratio, weights,
+                                  int(seed_text) if seed_text else None)
+    set_selection(sample.selection, f"🎲 {len(sample.selection)}개 문제를 뽑았습니다! "
+                                    f"(단일 정답 {sample.single_count}, 다중 정답 {sample.multi_count})", icon="🎲")
+    st.session_state.exam_sample = {
+        'source': source.format(), 'size': st.session_state.sample_size, 'multi_ratio': multi_ratio,
+        'weighted': weighted, 'seed': sample.seed,
+    }
+
+# 사이드바 문제 선택 조각 - 입력, 미리보기, 검색, 선택 상태를 이 조각 안에서만 다시 실행
+@st.fragment
+def selection_panel():
+    start_fragment()
     st.header("문제 선택")
     
     # 전체 문제 정보
-    all_questions = load_questions()
-    if all_questions:
-        # number 필드를 안전하게 정수로 변환
-        available_numbers = []
-        for q in all_questions:
-            try:
-                question_num = q.get('number', '')
-                if question_num and str(question_num).strip():  # 빈 값이 아닌지 확인
-                    num = int(str(question_num).strip())
-                    available_numbers.append(num)
-            except (ValueError, TypeError):
-                # 변환할 수 없는 값은 무시하고 계속 진행
-                continue
-        
+    # 정렬된 유효 문제 번호는 문제 은행에 미리 계산되어 있음
+    available_numbers = bank.available_numbers
+    if len(bank):
         if available_numbers:
-            available_numbers.sort()  # 정렬
-            min_num = min(available_numbers)
-            max_num = max(available_numbers)
+            min_num = available_numbers[0]
+            max_num = available_numbers[-1]
             st.info(f"총 {len(available_numbers)}개 문제 (문제 {min_num}번 ~ {max_num}번)")
         else:
-            available_numbers = []
             st.warning("유효한 문제 번호를 찾을 수 없습니다.")
     else:
-        available_numbers = []
         st.warning("문제 데이터를 불러올 수 없습니다.")
     
     # 직접 문제 번호 입력 섹션
@@ -311,134 +343,103 @@ with st.sidebar:
     )
     
     # 입력된 번호 적용 버튼
-    if st.button("📋 입력한 번호로 선택", use_container_width=True, key="apply_input_numbers"):
-        if question_input.strip():
-            parsed_numbers = parse_question_numbers(question_input)
-            if parsed_numbers:
-                # 실제 존재하는 문제만 필터링
-                valid_numbers = [num for num in parsed_numbers if num in available_numbers]
-                invalid_numbers = [num for num in parsed_numbers if num not in available_numbers]
-                
-                st.session_state.selected_question_numbers = valid_numbers
-                
-                if valid_numbers:
-                    st.toast(f"✅ {len(valid_numbers)}개 문제가 선택되었습니다!", icon="✅")
-                    if invalid_numbers:
-                        st.warning(f"⚠️ 존재하지 않는 문제 번호: {', '.join(map(str, invalid_numbers))}")
-                    st.rerun()
-                else:
-                    st.toast("❌ 유효한 문제가 없습니다!", icon="❌")
-            else:
-                st.toast("❌ 올바른 형식으로 입력해주세요!", icon="❌")
-        else:
-            st.toast("❌ 문제 번호를 입력해주세요!", icon="❌")
+    st.button("📋 입력한 번호로 선택", use_container_width=True, key="apply_input_numbers",
+              on_click=apply_input_numbers)
     
     # 입력 미리보기
     if question_input.strip():
-        preview_numbers = parse_question_numbers(question_input)
+        with span("selection.parse"):
+            preview_numbers = parse_question_numbers(question_input)
         if preview_numbers:
-            valid_preview = [num for num in preview_numbers if num in available_numbers]
-            invalid_preview = [num for num in preview_numbers if num not in available_numbers]
+            valid_preview = preview_numbers & bank.available_intervals
+            invalid_preview = preview_numbers - bank.available_intervals
             
             st.write("**입력 미리보기:**")
             if valid_preview:
-                # 연속된 번호들을 범위로 표시
-                ranges = []
-                start = valid_preview[0]
-                end = valid_preview[0]
-                
-                for i in range(1, len(valid_preview)):
-                    if valid_preview[i] == end + 1:
-                        end = valid_preview[i]
-                    else:
-                        if start == end:
-                            ranges.append(str(start))
-                        else:
-                            ranges.append(f"{start}~{end}")
-                        start = end = valid_preview[i]
-                
-                # 마지막 범위 추가
-                if start == end:
-                    ranges.append(str(start))
-                else:
-                    ranges.append(f"{start}~{end}")
-                
-                st.success(f"✅ 유효한 문제: {len(valid_preview)}개 ({', '.join(ranges)})")
+                st.success(f"✅ 유효한 문제: {len(valid_preview)}개 ({valid_preview.format()})")
             
             if invalid_preview:
-                st.error(f"❌ 존재하지 않는 문제: {', '.join(map(str, invalid_preview))}")
+                st.error(f"❌ 존재하지 않는 문제: {invalid_preview.format()}")
+    
+    # 키워드 검색 섹션 - 검색 결과를 그대로 선택 문제로 사용
+    st.subheader("🔍 키워드로 문제 찾기")
+    
+    search_query = st.text_input(
+        "검색어:",
+        placeholder='예: MIGO OR "goods receipt"',
+        help='공백으로 구분한 검색어는 모두 포함(AND), OR로 구분하면 하나라도 포함, 따옴표는 구문 검색',
+        key="search_query"
+    )
+    
+    if search_query.strip():
+        # 색인은 검색할 때만, 문제 은행별로 한 번 불러오거나 만듦 (처음 만들 때만 시간이 걸림)
+        with span("search.index"), st.spinner("검색 색인을 준비하는 중..."):
+            get_index(bank)
+        with span("search"):
+            search_result = search_selection(bank, search_query)
+        if search_result:
+            st.success(f"✅ 검색된 문제: {len(search_result)}개 ({search_result.format()})")
+        else:
+            st.info("검색어에 맞는 문제가 없습니다.")
+        
+        st.button("🔍 검색 결과로 선택", use_container_width=True, key="apply_search",
+                  disabled=not search_result, on_click=set_selection,
+                  args=(search_result, f"✅ {len(search_result)}개 문제가 선택되었습니다!"))
+    
+    # 무작위 출제 - 범위, 문제 수, 단일/다중 정답 비율, 오답률 가중치를 정해 뽑음
+    st.subheader("🎲 무작위 출제")
+    st.caption("위 입력란의 범위(비어 있으면 전체 문제)에서 뽑습니다.")
+    col1, col2 = st.columns(2)
+    with col1:
+        st.number_input("문제 수", min_value=1, max_value=1000, value=80, step=10, key="sample_size")
+    with col2:
+        st.text_input("seed", placeholder="비우면 무작위", key="sample_seed_input",
+                      help="같은 범위, 조건, seed로 뽑으면 같은 문제가 나옵니다.")
+    st.checkbox("단일/다중 정답 비율 지정", key="sample_stratify")
+    if st.session_state.sample_stratify:
+        st.slider("다중 정답 문제 비율 (%)", min_value=0, max_value=100, value=30, step=5, key="sample_multi_percent")
+    st.checkbox("자주 틀리는 문제 위주로", key="sample_weighted",
+                help="문제 통계의 오답률이 높은 문제일수록 더 자주 뽑습니다.")
+    st.button("🎲 무작위로 뽑기", use_container_width=True, key="draw_sample", on_click=draw_sample_selection)
     
     st.divider()
     
     # 전체 선택/해제 버튼
     col1, col2 = st.columns(2)
     with col1:
-        if st.button("전체 선택", use_container_width=True, key="select_all"):
-            st.session_state.selected_question_numbers = available_numbers.copy()
-            st.rerun()
+        st.button("전체 선택", use_container_width=True, key="select_all",
+                  on_click=set_selection, args=(bank.available_intervals,))
     
     with col2:
-        if st.button("전체 해제", use_container_width=True, key="deselect_all"):
-            st.session_state.selected_question_numbers = []
-            st.rerun()
+        st.button("전체 해제", use_container_width=True, key="deselect_all",
+                  on_click=set_selection, args=(IntervalSet(),))
     
     st.divider()
     
     # 현재 선택 상태 표시 및 시험 시작 버튼
-    if st.session_state.selected_question_numbers:
-        sorted_numbers = sorted(st.session_state.selected_question_numbers)
-        
-        # 연속된 번호들을 범위로 표시
-        ranges = []
-        start = sorted_numbers[0]
-        end = sorted_numbers[0]
-        
-        for i in range(1, len(sorted_numbers)):
-            if sorted_numbers[i] == end + 1:
-                end = sorted_numbers[i]
-            else:
-                if start == end:
-                    ranges.append(str(start))
-                else:
-                    ranges.append(f"{start}~{end}")
-                start = end = sorted_numbers[i]
-        
-        # 마지막 범위 추가
-        if start == end:
-            ranges.append(str(start))
-        else:
-            ranges.append(f"{start}~{end}")
-        
-        st.success(f"**선택된 문제: {len(sorted_numbers)}개**")
-        st.write(f"**범위:** {', '.join(ranges)}")
+    selected_numbers = st.session_state.selected_question_numbers
+    if selected_numbers:
+        st.success(f"**선택된 문제: {len(selected_numbers)}개**")
+        st.write(f"**범위:** {selected_numbers.format()}")
+        sample = st.session_state.exam_sample
+        if sample:
+            conditions = [f"{sample['source']}에서 {sample['size']}문제"]
+            if sample['multi_ratio'] is not None:
+                conditions.append(f"다중 정답 {sample['multi_ratio']:.0%}")
+            if sample['weighted']:
+                conditions.append("오답률 가중")
+            st.caption(f"🎲 무작위 출제: {', '.join(conditions)} (seed {sample['seed']})")
         
         # 시험 시작 버튼 - 더 눈에 띄게
         st.markdown("---")
-        if st.button("🚀 시험 시작", type="primary", use_container_width=True, key="start_exam_btn"):
-            st.write(f"선택된 문제 번호: {st.session_state.selected_question_numbers}")
-            st.write(f"전체 문제 수: {len(st.session_state.exam_questions)}")
-            
-            # 필터링 테스트 - 안전한 변환
-            test_filtered = []
-            for q in st.session_state.exam_questions:
-                try:
-                    question_num = q.get('number', '')
-                    if question_num and str(question_num).strip():
-                        num = int(str(question_num).strip())
-                        if num in st.session_state.selected_question_numbers:
-                            test_filtered.append(q)
-                except (ValueError, TypeError):
-                    continue
-            
-            st.write(f"필터링될 문제 수: {len(test_filtered)}")
-            
-            start_selected_exam()
-            st.rerun()
+        st.number_input("제한 시간 (분)", min_value=0, max_value=600, value=0, step=5, key="exam_time_limit_input",
+                        help="0이면 시간 제한 없이 봅니다. 시간이 지나면 그때까지의 답으로 자동 채점합니다.")
+        st.button("🚀 시험 시작", type="primary", use_container_width=True, key="start_exam_btn",
+                  on_click=start_selected_exam)
         
         # 선택 초기화 버튼
-        if st.button("🗑️ 선택 초기화", use_container_width=True, key="clear_selection"):
-            st.session_state.selected_question_numbers = []
-            st.rerun()
+        st.button("🗑️ 선택 초기화", use_container_width=True, key="clear_selection",
+                  on_click=set_selection, args=(IntervalSet(),))
     else:
         st.info("위에서 문제 번호를 입력하고 '📋 입력한 번호로 선택' 버튼을 클릭하세요.")
         
@@ -446,174 +447,249 @@ with st.sidebar:
         st.markdown("### ⚡ 빠른 예시")
         col1, col2 = st.columns(2)
         with col1:
-            if st.button("처음 50문제", use_container_width=True, key="quick_50"):
-                valid_numbers = [num for num in range(1, 51) if num in available_numbers]
-                st.session_state.selected_question_numbers = valid_numbers
-                st.toast(f"처음 50문제: {len(valid_numbers)}개 문제가 선택되었습니다!", icon="✅")
-                st.rerun()
+            first_50 = IntervalSet([(1, 50)]) & bank.available_intervals
+            st.button("처음 50문제", use_container_width=True, key="quick_50", on_click=set_selection,
+                      args=(first_50, f"처음 50문제: {len(first_50)}개 문제가 선택되었습니다!"))
         
         with col2:
-            if st.button("전체 문제", use_container_width=True, key="quick_all"):
-                st.session_state.selected_question_numbers = available_numbers.copy()
-                st.toast(f"전체 문제: {len(available_numbers)}개 문제가 선택되었습니다!", icon="✅")
-                st.rerun()
+            st.button("전체 문제", use_container_width=True, key="quick_all", on_click=set_selection,
+                      args=(bank.available_intervals, f"전체 문제: {len(available_numbers)}개 문제가 선택되었습니다!"))
+        
+        # 사용자들의 정답률이 가장 낮은 문제 (문제별 통계 기준)
+        st.button("🔥 어려운 문제 50", use_container_width=True, key="quick_hardest", on_click=select_hardest)
+
+# 메인 앱 UI - 시험 모드
+st.title("📝 시험 모드")
+
+# 사이드바
+with st.sidebar, span("sidebar"):
+    bank_selector()
+    selection_panel()
     
     st.divider()
     st.header("옵션")
     
-    if st.button("문제 섞기", key="shuffle_btn"):
-        shuffle_and_restart_exam()
+    # 시험 문제가 바뀌므로 조각 밖의 버튼으로 두어 페이지 전체를 한 번 다시 실행
+    st.button("문제 섞기", key="shuffle_btn", on_click=shuffle_and_restart_exam)
     
-    if st.button("문제 순서 초기화", key="reset_order_btn"):
-        st.session_state.exam_questions = load_questions()
-        st.session_state.exam_shuffled = False
-        restart_exam()
+    st.button("문제 순서 초기화", key="reset_order_btn", on_click=reset_exam_order)
     
-    if st.button("시험 재시작", key="restart_exam_btn"):
-        restart_exam()
+    st.button("시험 재시작", key="restart_exam_btn", on_click=restart_exam)
     
+    # 현재 문제와 답변 수는 문제 화면 조각에 표시 (답할 때마다 사이드바를 다시 그리지 않음)
     st.divider()
     st.write("### 현재 상태")
     if st.session_state.filtered_exam_questions:
         st.write(f"시험 문제 수: {len(st.session_state.filtered_exam_questions)}")
-        st.write(f"현재 문제: {st.session_state.current_exam_index + 1}")
-        st.write(f"답변한 문제: {len(st.session_state.exam_user_answers)}")
+        if st.session_state.exam_time_limit:
+            st.write(f"제한 시간: {st.session_state.exam_time_limit // 60}분")
     else:
         st.write("시험이 시작되지 않았습니다.")
     st.write(f"문제 섞기: {'활성화됨' if st.session_state.exam_shuffled else '비활성화됨'}")
+    # 섞은 순서는 seed 하나로 다시 만들 수 있음 (같은 순서로 다시 보거나 검토할 때)
+    if st.session_state.filtered_exam_questions.shuffle_seed is not None:
+        st.caption(f"섞은 순서 seed: {st.session_state.filtered_exam_questions.shuffle_seed}")
     
     st.divider()
     if st.button("메인 페이지로 돌아가기", key="go_home_btn"):
         st.switch_page("app.py")
 
-# 결과 화면 (수정)
-if st.session_state.show_exam_result:
-    st.header("시험 결과")
-    
-    total_questions = len(st.session_state.filtered_exam_questions)
-    correct_count = st.session_state.exam_score
-    
-    st.write(f"총 {total_questions}문제 중 {correct_count}문제 정답!")
-    st.progress(correct_count / total_questions)
-    
-    st.write(f"점수: {int((correct_count / total_questions) * 100)}점")
-    
-    for q in st.session_state.filtered_exam_questions:
-        q_num = q['number']
-        user_answers = st.session_state.exam_user_answers.get(q_num, [])
-        correct_answer = q['answer']
+# 시험 문제/결과 화면 조각 - 답할 때는 이 조각만 다시 실행 (사이드바의 선택 처리와 미리보기는 건너뜀)
+@st.fragment
+def exam_panel():
+    start_fragment()
+    # 제한 시간이 지난 채로 다시 열린 시험 (새로고침, 다른 페이지에서 돌아옴)은 그때까지의 답으로 채점
+    if st.session_state.filtered_exam_questions and not st.session_state.show_exam_result and exam_time_expired():
+        finish_exam()
+    
+    # 결과 화면 (수정)
+    if st.session_state.show_exam_result:
+        st.header("시험 결과")
         
-        # 정답 확인
-        if ',' in correct_answer:
-            # 다중 정답
-            user_sorted = ','.join(sorted(user_answers))
-            correct_sorted = ','.join(sorted(correct_answer.split(',')))
-            is_correct = user_sorted == correct_sorted
-        else:
-            # 단일 정답
-            is_correct = len(user_answers) == 1 and user_answers[0] == correct_answer
+        if st.session_state.exam_timed_out:
+            st.warning("⏰ 제한 시간이 지나 그때까지의 답으로 채점했습니다. 답하지 않은 문제는 오답입니다.")
         
-        with st.expander(f"문제 {q_num}: {q['question']} {'✅' if is_correct else '❌'}"):
-            for opt_key, opt_text in q['options'].items():
-                if ',' in correct_answer and opt_key in correct_answer.split(','):
-                    st.markdown(f"**{opt_key}) {opt_text} ✓ (정답)**")
-                elif opt_key == correct_answer:
-                    st.markdown(f"**{opt_key}) {opt_text} ✓ (정답)**")
-                elif opt_key in user_answers and (opt_key not in correct_answer.split(',') if ',' in correct_answer else opt_key != correct_answer):
-                    st.markdown(f"**{opt_key}) {opt_text} ✗ (선택한 답)**")
-                else:
-                    st.markdown(f"{opt_key}) {opt_text}")
-            
-            # 선택한 답변 표시
-            st.write(f"선택한 답변: {', '.join(user_answers)}")
-            st.write(f"정답: {correct_answer}")
-    
-    if st.button("시험 다시 보기"):
-        restart_exam()
-
-# 문제 화면 (수정)
-else:
-    if not st.session_state.filtered_exam_questions:
-        st.info("🎯 왼쪽 사이드바에서 문제를 선택하고 '🚀 시험 시작' 버튼을 클릭하세요!")
+        # 캐시된 채점 결과 사용 (이전 세션에서 넘어온 경우에만 한 번 계산)
+        if st.session_state.exam_result is None:
+            calculate_exam_score()
+        result = st.session_state.exam_result
         
-        # 중앙에 큰 안내 메시지
-        st.markdown("""
-        <div style="text-align: center; padding: 2rem; background-color: #f8f9fa; border-radius: 10px; margin: 2rem 0;">
-            <h3>📚 시험 모드 사용법</h3>
-            <p><strong>문제 번호 직접 입력:</strong> 원하는 문제 번호를 직접 입력</p>
-            <p><strong>범위 선택:</strong> 시작/끝 번호 입력 후 적용</p>
-            <p><strong>시험 시작:</strong> '🚀 시험 시작' 버튼 클릭</p>
-        </div>
-        """, unsafe_allow_html=True)
+        total_questions = len(st.session_state.filtered_exam_questions)
+        correct_count = result.score
         
-        # 예시 표시
-        st.markdown("""
-        ### 📝 입력 예시
-        - **개별 문제**: `1,5,10,15` (1, 5, 10, 15번 문제)
-        - **범위**: `1~50` (1번부터 50번까지)
-        - **혼합**: `1~10,20,30~35` (1-10번, 20번, 30-35번 문제)
-        """)
-    else:
-        current_q = st.session_state.filtered_exam_questions[st.session_state.current_exam_index]
-        question_number = current_q['number']
-        correct_answer = current_q['answer']
+        st.write(f"총 {total_questions}문제 중 {correct_count}문제 정답!")
+        st.progress(correct_count / total_questions)
+        
+        st.write(f"점수: {int((correct_count / total_questions) * 100)}점")
+        
+        # 부분 점수 (다중 정답 문제에서 일부만 맞힌 경우 반영)
+        st.write(f"부분 점수 포함: {result.partial_score:.1f}/{total_questions}")
+        
+        # 선택지별 통계 (정답 선택 / 오답 선택 / 정답 놓침)
+        used_options = [i for i in range(len(OPTION_LETTERS)) if result.option_counts[i].any()]
+        if used_options:
+            with st.expander("선택지별 통계"):
+                st.dataframe(pd.DataFrame(
+                    result.option_counts[used_options],
+                    index=[OPTION_LETTERS[i] for i in used_options],
+                    columns=["정답 선택", "오답 선택", "정답 놓침"],
+                ))
+        
+        # 요약 표 (유형별 문제 수 / 정답 수 / 정답률)
+        summary_rows = []
+        for label, type_mask in (("전체", np.ones(total_questions, dtype=bool)),
+                                 ("단일 정답", ~result.multi), ("다중 정답", result.multi)):
+            type_count = int(type_mask.sum())
+            type_correct = int(result.correct[type_mask].sum())
+            summary_rows.append({
+                "구분": label,
+                "문제 수": type_count,
+                "정답": type_correct,
+                "오답": type_count - type_correct,
+                "정답률": f"{type_correct / type_count * 100:.0f}%" if type_count else "-",
+            })
+        st.dataframe(pd.DataFrame(summary_rows), hide_index=True, use_container_width=True)
         
-        # 정답이 다중 선택인지 확인
-        is_multiple_choice = ',' in correct_answer
+        # 결과 필터 - 채점 결과 배열에서 한 번에 골라냄
+        valid_numbers = result.numbers[result.numbers >= 0]
+        min_result_num = int(valid_numbers.min()) if len(valid_numbers) else 0
+        max_result_num = int(valid_numbers.max()) if len(valid_numbers) else 0
         
-        st.header(f"문제 {st.session_state.current_exam_index + 1}/{len(st.session_state.filtered_exam_questions)}")
+        col1, col2, col3 = st.columns([2, 1, 1])
+        with col1:
+            result_filter = st.selectbox("보기", RESULT_FILTERS, key="results_filter", on_change=set_results_page, args=(0,))
+        with col2:
+            range_from = st.number_input("시작 번호", value=min_result_num, step=1, key="results_from",
+                                         on_change=set_results_page, args=(0,))
+        with col3:
+            range_to = st.number_input("끝 번호", value=max_result_num, step=1, key="results_to",
+                                       on_change=set_results_page, args=(0,))
+        
+        visible = (result.numbers < 0) | ((result.numbers >= range_from) & (result.numbers <= range_to))
+        if result_filter == "오답만":
+            visible &= ~result.correct
+        elif result_filter == "다중 정답만":
+            visible &= result.multi
+        indices = np.flatnonzero(visible)
+        
+        # 현재 페이지의 문제만 디코딩하고 선택지를 그림
+        page_count = max(1, -(-len(indices) // RESULTS_PAGE_SIZE))
+        results_page = min(st.session_state.get('results_page', 0), page_count - 1)
+        page_indices = indices[results_page * RESULTS_PAGE_SIZE:(results_page + 1) * RESULTS_PAGE_SIZE]
+        
+        st.caption(f"{len(indices)}개 문제 중 {results_page * RESULTS_PAGE_SIZE + 1 if len(indices) else 0}"
+                   f"~{results_page * RESULTS_PAGE_SIZE + len(page_indices)}번째")
+        
+        exam_questions = st.session_state.filtered_exam_questions
+        for i in page_indices:
+            q = exam_questions[i]
+            q_num = q['number']
+            selected_mask = int(result.selected[i])
+            
+            # 캐시된 채점 결과의 정답 여부
+            is_correct = bool(result.correct[i])
+            
+            # 라벨에는 문제 앞부분만 표시
+            label_text = q['question'] if len(q['question']) <= RESULT_LABEL_LENGTH else q['question'][:RESULT_LABEL_LENGTH] + "…"
+            with st.expander(f"문제 {q_num}: {label_text} {'✅' if is_correct else '❌'}"):
+                # 본문, 선택지별 정답/선택 표시, 선택한 답변 요약을 캐시된 HTML 한 요소로 표시
+                st.markdown(review_html(exam_questions.bank, exam_questions.position(i), selected_mask,
+                                        with_question=True), unsafe_allow_html=True)
         
-        if is_multiple_choice:
-            st.info(f"이 문제는 다중 선택 문제입니다. {len(correct_answer.split(','))}개의 답을 선택해주세요.")
+        # 페이지 이동
+        col1, col2, col3 = st.columns([1, 2, 1])
+        with col1:
+            st.button("◀ 이전", key="results_prev_page", on_click=set_results_page, args=(results_page - 1,),
+                      disabled=results_page == 0, use_container_width=True)
+        with col2:
+            st.markdown(f"<div style='text-align: center;'>{results_page + 1} / {page_count}</div>", unsafe_allow_html=True)
+        with col3:
+            st.button("다음 ▶", key="results_next_page", on_click=set_results_page, args=(results_page + 1,),
+                      disabled=results_page >= page_count - 1, use_container_width=True)
         
-        with st.container(border=True):
-            # 질문을 smaller-question 클래스로 감싸서 글자 크기를 줄임
-            st.markdown(f"<div class='smaller-question'>{current_q['question']}</div>", unsafe_allow_html=True)
+        st.button("시험 다시 보기", on_click=restart_exam)
+
+    # 문제 화면 (수정)
+    else:
+        if not st.session_state.filtered_exam_questions:
+            st.info("🎯 왼쪽 사이드바에서 문제를 선택하고 '🚀 시험 시작' 버튼을 클릭하세요!")
+            
+            # 중앙에 큰 안내 메시지
+            st.markdown("""
+            <div style="text-align: center; padding: 2rem; background-color: #f8f9fa; border-radius: 10px; margin: 2rem 0;">
+                <h3>📚 시험 모드 사용법</h3>
+                <p><strong>문제 번호 직접 입력:</strong> 원하는 문제 번호를 직접 입력</p>
+                <p><strong>범위 선택:</strong> 시작/끝 번호 입력 후 적용</p>
+                <p><strong>시험 시작:</strong> '🚀 시험 시작' 버튼 클릭</p>
+            </div>
+            """, unsafe_allow_html=True)
+            
+            # 예시 표시
+            st.markdown("""
+            ### 📝 입력 예시
+            - **개별 문제**: `1,5,10,15` (1, 5, 10, 15번 문제)
+            - **범위**: `1~50` (1번부터 50번까지)
+            - **혼합**: `1~10,20,30~35` (1-10번, 20번, 30-35번 문제)
+            """)
+        else:
+            exam_questions = st.session_state.filtered_exam_questions
+            current_q = exam_questions[st.session_state.current_exam_index]
+            question_number = current_q['number']
+            position = exam_questions.position(st.session_state.current_exam_index)
+            answer_mask = exam_questions.bank.answer_masks[position]
+            
+            # 정답이 다중 선택인지 확인
+            is_multiple_choice = popcount(answer_mask) > 1
+            
+            st.header(f"문제 {st.session_state.current_exam_index + 1}/{len(st.session_state.filtered_exam_questions)}")
             
-            options = current_q['options']
+            # 남은 시간은 브라우저에서만 줄어듦 (매초 서버를 다시 실행하지 않음)
+            if st.session_state.exam_deadline is not None:
+                countdown(st.session_state.exam_deadline)
             
-            # 다중 선택 지원
             if is_multiple_choice:
-                # 체크박스로 다중 선택 지원
-                st.write("정답을 모두 선택하세요:")
-                selected_options = []
+                st.info(f"이 문제는 다중 선택 문제입니다. {popcount(answer_mask)}개의 답을 선택해주세요.")
+            
+            with st.container(border=True):
+                # 질문 본문 - 문제 은행 버전별로 한 번만 만든 HTML 조각 (smaller-question 클래스로 글자 크기를 줄임)
+                st.markdown(question_html(exam_questions.bank, position), unsafe_allow_html=True)
                 
-                for opt_key, opt_text in options.items():
-                    is_selected = st.checkbox(f"{opt_key}) {opt_text}", 
-                              key=f"exam_chk_{question_number}_{opt_key}")
-                    if is_selected:
-                        selected_options.append(opt_key)
+                options = current_q['options']
                 
-                # 제출 버튼
-                if st.button("정답 제출", key="exam_submit_btn"):
-                    if selected_options:
-                        handle_exam_answer(question_number, selected_options)
-                        st.rerun()
-                    else:
-                        st.warning("최소한 하나의 답을 선택해주세요.")
-            else:
-                # 단일 선택
-                for opt_key, opt_text in options.items():
-                    if st.button(f"{opt_key}) {opt_text}", key=f"exam_opt_{question_number}_{opt_key}"):
-                        handle_exam_answer(question_number, [opt_key])
-                        st.rerun()
-        
-        # 진행 상태 표시
-        st.progress((st.session_state.current_exam_index) / len(st.session_state.filtered_exam_questions))
-        
-        # 답변 상태 표시
-        answered_count = len(st.session_state.exam_user_answers)
-        st.write(f"답변한 문제: {answered_count}/{len(st.session_state.filtered_exam_questions)}")
+                # 다중 선택 지원
+                if is_multiple_choice:
+                    # 체크박스로 다중 선택 지원
+                    st.write("정답을 모두 선택하세요:")
+                    
+                    for opt_key, opt_text in options.items():
+                        st.checkbox(f"{opt_key}) {opt_text}", key=f"exam_chk_{question_number}_{opt_key}")
+                    
+                    # 제출 버튼 - 콜백에서 체크박스 값을 모아 답변 처리
+                    st.button("정답 제출", key="exam_submit_btn", on_click=submit_exam_answer,
+                              args=(position, question_number, list(options)))
+                else:
+                    # 단일 선택 - 클릭한 선택지를 콜백에서 바로 답변 처리
+                    for opt_key, opt_text in options.items():
+                        st.button(f"{opt_key}) {opt_text}", key=f"exam_opt_{question_number}_{opt_key}",
+                                  on_click=handle_exam_answer, args=(position, option_bit(opt_key)))
+            
+            # 진행 상태 표시
+            st.progress((st.session_state.current_exam_index) / len(st.session_state.filtered_exam_questions))
+            
+            # 답변 상태 표시
+            answered_count = len(st.session_state.exam_user_answers)
+            st.write(f"답변한 문제: {answered_count}/{len(st.session_state.filtered_exam_questions)}")
+            
+            # 시간 제한 시험은 남은 문제를 두고 끝낼 수 있음 (시간이 지난 뒤에도 이 버튼으로 결과 확인)
+            if st.session_state.exam_deadline is not None:
+                st.button("⏹️ 시험 종료 및 채점", key="exam_finish_btn", on_click=finish_exam)
+
+with span("main"):
+    exam_panel()
 
 # 푸터
 st.divider()
 st.markdown("SAP 문제 풀이 앱 - 시험 모드")
 
-# 디버깅을 위한 코드 추가
-if st.button("🔍 데이터 확인", key="debug_data"):
-    st.write("첫 번째 문제 데이터:")
-    if st.session_state.exam_questions:
-        first_q = st.session_state.exam_questions[0]
-        st.write(first_q)
-        st.write(f"number 필드 타입: {type(first_q.get('number'))}")
-        st.write(f"number 필드 값: '{first_q.get('number')}'")
\ No newline at end of file
+# 구간 추적 결과 표시
+show_trace()
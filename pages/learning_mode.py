@@ -1,8 +1,14 @@
 import streamlit as st
-import json
-import random
-import pandas as pd
-import os
+import time
+
+from quiz.grading import is_correct as grade, mask_to_options, option_bit, popcount
+from quiz.render import question_html, review_html
+from quiz.review import QUALITY_CORRECT, QUALITY_WRONG, ReviewScheduler
+from quiz.stats import get_stats_store
+from quiz.tracing import span
+from quiz.ui import (autosave, bank_selector, ensure_session, get_bank, inject_styles, notify,
+                     request_app_rerun, show_trace, start_fragment, start_trace)
+from quiz.views import QuestionView
 
 # 페이지 기본 설정
 st.set_page_config(
@@ -11,94 +17,22 @@ st.set_page_config(
     layout="centered"
 )
 
-# 스타일 설정
-st.markdown("""
-<style>
-    .main {
-        padding: 2rem;
-    }
-    .question-box {
-        background-color: #f8f9fa;
-        padding: 1.5rem;
-        border-radius: 10px;
-        margin-bottom: 1rem;
-        box-shadow: 0 0 5px rgba(0,0,0,0.1);
-    }
-    .option-box {
-        padding: 0.5rem;
-        border-radius: 5px;
-        margin-bottom: 0.5rem;
-    }
-    .option-box:hover {
-        background-color: #e9ecef;
-    }
-    .correct {
-        background-color: #d4edda;
-    }
-    .incorrect {
-        background-color: #f8d7da;
-    }
-    .result-box {
-        padding: 1rem;
-        border-radius: 5px;
-        text-align: center;
-        font-weight: bold;
-        margin-top: 1rem;
-    }
-    .result-correct {
-        background-color: #d4edda;
-        color: #155724;
-    }
-    .result-incorrect {
-        background-color: #f8d7da;
-        color: #721c24;
-    }
-    .smaller-question {
-        font-size: 0.95rem;
-    }
-</style>
-""", unsafe_allow_html=True)
-
-# 문제 데이터 로드 함수
-@st.cache_data
-def load_questions():
-    try:
-        with open('questions.json', 'r', encoding='utf-8') as f:
-            return json.load(f)
-    except Exception as e:
-        st.error(f"문제 데이터를 불러오는 데 실패했습니다: {e}")
-        return []
-
-# 문제 셔플 함수
-def shuffle_questions(questions):
-    shuffled = questions.copy()
-    random.shuffle(shuffled)
-    return shuffled
-
-# 정답 비교 함수 - 다중 정답 지원
-def check_answer(user_answer, correct_answer):
-    # 정답이 쉼표로 구분된 여러 답변인 경우 처리
-    if ',' in correct_answer:
-        correct_options = correct_answer.split(',')
-        user_options = user_answer.split(',')
-        
-        # 정답 수와 사용자 답변 수가 같은지 확인
-        if len(correct_options) != len(user_options):
-            return False
-        
-        # 모든 정답이 사용자 답변에 포함되어 있는지 확인
-        for option in correct_options:
-            if option.strip() not in [opt.strip() for opt in user_options]:
-                return False
-        
-        return True
-    else:
-        # 단일 정답인 경우
-        return user_answer == correct_answer
+# 구간 추적 (?trace=1 일 때만)
+start_trace("learning_mode")
+
+# 공용 스타일 설정
+inject_styles()
+
+# 공유 문제 은행 (프로세스 전체에서 한 번만 로드)
+bank = get_bank()
+
+# 세션 식별자 준비 및 저장된 세션 복원
+ensure_session(bank)
 
 # 세션 상태 초기화
+# 학습 중인 문제 목록 - 공유 문제 은행 위의 위치 뷰 (문제 파일이 바뀌면 순서 초기화 시 새 내용 반영)
 if 'learning_questions' not in st.session_state:
-    st.session_state.learning_questions = load_questions()
+    st.session_state.learning_questions = QuestionView(bank)
     
 if 'current_learning_index' not in st.session_state:
     st.session_state.current_learning_index = 0
@@ -106,18 +40,46 @@ if 'current_learning_index' not in st.session_state:
 if 'learning_showed_answer' not in st.session_state:
     st.session_state.learning_showed_answer = False
     
+# 선택한 답은 정답과 같은 비트마스크로 저장 (quiz.grading 참고)
 if 'learning_selected_options' not in st.session_state:
-    st.session_state.learning_selected_options = {}
+    st.session_state.learning_selected_options = 0
     
 if 'learning_shuffled' not in st.session_state:
     st.session_state.learning_shuffled = False
 
+# 문제 은행 위치 -> 정답 여부 (문제 목록 상태 표시용)
+if 'learning_results' not in st.session_state:
+    st.session_state.learning_results = {}
+
+# 간격 반복 복습 상태 - 문제별 SM-2 상태와 복습 시각 힙 (quiz.review 참고)
+if 'learning_review' not in st.session_state:
+    st.session_state.learning_review = ReviewScheduler()
+
+# 복습 모드에서는 목록 순서 대신 스케줄러가 고른 문제 번호의 문제를 표시
+if 'learning_review_mode' not in st.session_state:
+    st.session_state.learning_review_mode = False
+
+if 'learning_review_number' not in st.session_state:
+    st.session_state.learning_review_number = None
+
+# 사이드바 문제 목록은 한 페이지씩만 표시
+NAV_PAGE_SIZE = 20
+STATUS_GRID_SIZE = 100
+
+# 학습 진행 상황 자동 저장 함수 (바뀐 키만 백그라운드 저장 대기열에 등록)
+def save_learning_progress(*extra_keys):
+    # 이동한 문제가 보이도록 문제 목록 페이지도 맞춤
+    st.session_state.learning_nav_page = st.session_state.current_learning_index // NAV_PAGE_SIZE
+    autosave(st.session_state.learning_questions.bank, 'current_learning_index',
+             'learning_showed_answer', 'learning_selected_options', *extra_keys)
+
 # 다음 문제로 이동 함수
 def next_question():
     if st.session_state.current_learning_index < len(st.session_state.learning_questions) - 1:
         st.session_state.current_learning_index += 1
         st.session_state.learning_showed_answer = False
-        st.session_state.learning_selected_options = {}
+        st.session_state.learning_selected_options = 0
+        save_learning_progress()
     else:
         st.toast("마지막 문제입니다!", icon="🎉")
 
@@ -126,94 +88,234 @@ def prev_question():
     if st.session_state.current_learning_index > 0:
         st.session_state.current_learning_index -= 1
         st.session_state.learning_showed_answer = False
-        st.session_state.learning_selected_options = {}
+        st.session_state.learning_selected_options = 0
+        save_learning_progress()
     else:
         st.toast("첫 번째 문제입니다!", icon="ℹ️")
 
 # 문제 섞기 함수
 def shuffle_and_restart():
-    st.session_state.learning_questions = shuffle_questions(st.session_state.learning_questions)
+    st.session_state.learning_questions = st.session_state.learning_questions.shuffled()
     st.session_state.learning_shuffled = True
     st.session_state.current_learning_index = 0
     st.session_state.learning_showed_answer = False
-    st.session_state.learning_selected_options = {}
+    st.session_state.learning_selected_options = 0
+    save_learning_progress('learning_questions', 'learning_shuffled')
 
-# 문제 번호 클릭 시 해당 문제로 이동하는 함수 추가
+# 문제 순서 초기화 함수
+def reset_learning_order():
+    # 문제 파일이 바뀌어 문제 은행이 달라졌으면 위치 기준 결과도 초기화
+    if st.session_state.learning_questions.bank is not bank:
+        st.session_state.learning_results = {}
+    st.session_state.learning_questions = QuestionView(bank)
+    st.session_state.learning_shuffled = False
+    st.session_state.current_learning_index = 0
+    st.session_state.learning_showed_answer = False
+    st.session_state.learning_selected_options = 0
+    save_learning_progress('learning_questions', 'learning_shuffled', 'learning_results')
+
+# 문제 번호 클릭 시 해당 문제로 이동하는 함수 추가 (복습 모드였으면 목록 순서로 돌아감)
+# 문제 목록 조각의 콜백 - 문제 화면도 바뀌므로 전체 실행 요청
 def go_to_question(index):
     st.session_state.current_learning_index = index
     st.session_state.learning_showed_answer = False
-    st.session_state.learning_selected_options = {}
+    st.session_state.learning_selected_options = 0
+    st.session_state.learning_review_mode = False
+    save_learning_progress('learning_review_mode')
+    request_app_rerun()
 
-# 메인 앱 UI - 학습 모드
-st.title("🎓 학습 모드")
+# 복습 시각 표시용 문자열
+def format_due(due):
+    remaining = due - time.time()
+    if remaining < 3600:
+        return f"{max(1, int(remaining // 60))}분 후"
+    if remaining < 24 * 3600:
+        return f"{int(remaining // 3600)}시간 후"
+    return f"{int(remaining // (24 * 3600))}일 후"
 
-# 사이드바
-with st.sidebar:
-    st.header("옵션")
-    if st.button("문제 섞기"):
-        shuffle_and_restart()
+# 복습 모드에서 다음 문제로 이동 (복습 시각이 된 문제 우선, 없으면 아직 풀지 않은 문제)
+def next_review_question():
+    scheduler = st.session_state.learning_review
+    with span("review.next"):
+        number = scheduler.next_number(bank, exclude=st.session_state.learning_review_number)
+    if number is None:
+        next_due = scheduler.next_due()
+        if next_due is None:
+            st.toast("복습할 문제가 없습니다!", icon="🎉")
+        else:
+            st.toast(f"지금 복습할 문제가 없습니다. 다음 복습: {format_due(next_due)}", icon="⏰")
+        return
+    st.session_state.learning_review_number = number
+    st.session_state.learning_showed_answer = False
+    st.session_state.learning_selected_options = 0
+    save_learning_progress('learning_review_number')
+
+# 복습 모드 켜기/끄기 (켤 때 보고 있는 문제가 없으면 다음 복습 문제를 고름)
+def toggle_review_mode():
+    st.session_state.learning_review_mode = st.session_state.learning_review_toggle
+    st.session_state.learning_showed_answer = False
+    st.session_state.learning_selected_options = 0
+    if st.session_state.learning_review_mode and st.session_state.learning_review_number is None:
+        next_review_question()
+    save_learning_progress('learning_review_mode')
+
+# 문제 목록 페이지 이동 함수
+def set_nav_page(page):
+    st.session_state.learning_nav_page = page
+
+# 입력한 문제 번호의 문제로 이동하는 함수 (섞은 목록에서도 번호로 위치를 찾음)
+def jump_to_number():
+    number = int(st.session_state.learning_jump_number)
+    lq = st.session_state.learning_questions
+    position = lq.bank.position(number)
+    index = None if position is None else lq.index_of(position)
+    if index is None:
+        notify(f"{number}번 문제가 목록에 없습니다.", icon="⚠️")
+        return
+    go_to_question(index)
+
+# 답 제출 시 결과 기록 함수 - 목록 순서로 풀어도 복습 일정에 반영, 문제별 통계에도 더함
+def record_learning_result(question_bank, position, selected_mask):
+    answer_mask = question_bank.answer_masks[position]
+    with span("grade"):
+        correct = grade(answer_mask, selected_mask)
+        st.session_state.learning_results[position] = correct
+    number = question_bank.numbers[position]
+    # 복습 일정은 정수 번호가 있는 문제만 (번호가 없는 문제는 복습 모드에서 낼 수 없음)
+    if number is not None:
+        st.session_state.learning_review.review(number, QUALITY_CORRECT if correct else QUALITY_WRONG)
+    get_stats_store().record(st.session_state.bank_id, number, answer_mask, selected_mask)
+
+# 선택지를 골랐을 때의 콜백 - 정답을 표시하고 결과를 기록
+def answer_learning_question(question_bank, position, selected_mask):
+    st.session_state.learning_selected_options = selected_mask
+    st.session_state.learning_showed_answer = True
+    record_learning_result(question_bank, position, selected_mask)
+    save_learning_progress('learning_results', 'learning_review')
+
+# 다중 선택 문제의 정답 제출 콜백 - 체크박스 값을 모아 채점
+def submit_learning_answer(question_bank, position, question_number, option_keys):
+    selected_mask = 0
+    for opt_key in option_keys:
+        if st.session_state.get(f"learning_chk_{question_number}_{opt_key}"):
+            selected_mask |= option_bit(opt_key)
+    if selected_mask:
+        answer_learning_question(question_bank, position, selected_mask)
+    else:
+        notify("최소한 하나의 답을 선택해주세요.", icon="⚠️")
+
+# 사이드바 문제 목록 조각 - 목록 페이지 이동은 이 조각만 다시 실행
+@st.fragment
+def question_navigator():
+    start_fragment()
+    st.write("### 문제 목록")
     
-    if st.button("문제 순서 초기화"):
-        st.session_state.learning_questions = load_questions()
-        st.session_state.learning_shuffled = False
-        st.session_state.current_learning_index = 0
-        st.session_state.learning_showed_answer = False
-        st.session_state.learning_selected_options = {}
+    lq = st.session_state.learning_questions
+    current_index = st.session_state.current_learning_index
+    results = st.session_state.learning_results
     
-    # 문제 번호 목록 추가
-    st.divider()
-    st.write("### 문제 목록")
+    # 현재 페이지의 문제 버튼만 생성 (문제 수와 무관하게 최대 NAV_PAGE_SIZE개)
+    page_count = max(1, -(-len(lq) // NAV_PAGE_SIZE))
+    nav_page = min(st.session_state.get('learning_nav_page', current_index // NAV_PAGE_SIZE), page_count - 1)
     
-    # 스크롤 가능한 컨테이너 내에 문제 번호 나열
-    with st.container(height=300):
-        for i, q in enumerate(st.session_state.learning_questions):
-            # 현재 문제에 표시 추가
-            if i == st.session_state.current_learning_index:
-                button_label = f"➡️ 문제 {i+1} (현재)"
-                button_type = "primary"
-            else:
-                button_label = f"문제 {i+1}"
-                button_type = "secondary"
-            
-            # 문제 번호 버튼
-            st.button(
-                button_label, 
-                key=f"q_nav_{i}", 
-                on_click=go_to_question, 
-                args=(i,),
-                type=button_type,
-                use_container_width=True
-            )
+    col1, col2, col3 = st.columns([1, 2, 1])
+    with col1:
+        st.button("◀", key="nav_prev_page", on_click=set_nav_page, args=(nav_page - 1,),
+                  disabled=nav_page == 0, use_container_width=True)
+    with col2:
+        st.markdown(f"<div style='text-align: center;'>{nav_page + 1} / {page_count}</div>", unsafe_allow_html=True)
+    with col3:
+        st.button("▶", key="nav_next_page", on_click=set_nav_page, args=(nav_page + 1,),
+                  disabled=nav_page >= page_count - 1, use_container_width=True)
     
-    st.divider()
-    st.write("### 현재 상태")
-    st.write(f"총 문제 수: {len(st.session_state.learning_questions)}")
-    st.write(f"현재 문제: {st.session_state.current_learning_index + 1}")
-    st.write(f"문제 섞기: {'활성화됨' if st.session_state.learning_shuffled else '비활성화됨'}")
+    for i in range(nav_page * NAV_PAGE_SIZE, min((nav_page + 1) * NAV_PAGE_SIZE, len(lq))):
+        status = results.get(lq.position(i))
+        status_icon = "" if status is None else (" ✅" if status else " ❌")
+        # 현재 문제에 표시 추가
+        if i == current_index:
+            button_label = f"➡️ 문제 {i+1} (현재){status_icon}"
+            button_type = "primary"
+        else:
+            button_label = f"문제 {i+1}{status_icon}"
+            button_type = "secondary"
+        
+        # 문제 번호 버튼
+        st.button(
+            button_label, 
+            key=f"q_nav_{i}", 
+            on_click=go_to_question, 
+            args=(i,),
+            type=button_type,
+            use_container_width=True
+        )
     
-    st.divider()
-    if st.button("메인 페이지로 돌아가기"):
-        st.switch_page("app.py")
+    # 번호로 바로 이동
+    if lq:
+        col1, col2 = st.columns([2, 1])
+        with col1:
+            current_number = lq.bank.numbers[lq.position(current_index)] if current_index < len(lq) else None
+            st.number_input("문제 번호로 이동",
+                            value=current_number if current_number is not None else 0,
+                            step=1, key="learning_jump_number", label_visibility="collapsed")
+        with col2:
+            st.button("이동", key="learning_jump_btn", on_click=jump_to_number, use_container_width=True)
+    
+    # 현재 문제 주변 상태 표 (한 번의 markdown 요소로 표시)
+    grid_start = current_index // STATUS_GRID_SIZE * STATUS_GRID_SIZE
+    cells = []
+    for i in range(grid_start, min(grid_start + STATUS_GRID_SIZE, len(lq))):
+        status = results.get(lq.position(i))
+        css_class = "nav-cell" if status is None else ("nav-cell nav-correct" if status else "nav-cell nav-wrong")
+        if i == current_index:
+            css_class += " nav-current"
+        cells.append(f"<span class='{css_class}' title='문제 {i+1}'></span>")
+    st.markdown(
+        f"<div class='nav-grid'>{''.join(cells)}</div>"
+        f"<small>문제 {grid_start + 1}~{min(grid_start + STATUS_GRID_SIZE, len(lq))} · "
+        f"정답 {sum(results.values())} · 오답 {len(results) - sum(results.values())} · "
+        f"미응답 {len(lq) - len(results)}</small>",
+        unsafe_allow_html=True,
+    )
 
-# 문제 화면
-if not st.session_state.learning_questions:
-    st.warning("문제 데이터를 불러올 수 없습니다.")
-else:
-    current_q = st.session_state.learning_questions[st.session_state.current_learning_index]
+# 문제 풀이 조각 - 답할 때는 이 조각만 다시 실행 (문제 목록과 사이드바는 다음 이동 때 갱신)
+@st.fragment
+def question_panel():
+    start_fragment()
+    review_mode = st.session_state.learning_review_mode
+    learning_questions = st.session_state.learning_questions
+    # 복습 모드는 스케줄러가 고른 번호의 현재 문제 은행 위치, 아니면 목록 순서의 위치
+    if review_mode:
+        question_bank = bank
+        position = bank.position(st.session_state.learning_review_number)
+    else:
+        question_bank = learning_questions.bank
+        position = learning_questions.position(st.session_state.current_learning_index)
+    current_q = question_bank[position]
     question_number = current_q['number']
     correct_answer = current_q['answer']
+    # 문제 은행을 불러올 때 미리 계산된 정답 비트마스크
+    answer_mask = question_bank.answer_masks[position]
     
     # 정답이 다중 선택인지 확인
-    is_multiple_choice = ',' in correct_answer
+    is_multiple_choice = popcount(answer_mask) > 1
     
-    st.header(f"문제 {st.session_state.current_learning_index + 1}/{len(st.session_state.learning_questions)}")
+    if review_mode:
+        st.header(f"복습 - 문제 {question_number}")
+        review_state = st.session_state.learning_review.state(st.session_state.learning_review_number)
+        if review_state is None:
+            st.caption("새 문제")
+        else:
+            _, interval, easiness, repetitions = review_state
+            st.caption(f"연속 정답 {repetitions}회 · 복습 간격 {interval:.1f}일 · 쉬움 계수 {easiness:.2f}")
+    else:
+        st.header(f"문제 {st.session_state.current_learning_index + 1}/{len(st.session_state.learning_questions)}")
     
     if is_multiple_choice:
-        st.info(f"이 문제는 다중 선택 문제입니다. {len(correct_answer.split(','))}개의 답을 선택해주세요.")
+        st.info(f"이 문제는 다중 선택 문제입니다. {popcount(answer_mask)}개의 답을 선택해주세요.")
     
     with st.container(border=True):
-        # 질문을 smaller-question 클래스로 감싸서 글자 크기를 줄임
-        st.markdown(f"<div class='smaller-question'>{current_q['question']}</div>", unsafe_allow_html=True)
+        # 질문 본문 - 문제 은행 버전별로 한 번만 만든 HTML 조각 (smaller-question 클래스로 글자 크기를 줄임)
+        st.markdown(question_html(question_bank, position), unsafe_allow_html=True)
         
         options = current_q['options']
         
@@ -222,90 +324,108 @@ else:
             if is_multiple_choice:
                 # 체크박스로 다중 선택 지원
                 st.write("정답을 모두 선택하세요:")
-                selected_options = []
                 
                 for opt_key, opt_text in options.items():
-                    is_selected = st.checkbox(f"{opt_key}) {opt_text}", 
-                                key=f"learning_chk_{question_number}_{opt_key}")
-                    if is_selected:
-                        selected_options.append(opt_key)
+                    st.checkbox(f"{opt_key}) {opt_text}", key=f"learning_chk_{question_number}_{opt_key}")
                 
-                st.session_state.learning_selected_options = selected_options
-                
-                # 제출 버튼
-                if st.button("정답 제출", key="submit_answer_btn"):
-                    if selected_options:
-                        st.session_state.learning_showed_answer = True
-                        st.rerun()
-                    else:
-                        st.warning("최소한 하나의 답을 선택해주세요.")
+                # 제출 버튼 - 콜백에서 체크박스 값을 모아 채점
+                st.button("정답 제출", key="submit_answer_btn", on_click=submit_learning_answer,
+                          args=(question_bank, position, question_number, list(options)))
             else:
-                # 단일 선택 - 기존 방식 유지
+                # 단일 선택 - 클릭한 선택지를 콜백에서 바로 채점
                 for opt_key, opt_text in options.items():
-                    if st.button(f"{opt_key}) {opt_text}", 
-                                key=f"learning_opt_{question_number}_{opt_key}"):
-                        st.session_state.learning_selected_options = [opt_key]
-                        st.session_state.learning_showed_answer = True
-                        st.rerun()
+                    st.button(f"{opt_key}) {opt_text}", key=f"learning_opt_{question_number}_{opt_key}",
+                              on_click=answer_learning_question, args=(question_bank, position, option_bit(opt_key)))
         
         # 정답 표시
         if st.session_state.learning_showed_answer:
             st.divider()
-            selected_options = st.session_state.learning_selected_options
+            selected_mask = st.session_state.learning_selected_options
+            selected_label = ', '.join(mask_to_options(selected_mask))
             
-            # 다중 선택 정답 처리
-            if is_multiple_choice:
-                # 사용자 선택을 정렬된 문자열로 변환
-                user_answer = ','.join(sorted(selected_options))
-                # 정답도 정렬된 문자열로 변환
-                correct_sorted = ','.join(sorted(correct_answer.split(',')))
-                
-                is_correct = user_answer == correct_sorted
-                
-                if is_correct:
-                    st.success(f"🎉 정답입니다! 선택한 답: {', '.join(selected_options)}")
-                else:
-                    st.error(f"❌ 오답입니다. 선택한 답: {', '.join(selected_options)}, 정답: {correct_answer}")
+            # 단일/다중 선택 모두 정수 비교 한 번으로 채점
+            if grade(answer_mask, selected_mask):
+                st.success(f"🎉 정답입니다! 선택한 답: {selected_label}")
             else:
-                # 단일 선택 정답 처리
-                selected_option = selected_options[0] if selected_options else ""
-                is_correct = selected_option == correct_answer
-                
-                if is_correct:
-                    st.success(f"🎉 정답입니다! 선택한 답: {selected_option}")
-                else:
-                    st.error(f"❌ 오답입니다. 선택한 답: {selected_option}, 정답: {correct_answer}")
+                st.error(f"❌ 오답입니다. 선택한 답: {selected_label}, 정답: {correct_answer}")
             
-            # 정답 설명 표시
+            # 정답 해설 - 선택지별 정답/선택 표시를 캐시된 HTML 한 요소로 표시
             st.markdown("### 정답 해설")
-            st.markdown("#### 정답: " + correct_answer)
-            
-            # 선택지 표시 (정답 표시)
-            for opt_key, opt_text in options.items():
-                if ',' in correct_answer and opt_key in correct_answer.split(','):
-                    st.markdown(f"**{opt_key}) {opt_text} ✓ (정답)**")
-                elif opt_key == correct_answer:
-                    st.markdown(f"**{opt_key}) {opt_text} ✓ (정답)**")
-                elif opt_key in selected_options and (opt_key not in correct_answer.split(',') if ',' in correct_answer else opt_key != correct_answer):
-                    st.markdown(f"**{opt_key}) {opt_text} ✗ (선택한 답)**")
-                else:
-                    st.markdown(f"{opt_key}) {opt_text}")
+            st.markdown(review_html(question_bank, position, selected_mask), unsafe_allow_html=True)
+
+# 메인 앱 UI - 학습 모드
+st.title("🎓 학습 모드")
+
+# 사이드바
+with st.sidebar, span("sidebar"):
+    bank_selector()
+    st.header("옵션")
+    st.toggle("🧠 복습 모드 (간격 반복)", value=st.session_state.learning_review_mode,
+              key="learning_review_toggle", on_change=toggle_review_mode,
+              help="틀린 문제와 복습 시각이 된 문제를 먼저, 그다음 아직 풀지 않은 문제를 냅니다.")
     
-    # 진행 상태 표시
-    st.progress((st.session_state.current_learning_index) / len(st.session_state.learning_questions))
+    st.button("문제 섞기", on_click=shuffle_and_restart)
     
-    # 이전/다음 버튼
-    col1, col2 = st.columns(2)
-    with col1:
-        if st.button("← 이전 문제", key="prev_btn"):
-            prev_question()
-            st.rerun()
+    st.button("문제 순서 초기화", on_click=reset_learning_order)
     
-    with col2:
-        if st.button("다음 문제 →", key="next_btn"):
-            next_question()
-            st.rerun()
+    # 문제 번호 목록 추가
+    st.divider()
+    question_navigator()
+    
+    st.divider()
+    st.write("### 현재 상태")
+    st.write(f"총 문제 수: {len(st.session_state.learning_questions)}")
+    st.write(f"현재 문제: {st.session_state.current_learning_index + 1}")
+    st.write(f"문제 섞기: {'활성화됨' if st.session_state.learning_shuffled else '비활성화됨'}")
+    # 섞은 순서는 seed 하나로 다시 만들 수 있음 (같은 순서로 다시 보거나 검토할 때)
+    if st.session_state.learning_questions.shuffle_seed is not None:
+        st.caption(f"섞은 순서 seed: {st.session_state.learning_questions.shuffle_seed}")
+    review = st.session_state.learning_review
+    st.write(f"복습 대기: {review.due_count()}개 (학습한 문제 {len(review)}개)")
+    
+    st.divider()
+    if st.button("메인 페이지로 돌아가기"):
+        st.switch_page("app.py")
+
+with span("main"):
+    review_mode = st.session_state.learning_review_mode
+
+    # 문제 파일이 바뀌어 복습 중이던 문제가 없어졌으면 다음 복습 문제로 넘어감
+    review_number = st.session_state.learning_review_number
+    if review_mode and review_number is not None and bank.position(review_number) is None:
+        st.session_state.learning_review_number = None
+        next_review_question()
+
+    # 문제 화면 - 문제 이동 버튼은 조각 밖에 두어 이동할 때 문제 목록까지 한 번에 갱신
+    if not st.session_state.learning_questions:
+        st.warning("문제 데이터를 불러올 수 없습니다.")
+    elif review_mode and st.session_state.learning_review_number is None:
+        st.info("지금 복습할 문제가 없습니다. 잠시 후 다시 확인하거나 복습 모드를 끄고 목록 순서로 학습하세요.")
+        st.button("다음 복습 문제 확인", key="review_retry_btn", on_click=next_review_question)
+    else:
+        question_panel()
+        
+        if review_mode:
+            # 복습 모드는 스케줄러가 다음 문제를 고름
+            review = st.session_state.learning_review
+            st.caption(f"복습 대기 {review.due_count()}개 · 학습한 문제 {len(review)}/{len(bank)}")
+            st.button("다음 복습 문제 →", key="next_review_btn", use_container_width=True,
+                      on_click=next_review_question)
+        else:
+            # 진행 상태 표시
+            st.progress((st.session_state.current_learning_index) / len(st.session_state.learning_questions))
+
+            # 이전/다음 버튼
+            col1, col2 = st.columns(2)
+            with col1:
+                st.button("← 이전 문제", key="prev_btn", on_click=prev_question)
+
+            with col2:
+                st.button("다음 문제 →", key="next_btn", on_click=next_question)
 
 # 푸터
 st.divider()
-st.markdown("SAP 문제 풀이 앱 - 학습 모드") 
\ No newline at end of file
+st.markdown("SAP 문제 풀이 앱 - 학습 모드") 
+
+# 구간 추적 결과 표시
+show_trace()
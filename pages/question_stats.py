@@ -0,0 +1,181 @@
+import streamlit as st
+import pandas as pd
+
+from quiz.grading import option_bit
+from quiz.history import get_history_store, score_trend, weak_questions
+from quiz.stats import get_stats_store, hardest_selection
+from quiz.tracing import span
+from quiz.ui import (admin_password, bank_selector, ensure_session, get_bank, inject_styles, is_admin,
+                     select_exam_questions, show_trace, start_trace)
+
+# 페이지 기본 설정
+st.set_page_config(
+    page_title="문제 통계 - SAP 문제 풀이 앱",
+    page_icon="📊",
+    layout="wide"
+)
+
+# 구간 추적 (?trace=1 일 때만)
+start_trace("question_stats")
+
+# 공용 스타일 설정
+inject_styles()
+
+# 공유 문제 은행 (프로세스 전체에서 한 번만 로드)
+bank = get_bank()
+
+# 세션 식별자 준비 및 저장된 세션 복원 (어려운 문제 선택을 시험 모드로 넘기기 위해)
+ensure_session(bank)
+
+PREVIEW_LENGTH = 60
+
+# 문제 통계 저장소 - 대기 중인 카운터를 먼저 반영해 방금 채점한 답안까지 표시
+store = get_stats_store()
+with span("stats.flush"):
+    store.flush()
+bank_id = st.session_state.bank_id
+
+# 문제 번호로 본문 앞부분 가져오기 (문제 은행에 없는 번호는 빈 문자열)
+def question_preview(number):
+    position = bank.position(number)
+    if position is None:
+        return ""
+    text = str(bank[position].get('question', ''))
+    return text if len(text) <= PREVIEW_LENGTH else text[:PREVIEW_LENGTH] + "…"
+
+# 통계 삭제 콜백 (삭제 후 같은 실행에서 빈 통계를 표시)
+# 모든 사용자가 함께 쓰는 통계이므로 누를 때 관리자 비밀번호를 다시 확인
+def reset_stats():
+    if not is_admin(st.session_state.get('stats_admin_password')):
+        st.toast("관리자 비밀번호가 맞지 않습니다.", icon="❌")
+        return
+    store.reset(bank_id)
+    st.toast("문제 통계를 삭제했습니다.", icon="🗑️")
+
+st.title("📊 문제 통계")
+
+# 사이드바
+with st.sidebar, span("sidebar"):
+    bank_selector()
+    st.header("조회 조건")
+    limit = st.number_input("표시할 문제 수", min_value=10, max_value=500, value=50, step=10, key="stats_limit")
+    min_attempts = st.number_input("최소 시도 수", min_value=1, value=3, step=1, key="stats_min_attempts",
+                                   help="시도 수가 적은 문제는 정답률이 크게 흔들리므로 제외합니다.")
+
+    # 통계 초기화는 관리자 비밀번호(SAP_QUIZ_ADMIN_PASSWORD)를 설정한 서버에서만 표시
+    if admin_password():
+        st.divider()
+        with st.expander("통계 초기화 (관리자)"):
+            st.text_input("관리자 비밀번호", type="password", key="stats_admin_password")
+            confirm = st.checkbox("이 문제 은행의 통계를 모두 삭제합니다", key="stats_reset_confirm")
+            st.button("🗑️ 통계 삭제", disabled=not confirm, use_container_width=True, key="stats_reset_btn",
+                      on_click=reset_stats)
+
+with span("main"):
+    question_count, attempts, correct = store.totals(bank_id)
+    col1, col2, col3 = st.columns(3)
+    col1.metric("통계가 있는 문제", f"{question_count:,} / {len(bank):,}")
+    col2.metric("채점한 답안", f"{attempts:,}")
+    col3.metric("전체 정답률", f"{correct / attempts:.1%}" if attempts else "-")
+
+    if not attempts:
+        st.info("아직 채점한 답안이 없습니다. 학습 모드나 시험 모드에서 문제를 풀면 통계가 쌓입니다.")
+    else:
+        # 정답률이 낮은 문제 (정답률 인덱스로 상위 limit개만 조회)
+        st.subheader("🔥 가장 어려운 문제")
+        with span("stats.hardest"):
+            hardest = store.hardest(bank_id, limit, min_attempts)
+            picks = store.option_picks(bank_id, [number for number, _, _ in hardest])
+
+        if hardest:
+            rows = []
+            for number, question_attempts, question_correct in hardest:
+                position = bank.position(number)
+                answer_mask = bank.answer_masks[position] if position is not None else 0
+                # 정답이 아닌 선택지 중 가장 많이 고른 것
+                wrong_picks = [(count, option) for option, count in picks[number].items()
+                               if not answer_mask & option_bit(option)]
+                top_wrong = max(wrong_picks) if wrong_picks else None
+                rows.append({
+                    '번호': number,
+                    '시도': question_attempts,
+                    '정답': question_correct,
+                    '정답률': 100 * question_correct / question_attempts,
+                    '가장 많이 고른 오답': f"{top_wrong[1]} ({top_wrong[0]}회)" if top_wrong else "-",
+                    '문제': question_preview(number),
+                })
+            st.dataframe(
+                pd.DataFrame(rows),
+                hide_index=True,
+                use_container_width=True,
+                column_config={'정답률': st.column_config.ProgressColumn(format="%.0f%%", min_value=0, max_value=100)},
+            )
+
+            if st.button(f"📝 이 {len(hardest)}문제로 시험 보기", type="primary", key="stats_hardest_exam"):
+                selection = hardest_selection(store, bank_id, limit, min_attempts) & bank.available_intervals
+                select_exam_questions(selection)
+                st.switch_page("pages/exam_mode.py")
+        else:
+            st.info(f"시도 수가 {min_attempts}회 이상인 문제가 없습니다.")
+
+        # 가장 많이 고른 오답 선택지 (선택 수 인덱스로 상위 limit개만 조회)
+        st.subheader("❌ 가장 많이 고른 오답")
+        with span("stats.wrong_options"):
+            wrong_options = store.wrong_options(bank_id, limit)
+        st.dataframe(
+            pd.DataFrame(
+                [{'번호': number, '선택지': option, '선택 수': count, '문제': question_preview(number)}
+                 for number, option, count in wrong_options],
+                columns=['번호', '선택지', '선택 수', '문제'],
+            ),
+            hide_index=True,
+            use_container_width=True,
+        )
+
+# 내 시험 기록 - 끝낸 시험의 점수 추이와 자주 틀린 문제 (열 단위 시험 기록을 pandas로 집계)
+with span("history"):
+    st.subheader("📈 내 시험 기록")
+    history = get_history_store()
+    with span("history.flush"):
+        history.flush()
+    with span("history.frames"):
+        my_attempts, my_answers = history.frames(bank_id, st.session_state.session_id)
+
+    if my_attempts.empty:
+        st.info("아직 끝낸 시험이 없습니다. 시험 모드에서 시험을 끝내면 기록이 쌓입니다.")
+    else:
+        trend = score_trend(my_attempts)
+        col1, col2, col3 = st.columns(3)
+        col1.metric("끝낸 시험", f"{len(trend):,}")
+        col2.metric("평균 점수", f"{trend['score_pct'].mean():.0f}점")
+        col3.metric("최근 점수", f"{trend['score_pct'].iloc[-1]:.0f}점",
+                    delta=f"{trend['score_pct'].iloc[-1] - trend['score_pct'].iloc[:-1].mean():.0f}점"
+                    if len(trend) > 1 else None)
+        st.line_chart(
+            trend.set_index('finished_at')[['score_pct', 'rolling_pct']].rename(
+                columns={'score_pct': '점수', 'rolling_pct': '최근 5회 평균'}),
+        )
+
+        weak = weak_questions(my_answers, limit=limit, min_answers=1)
+        if not weak.empty:
+            st.write("**내가 자주 틀린 문제**")
+            st.dataframe(
+                pd.DataFrame({
+                    '번호': weak['number'],
+                    '답한 횟수': weak['answers'],
+                    '정답': weak['correct'],
+                    '정답률': 100 * weak['accuracy'],
+                    '문제': weak['number'].map(question_preview),
+                }),
+                hide_index=True,
+                use_container_width=True,
+                column_config={'정답률': st.column_config.ProgressColumn(format="%.0f%%", min_value=0, max_value=100)},
+            )
+    st.caption("전체 시험 기록은 `python export_history.py history.csv`로 내보낼 수 있습니다.")
+
+# 푸터
+st.divider()
+st.markdown("SAP 문제 풀이 앱 - 문제 통계")
+
+# 구간 추적 결과 표시
+show_trace()
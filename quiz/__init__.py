@@ -0,0 +1,4 @@
+"""SAP 문제 풀이 앱 공용 모듈"""
+from quiz.bank import QuestionBank, load_bank
+
+__all__ = ["QuestionBank", "load_bank"]
@@ -0,0 +1,68 @@
+"""
+시험/학습 진행 상황 자동 저장 (write-behind)
+
+요청 스레드에서는 바뀐 세션 키의 값만 인코딩해 대기열에 넣고 바로 반환한다.
+백그라운드 스레드가 주기적으로 대기열을 비우면서 같은 세션의 변경분을 합쳐
+여러 세션을 한 트랜잭션으로 세션 저장소에 반영한다.
+"""
+import atexit
+import logging
+import threading
+import time
+
+from quiz.session_store import get_session_store, merge_documents
+
+FLUSH_INTERVAL = 0.5
+
+logger = logging.getLogger(__name__)
+
+
+class AutoSaver:
+    """세션별 변경분을 모아 주기적으로 저장하는 백그라운드 저장기"""
+
+    def __init__(self, store, interval=FLUSH_INTERVAL):
+        self.store = store
+        self.interval = interval
+        self._pending = {}
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def submit(self, session_id, changes):
+        """encode_state로 인코딩한 변경분을 대기열에 추가 (같은 세션은 최신 값으로 합침)"""
+        with self._lock:
+            previous = self._pending.get(session_id)
+            self._pending[session_id] = changes if previous is None else merge_documents(previous, changes)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="quiz-autosave", daemon=True)
+                self._thread.start()
+
+    def flush(self):
+        """대기 중인 변경분을 지금 저장"""
+        with self._lock:
+            batch, self._pending = self._pending, {}
+        if not batch:
+            return
+        try:
+            self.store.merge_many(batch)
+        except Exception:
+            logger.exception("자동 저장에 실패했습니다 (%d개 세션)", len(batch))
+
+    def _run(self):
+        while True:
+            time.sleep(self.interval)
+            self.flush()
+
+
+_autosaver = None
+_autosaver_lock = threading.Lock()
+
+
+# 프로세스 전체에서 공유하는 자동 저장기 (프로세스 종료 시 남은 변경분 저장)
+def get_autosaver():
+    global _autosaver
+    if _autosaver is None:
+        with _autosaver_lock:
+            if _autosaver is None:
+                _autosaver = AutoSaver(get_session_store())
+                atexit.register(_autosaver.flush)
+    return _autosaver
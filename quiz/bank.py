@@ -0,0 +1,267 @@
+"""문제 은행 모듈 - 프로세스 전체에서 한 번만 만들어 공유하는 인덱스된 문제 데이터"""
+import hashlib
+import json
+import os
+import threading
+from array import array
+from collections import OrderedDict
+from functools import cached_property
+
+import numpy as np
+
+from quiz.grading import options_to_mask
+from quiz.selection import IntervalSet
+
+DEFAULT_BANK_PATH = "questions.json"
+DEFAULT_MEMORY_BUDGET_MB = 512
+# 파싱된 JSON 문제 은행의 메모리 사용량 추정 배율 (원본 파일 크기 대비)
+JSON_MEMORY_FACTOR = 4
+
+
+# 문제 번호를 정수로 정규화하는 함수 (변환할 수 없으면 None)
+def normalize_number(value):
+    try:
+        text = str(value).strip()
+        return int(text) if text else None
+    except (ValueError, TypeError):
+        return None
+
+
+# 정답 문자열('A' 또는 'A,C')을 비트마스크로 변환하는 함수
+def parse_answer(answer):
+    return options_to_mask(str(answer or ''))
+
+
+class QuestionBank:
+    """
+    문제 목록과 조회용 인덱스를 함께 보관하는 객체
+    - numbers: 위치별 정수 문제 번호 (변환 불가 시 None)
+    - answer_masks: 위치별 정답 비트마스크 (quiz.grading 참고)
+    - available_numbers: 정렬된 유효 문제 번호 배열
+    - sorted_positions: available_numbers 각 번호의 위치
+    """
+
+    def __init__(self, questions, version=None, answer_masks=None):
+        self.questions = questions
+        self.version = version
+        self.source = None
+        self.content_hash = None
+        self.changed_positions = []
+        self.numbers = [normalize_number(q.get('number')) for q in questions]
+        if answer_masks is None:
+            answer_masks = array('I', (parse_answer(q.get('answer')) for q in questions))
+        self.answer_masks = answer_masks
+
+        # 번호 -> 위치 해시 인덱스 (정수가 아닌 번호는 문자열 그대로 키로 사용)
+        self._index = {}
+        for pos, (q, num) in enumerate(zip(questions, self.numbers)):
+            key = num if num is not None else str(q.get('number', '')).strip()
+            self._index.setdefault(key, pos)
+
+        self.available_numbers = array('q', sorted({n for n in self.numbers if n is not None}))
+        self.sorted_positions = array('I', (self._index[n] for n in self.available_numbers))
+
+    @cached_property
+    def available_intervals(self):
+        """유효 문제 번호의 구간 집합 (처음 사용할 때 한 번만 계산)"""
+        return IntervalSet.from_sorted_numbers(self.available_numbers)
+
+    @cached_property
+    def answer_strata(self):
+        """
+        available_numbers 인덱스를 단일 정답/다중 정답 문제로 나눈 (single, multi) 정렬 배열
+        구간 선택 안의 각 층은 두 배열의 연속 구간이 됨 (처음 사용할 때 한 번만 계산)
+        """
+        masks = np.asarray(self.answer_masks, dtype=np.uint32)[np.asarray(self.sorted_positions, dtype=np.intp)]
+        multi = (masks & (masks - np.uint32(1))) != 0
+        return np.flatnonzero(~multi), np.flatnonzero(multi)
+
+    def _lookup(self, key):
+        return self._index.get(key)
+
+    def __len__(self):
+        return len(self.questions)
+
+    def __getitem__(self, pos):
+        return self.questions[pos]
+
+    def __iter__(self):
+        return iter(self.questions)
+
+    def position(self, number):
+        """문제 번호(문자열 또는 정수)에 해당하는 위치 반환, 없으면 None"""
+        key = normalize_number(number)
+        if key is None:
+            key = str(number).strip()
+        return self._lookup(key)
+
+    def get(self, number):
+        pos = self.position(number)
+        return None if pos is None else self.questions[pos]
+
+    def has_number(self, number):
+        return self._lookup(number) is not None
+
+    def answer_mask(self, number):
+        pos = self.position(number)
+        return None if pos is None else self.answer_masks[pos]
+
+    def positions_for(self, numbers):
+        """선택된 번호들의 위치를 문제 은행 순서대로 반환"""
+        return sorted(pos for pos in map(self._lookup, numbers) if pos is not None)
+
+    def positions_in(self, selection):
+        """구간 선택(IntervalSet)에 포함된 번호들의 위치를 번호 순서대로 반환 (구간마다 이분 탐색)"""
+        positions = array('I')
+        for lo, hi in selection.slice_sorted(self.available_numbers):
+            positions.extend(self.sorted_positions[lo:hi])
+        return positions
+
+    def apply_delta(self, questions, version=None):
+        """
+        새 문제 목록과 비교해 바뀐 레코드만 반영한 새 문제 은행을 반환
+        기존 문제 은행은 변경하지 않으므로 진행 중인 세션은 이전 내용을 그대로 사용
+        """
+        old_questions = self.questions
+        if len(questions) == len(old_questions) and all(
+                old_questions[pos].get('number') == q.get('number') for pos, q in enumerate(questions)):
+            # 번호 배치가 같으면 인덱스를 공유하고 바뀐 위치만 교체
+            changed = [pos for pos, q in enumerate(questions) if q != old_questions[pos]]
+            bank = object.__new__(type(self))
+            bank.__dict__.update(self.__dict__)
+            bank.version = version
+            bank.questions = list(old_questions)
+            bank.answer_masks = array('I', self.answer_masks)
+            for pos in changed:
+                bank.questions[pos] = questions[pos]
+                bank.answer_masks[pos] = parse_answer(questions[pos].get('answer'))
+            bank.changed_positions = changed
+            # 정답이 바뀌었을 수 있으므로 정답 기준으로 계산해 둔 값은 다시 계산
+            bank.__dict__.pop('answer_strata', None)
+            return bank
+
+        # 문제가 추가/삭제된 경우 인덱스를 다시 만들되 내용이 같은 문제는 기존 객체를 재사용
+        merged = []
+        answer_masks = array('I')
+        changed = []
+        for pos, q in enumerate(questions):
+            old_pos = self.position(q.get('number', ''))
+            if old_pos is not None and old_questions[old_pos] == q:
+                merged.append(old_questions[old_pos])
+                answer_masks.append(self.answer_masks[old_pos])
+            else:
+                merged.append(q)
+                answer_masks.append(parse_answer(q.get('answer')))
+                changed.append(pos)
+        bank = type(self)(merged, version=version, answer_masks=answer_masks)
+        bank.changed_positions = changed
+        return bank
+
+
+# 경로 -> 문제 은행 (최근에 사용한 순서, 메모리 예산을 넘으면 오래된 것부터 제거)
+_banks = OrderedDict()
+_bank_sizes = {}
+_banks_lock = threading.Lock()
+
+
+# 캐시된 문제 은행 전체의 메모리 예산 (바이트, 환경 변수 SAP_QUIZ_BANK_MEMORY_MB)
+def memory_budget():
+    return int(float(os.environ.get('SAP_QUIZ_BANK_MEMORY_MB', DEFAULT_MEMORY_BUDGET_MB)) * 1024 * 1024)
+
+
+# 문제 은행의 메모리 사용량 추정 (컴파일된 파일은 mmap이므로 디코딩 캐시 정도만 계산)
+def _estimate_bytes(bank, file_size, compiled):
+    if compiled:
+        from quiz.compiled import DECODE_CACHE_SIZE
+        return DECODE_CACHE_SIZE * JSON_MEMORY_FACTOR * file_size // max(len(bank), 1)
+    return file_size * JSON_MEMORY_FACTOR
+
+
+# 메모리 예산을 넘으면 가장 오래전에 사용한 문제 은행부터 캐시에서 제거 (keep은 유지)
+# 진행 중인 세션의 뷰는 문제 은행을 직접 참조하므로 제거되어도 계속 사용할 수 있음
+def _evict(keep):
+    budget = memory_budget()
+    total = sum(_bank_sizes.values())
+    for path in list(_banks):
+        if total <= budget:
+            break
+        if path == keep:
+            continue
+        del _banks[path]
+        total -= _bank_sizes.pop(path, 0)
+
+
+# 현재 캐시된 문제 은행 경로 목록 (최근 사용 순)
+def cached_banks():
+    return list(reversed(_banks))
+
+
+# 기본 문제 파일 경로 (환경 변수 SAP_QUIZ_BANK로 다른 파일을 지정할 수 있음)
+def default_bank_path():
+    return os.environ.get('SAP_QUIZ_BANK', DEFAULT_BANK_PATH)
+
+
+# 컴파일된 문제 은행 파일 경로 (questions.json -> questions.qbank)
+def compiled_path(path):
+    return os.path.splitext(path)[0] + '.qbank'
+
+
+# 원본 JSON보다 오래되지 않은 컴파일 파일이 있으면 그 경로를, 없으면 JSON 경로를 반환
+def _resolve_source(path):
+    qbank_path = compiled_path(path)
+    try:
+        qbank_mtime = os.stat(qbank_path).st_mtime_ns
+    except OSError:
+        return path, False
+    try:
+        json_mtime = os.stat(path).st_mtime_ns
+    except OSError:
+        return qbank_path, True
+    return (qbank_path, True) if qbank_mtime >= json_mtime else (path, False)
+
+
+# 파일 버전(수정 시각, 크기) 단위로 문제 은행을 한 번만 만들어 공유하는 함수
+# 컴파일된 .qbank 파일이 있으면 mmap으로 열고, 없으면 JSON을 파싱 (fallback)
+# JSON 파일이 바뀌면 내용 해시로 실제 변경 여부를 확인한 뒤 바뀐 문제만 반영 (hot reload)
+# 처음 사용할 때 불러오고, 캐시 전체가 메모리 예산을 넘으면 오래 쓰지 않은 문제 은행부터 제거 (LRU)
+def load_bank(path=None):
+    path = path or default_bank_path()
+    source, compiled = _resolve_source(path)
+    stat = os.stat(source)
+    version = (stat.st_mtime_ns, stat.st_size)
+
+    cached = _banks.get(path)
+    if cached is not None and cached.version == version:
+        try:
+            _banks.move_to_end(path)
+        except KeyError:
+            pass
+        return cached
+
+    with _banks_lock:
+        cached = _banks.get(path)
+        if cached is not None and cached.version == version:
+            return cached
+        if compiled:
+            from quiz.compiled import MappedQuestionBank
+            bank = MappedQuestionBank(source, version=version)
+        else:
+            with open(source, 'rb') as f:
+                data = f.read()
+            content_hash = hashlib.sha1(data).hexdigest()
+            if cached is not None and cached.source == source and cached.content_hash == content_hash:
+                # 수정 시각만 바뀐 경우 (내용 동일)
+                cached.version = version
+                return cached
+            questions = json.loads(data.decode('utf-8'))
+            if cached is not None and cached.source == source:
+                bank = cached.apply_delta(questions, version=version)
+            else:
+                bank = QuestionBank(questions, version=version)
+            bank.content_hash = content_hash
+        bank.source = source
+        _banks[path] = bank
+        _banks.move_to_end(path)
+        _bank_sizes[path] = _estimate_bytes(bank, stat.st_size, compiled)
+        _evict(keep=path)
+        return bank
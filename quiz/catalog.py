@@ -0,0 +1,97 @@
+"""
+문제 은행 카탈로그 - 여러 자격증 과정(FI, MM, SD, ABAP ...)의 문제 은행 목록
+
+카탈로그 디렉터리(기본: banks, 환경 변수 SAP_QUIZ_BANK_DIR)의 <id>.json 또는 <id>.qbank 파일이
+각각 하나의 문제 은행이다. 선택 사항인 <id>.meta.json 파일로 표시 이름과 설명을 지정할 수 있다:
+
+    {"title": "SAP FI", "description": "재무 회계 인증 대비"}
+
+목록을 만들 때는 파일 이름과 메타데이터만 읽고, 문제는 처음 선택될 때 quiz.bank.load_bank로 불러온다.
+카탈로그 디렉터리가 없거나 비어 있으면 기존처럼 questions.json 하나만 사용한다.
+"""
+import json
+import os
+import threading
+
+from quiz.bank import default_bank_path
+
+DEFAULT_CATALOG_DIR = "banks"
+DEFAULT_BANK_ID = "default"
+META_SUFFIX = ".meta.json"
+
+
+class BankInfo:
+    """카탈로그 항목 - 문제는 불러오지 않고 식별자, 경로, 메타데이터만 보관"""
+
+    __slots__ = ('id', 'path', 'title', 'description')
+
+    def __init__(self, bank_id, path, title=None, description=""):
+        self.id = bank_id
+        self.path = path
+        self.title = title or bank_id
+        self.description = description
+
+    def __repr__(self):
+        return f"BankInfo({self.id!r}, {self.path!r})"
+
+
+# 카탈로그 디렉터리 경로
+def catalog_dir():
+    return os.environ.get('SAP_QUIZ_BANK_DIR', DEFAULT_CATALOG_DIR)
+
+
+def _read_meta(path):
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+        return meta if isinstance(meta, dict) else {}
+    except (OSError, ValueError):
+        return {}
+
+
+def _scan(directory):
+    banks = {}
+    for name in sorted(os.listdir(directory)):
+        if name.endswith(META_SUFFIX):
+            continue
+        bank_id, ext = os.path.splitext(name)
+        if ext not in ('.json', '.qbank') or bank_id in banks:
+            continue
+        # .json과 .qbank가 모두 있으면 JSON 경로로 등록 (load_bank가 최신 컴파일 파일을 고름)
+        json_path = os.path.join(directory, bank_id + '.json')
+        path = json_path if os.path.exists(json_path) else os.path.join(directory, name)
+        meta = _read_meta(os.path.join(directory, bank_id + META_SUFFIX))
+        banks[bank_id] = BankInfo(bank_id, path, meta.get('title'), meta.get('description', ""))
+    return list(banks.values())
+
+
+_catalogs = {}
+_catalogs_lock = threading.Lock()
+
+
+# 카탈로그의 문제 은행 목록 (디렉터리 수정 시각이 바뀔 때만 다시 읽음)
+def discover_banks(directory=None):
+    directory = directory or catalog_dir()
+    try:
+        version = os.stat(directory).st_mtime_ns
+    except OSError:
+        version = None
+
+    cached = _catalogs.get(directory)
+    if cached is not None and cached[0] == version:
+        return cached[1]
+
+    with _catalogs_lock:
+        banks = _scan(directory) if version is not None else []
+        if not banks:
+            banks = [BankInfo(DEFAULT_BANK_ID, default_bank_path())]
+        _catalogs[directory] = (version, banks)
+    return banks
+
+
+# 식별자로 카탈로그 항목 찾기 (없으면 None)
+def find_bank(bank_id, banks=None):
+    for info in banks if banks is not None else discover_banks():
+        if info.id == bank_id:
+            return info
+    return None
@@ -0,0 +1,205 @@
+"""
+컴파일된 문제 은행(.qbank) 형식
+
+파일 구조 (리틀 엔디언, 각 구역은 8바이트 경계로 정렬):
+- 헤더: 매직, 형식 버전, 문제 수(n), 유효 번호 수(m), 별칭 길이, 레코드 시작 위치
+- numbers: int32[n]  위치별 정수 문제 번호 (없으면 NO_NUMBER)
+- answer_masks: uint32[n]  위치별 정답 비트마스크 (A=1, B=2, C=4 ...)
+- offsets: uint64[n+1]  레코드 시작 위치 (레코드 구역 기준)
+- sorted_numbers: int32[m]  정렬된 유효 문제 번호
+- sorted_positions: uint32[m]  sorted_numbers 각 번호의 위치
+- aliases: 정수가 아닌 문제 번호 -> 위치 (JSON)
+- records: 문제별 UTF-8 JSON 레코드
+
+파일은 mmap으로 열고 고정 폭 구역은 memoryview로 바로 참조하므로
+시작 비용이 문제 수와 무관하며, 문제 레코드는 페이지가 접근할 때만 디코딩한다.
+"""
+import json
+import mmap
+import os
+import struct
+import sys
+import tempfile
+from array import array
+from bisect import bisect_left
+from collections.abc import Sequence
+from functools import lru_cache
+
+from quiz.bank import QuestionBank, normalize_number
+from quiz.grading import options_to_mask
+
+MAGIC = b'SAPQBANK'
+FORMAT_VERSION = 1
+HEADER = struct.Struct('<8sHHIIIQ')
+NO_NUMBER = -2 ** 31
+DECODE_CACHE_SIZE = 256
+
+
+def _align(offset):
+    return (offset + 7) & ~7
+
+
+# 각 구역의 (시작 위치, 길이) 계산 - 쓰기와 읽기에서 같은 배치를 사용
+def _layout(count, unique_count, alias_length):
+    sizes = [
+        ('numbers', 4 * count),
+        ('answer_masks', 4 * count),
+        ('offsets', 8 * (count + 1)),
+        ('sorted_numbers', 4 * unique_count),
+        ('sorted_positions', 4 * unique_count),
+        ('aliases', alias_length),
+    ]
+    layout = {}
+    offset = HEADER.size
+    for name, size in sizes:
+        offset = _align(offset)
+        layout[name] = (offset, size)
+        offset += size
+    return layout, _align(offset)
+
+
+# 문제 목록을 .qbank 파일로 컴파일하는 함수 (임시 파일에 쓴 뒤 원자적으로 교체)
+def compile_bank(questions, out_path):
+    numbers = array('i')
+    masks = array('I')
+    offsets = array('Q', [0])
+    first_positions = {}
+    aliases = {}
+    records = []
+
+    for pos, q in enumerate(questions):
+        num = normalize_number(q.get('number'))
+        if num is None or not NO_NUMBER < num < 2 ** 31:
+            aliases.setdefault(str(q.get('number', '')).strip(), pos)
+            num = NO_NUMBER
+        else:
+            first_positions.setdefault(num, pos)
+        numbers.append(num)
+
+        try:
+            masks.append(options_to_mask(str(q.get('answer') or ''), strict=True))
+        except ValueError as e:
+            raise ValueError(f"문제 {q.get('number')}: {e}") from None
+
+        record = json.dumps(q, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+        records.append(record)
+        offsets.append(offsets[-1] + len(record))
+
+    sorted_numbers = array('i', sorted(first_positions))
+    sorted_positions = array('I', (first_positions[n] for n in sorted_numbers))
+    alias_blob = json.dumps(aliases, ensure_ascii=False).encode('utf-8')
+
+    sections = {
+        'numbers': numbers,
+        'answer_masks': masks,
+        'offsets': offsets,
+        'sorted_numbers': sorted_numbers,
+        'sorted_positions': sorted_positions,
+    }
+    if sys.byteorder != 'little':
+        for column in sections.values():
+            column.byteswap()
+    sections['aliases'] = alias_blob
+
+    layout, data_offset = _layout(len(numbers), len(sorted_numbers), len(alias_blob))
+    header = HEADER.pack(MAGIC, FORMAT_VERSION, 0, len(numbers), len(sorted_numbers),
+                         len(alias_blob), data_offset)
+
+    out_dir = os.path.dirname(os.path.abspath(out_path))
+    fd, tmp_path = tempfile.mkstemp(dir=out_dir, suffix='.qbank.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(header)
+            for name, (offset, _) in layout.items():
+                f.write(b'\0' * (offset - f.tell()))
+                f.write(bytes(sections[name]))
+            f.write(b'\0' * (data_offset - f.tell()))
+            for record in records:
+                f.write(record)
+        os.replace(tmp_path, out_path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+    return len(records)
+
+
+class _NumberColumn(Sequence):
+    """int32 번호 열을 정수/None 시퀀스로 보여주는 래퍼"""
+
+    def __init__(self, view):
+        self._view = view
+
+    def __len__(self):
+        return len(self._view)
+
+    def __getitem__(self, pos):
+        num = self._view[pos]
+        return None if num == NO_NUMBER else num
+
+
+class _RecordColumn(Sequence):
+    """접근할 때만 레코드를 디코딩하는 문제 시퀀스 (최근 레코드는 LRU 캐시)"""
+
+    def __init__(self, buffer, offsets, data_offset):
+        self._buffer = buffer
+        self._offsets = offsets
+        self._data_offset = data_offset
+        self._decode = lru_cache(maxsize=DECODE_CACHE_SIZE)(self._decode_record)
+
+    def _decode_record(self, pos):
+        start = self._data_offset + self._offsets[pos]
+        end = self._data_offset + self._offsets[pos + 1]
+        return json.loads(self._buffer[start:end].tobytes().decode('utf-8'))
+
+    def __len__(self):
+        return len(self._offsets) - 1
+
+    def __getitem__(self, pos):
+        if pos < 0:
+            pos += len(self)
+        if not 0 <= pos < len(self):
+            raise IndexError(pos)
+        return self._decode(pos)
+
+
+class MappedQuestionBank(QuestionBank):
+    """mmap으로 연 .qbank 파일 위의 문제 은행 - QuestionBank와 같은 조회 API 제공"""
+
+    def __init__(self, path, version=None):
+        if sys.byteorder != 'little':
+            raise ValueError("컴파일된 문제 은행은 리틀 엔디언 환경에서만 열 수 있습니다.")
+
+        with open(path, 'rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        buffer = memoryview(self._mmap)
+
+        magic, fmt_version, _, count, unique_count, alias_length, data_offset = HEADER.unpack_from(buffer)
+        if magic != MAGIC or fmt_version != FORMAT_VERSION:
+            raise ValueError(f"지원하지 않는 문제 은행 형식입니다: {path}")
+        layout, _ = _layout(count, unique_count, alias_length)
+
+        def section(name, fmt):
+            offset, size = layout[name]
+            return buffer[offset:offset + size].cast(fmt)
+
+        self.version = version
+        self.source = path
+        self.content_hash = None
+        self.changed_positions = []
+        self._numbers = section('numbers', 'i')
+        self.answer_masks = section('answer_masks', 'I')
+        self.sorted_positions = section('sorted_positions', 'I')
+        self.available_numbers = section('sorted_numbers', 'i')
+        self.numbers = _NumberColumn(self._numbers)
+        self.questions = _RecordColumn(buffer, section('offsets', 'Q'), data_offset)
+
+        offset, size = layout['aliases']
+        self._aliases = json.loads(buffer[offset:offset + size].tobytes().decode('utf-8'))
+
+    def _lookup(self, key):
+        if isinstance(key, int):
+            i = bisect_left(self.available_numbers, key)
+            if i < len(self.available_numbers) and self.available_numbers[i] == key:
+                return self.sorted_positions[i]
+            return None
+        return self._aliases.get(key)
@@ -0,0 +1,61 @@
+"""
+정답 비트마스크 채점 모듈
+
+선택지 A..Z를 각각 하나의 비트(A=1, B=2, C=4 ...)로 표현한다.
+정답은 문제 은행을 불러올 때 한 번만 마스크로 변환하고, 사용자 선택도 같은 방식으로 저장하므로
+채점은 정수 비교 한 번(정답 여부)과 비트 수 세기(부분 점수)로 끝난다.
+"""
+
+OPTION_LETTERS = 'ABCDEFGHIJKLMNOPQRSTUVWXYZ'
+_OPTION_BITS = {letter: 1 << i for i, letter in enumerate(OPTION_LETTERS)}
+
+
+# 선택지 기호 하나를 비트로 변환 (지원하지 않는 기호는 0)
+def option_bit(option):
+    return _OPTION_BITS.get(option, 0)
+
+
+# 선택지 목록 또는 'A,C' 형식의 문자열을 비트마스크로 변환
+def options_to_mask(options, strict=False):
+    if isinstance(options, str):
+        options = options.split(',')
+    mask = 0
+    for opt in options:
+        opt = opt.strip()
+        if not opt:
+            continue
+        bit = _OPTION_BITS.get(opt, 0)
+        if not bit and strict:
+            raise ValueError(f"지원하지 않는 선택지 기호: {opt!r}")
+        mask |= bit
+    return mask
+
+
+# 비트마스크를 정렬된 선택지 기호 목록으로 변환 (화면 표시용)
+def mask_to_options(mask):
+    return [letter for i, letter in enumerate(OPTION_LETTERS) if mask >> i & 1]
+
+
+# 비트 수 세기 (Python 3.7 호환)
+def popcount(mask):
+    return bin(mask).count('1')
+
+
+# 정답 여부 - 선택한 선택지 집합이 정답 집합과 정확히 같아야 정답
+def is_correct(answer_mask, selected_mask):
+    return answer_mask == selected_mask
+
+
+# 부분 점수 - (맞힌 정답 수 - 잘못 고른 선택지 수) / 정답 수, 0 미만은 0
+def partial_credit(answer_mask, selected_mask):
+    total = popcount(answer_mask)
+    if not total:
+        return 0.0
+    hits = popcount(answer_mask & selected_mask)
+    wrong = popcount(selected_mask & ~answer_mask)
+    return max(0, hits - wrong) / total
+
+
+# 여러 문제를 한 번에 채점해 정답 수 반환 - (정답 마스크, 선택 마스크) 쌍 목록
+def count_correct(pairs):
+    return sum(1 for answer_mask, selected_mask in pairs if answer_mask == selected_mask)
@@ -0,0 +1,398 @@
+"""
+시험 기록 저장소 - 끝난 시험마다 문제별 답안을 열(column) 단위 세그먼트 파일에 추가
+
+시험 한 번은 기록 한 행(세션, 문제 은행과 버전, 시험 범위, 시작/종료 시각, 점수)과
+문제 수만큼의 답안 행(번호, 정답/선택 비트마스크, 정답 여부, 다중 정답 여부)이 된다.
+요청 스레드는 채점 결과 배열을 대기열에 넣기만 하고, 백그라운드 스레드가 모아 둔 시험을
+세그먼트 파일 하나(열마다 NumPy 배열 하나인 비압축 .npz)로 쓴다. 세그먼트는 한 번 쓰면 바꾸지 않는다.
+
+세그먼트가 많아지면 하나로 합친다. 합친 세그먼트에는 대신하는 세그먼트 이름을 적어 두므로
+옛 세그먼트를 지우기 전에 목록을 읽은 쪽도 같은 시험을 두 번 세지 않는다.
+분석은 세그먼트 배열을 이어 붙인 pandas DataFrame 위의 벡터 연산으로 하고,
+내보내기는 세그먼트 하나씩 변환해 쓰므로 기록 전체를 메모리에 올리지 않는다.
+"""
+import atexit
+import logging
+import os
+import threading
+import time
+import uuid
+
+import numpy as np
+import pandas as pd
+
+from quiz.grading import mask_to_options
+from quiz.selection import IntervalSet, parse_question_numbers
+from quiz.session_store import session_dir
+from quiz.views import select_questions
+
+HISTORY_DIR = "history"
+FLUSH_INTERVAL = 2.0
+# 세그먼트가 이만큼 쌓이면 하나로 합침
+COMPACT_SEGMENTS = 32
+# 다른 프로세스가 합치는 중 멈췄으면 이 시간 뒤에 잠금을 무시
+COMPACT_LOCK_TIMEOUT = 300
+
+# 시험 한 번에 한 행
+ATTEMPT_FIELDS = {
+    'attempt_id': np.int64,
+    'session': str,
+    'bank': str,
+    'bank_version': str,
+    'selection': str,
+    'started_at': np.float64,
+    'finished_at': np.float64,
+    'question_count': np.int32,
+    'score': np.int32,
+    'partial_score': np.float32,
+    'timed_out': np.bool_,
+    'shuffle_seed': np.int64,
+}
+# 이전 형식 세그먼트에 없는 시험 열의 기본값
+ATTEMPT_DEFAULTS = {'shuffle_seed': -1}
+# 문제 하나에 한 행 (시험 순서대로, 시험별 문제 수로 attempt_id를 복원)
+ANSWER_FIELDS = {
+    'number': np.int32,
+    'answer_mask': np.uint32,
+    'selected': np.uint32,
+    'correct': np.bool_,
+    'multi': np.bool_,
+}
+
+EXPORT_COLUMNS = [
+    'attempt_id', 'session', 'bank', 'bank_version', 'started_at', 'finished_at', 'timed_out', 'shuffle_seed',
+    'number', 'answer', 'selected', 'correct', 'multi',
+]
+
+logger = logging.getLogger(__name__)
+
+
+# 시험 기록 디렉터리 (세션 저장 디렉터리 안)
+def history_dir():
+    return os.path.join(session_dir(), HISTORY_DIR)
+
+
+# 문제 은행 버전 문자열 (내용 해시, 없으면 파일 버전)
+def bank_version(bank):
+    return str(bank.content_hash or bank.version or "")
+
+
+# 초 단위 시각 배열을 밀리초 단위 datetime으로
+def _to_datetime(seconds):
+    return pd.to_datetime((np.asarray(seconds) * 1000).astype(np.int64), unit='ms')
+
+
+def _column(values, dtype):
+    if dtype is str:
+        return np.array(values, dtype=str) if len(values) else np.array([], dtype='<U1')
+    return np.asarray(values, dtype=dtype)
+
+
+class HistoryStore:
+    """
+    열 단위 시험 기록 저장소
+    - 세그먼트: seg-<시각>-<임의값>.npz, 열 이름별 배열 + 대신하는 세그먼트 이름(sources)
+    - 읽은 세그먼트는 바뀌지 않으므로 파일 이름으로 캐시
+    """
+
+    def __init__(self, directory=None, interval=FLUSH_INTERVAL, compact_after=COMPACT_SEGMENTS):
+        self.directory = directory or history_dir()
+        self.interval = interval
+        self.compact_after = compact_after
+        self._pending = []
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._cache = {}
+        self._cache_lock = threading.Lock()
+        # 마지막으로 이어 붙인 (세그먼트 이름 목록, 시험 DataFrame, 답안 DataFrame)
+        self._frames = None
+        self._thread = None
+        self._next_id = time.time_ns()
+        os.makedirs(self.directory, exist_ok=True)
+
+    def record_attempt(self, session_id, bank_id, version, result, started_at, finished_at, timed_out=False,
+                       shuffle_seed=None):
+        """채점 결과(quiz.scoring.AttemptResult) 하나를 대기열에 추가하고 시험 기록 id 반환"""
+        numbers = result.numbers
+        selection = IntervalSet.from_sorted_numbers(np.unique(numbers[numbers >= 0]).tolist()).format()
+        with self._lock:
+            self._next_id += 1
+            attempt_id = self._next_id
+            self._pending.append((
+                {
+                    'attempt_id': attempt_id,
+                    'session': session_id or "",
+                    'bank': bank_id or "",
+                    'bank_version': version or "",
+                    'selection': selection,
+                    'started_at': started_at or finished_at,
+                    'finished_at': finished_at,
+                    'question_count': len(result),
+                    'score': result.score,
+                    'partial_score': result.partial_score,
+                    'timed_out': bool(timed_out),
+                    'shuffle_seed': -1 if shuffle_seed is None else shuffle_seed,
+                },
+                {
+                    'number': numbers,
+                    'answer_mask': result.answer_masks,
+                    'selected': result.selected,
+                    'correct': result.correct,
+                    'multi': result.multi,
+                },
+            ))
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="quiz-history", daemon=True)
+                self._thread.start()
+        return attempt_id
+
+    def flush(self):
+        """대기 중인 시험을 세그먼트 하나로 기록 (세그먼트가 많으면 합침)"""
+        with self._flush_lock:
+            with self._lock:
+                batch, self._pending = self._pending, []
+            if batch:
+                columns = {name: _column([attempt[name] for attempt, _ in batch], dtype)
+                           for name, dtype in ATTEMPT_FIELDS.items()}
+                columns.update({name: np.concatenate([np.asarray(answers[name], dtype=dtype) for _, answers in batch])
+                                for name, dtype in ANSWER_FIELDS.items()})
+                try:
+                    self._write_segment(columns)
+                except OSError:
+                    logger.exception("시험 기록 저장에 실패했습니다 (%d개 시험)", len(batch))
+                    return
+            if len(self.segment_paths()) >= self.compact_after:
+                self.compact()
+
+    def _run(self):
+        while True:
+            time.sleep(self.interval)
+            self.flush()
+
+    def _write_segment(self, columns, sources=()):
+        name = f"seg-{time.time_ns():020d}-{uuid.uuid4().hex[:8]}.npz"
+        path = os.path.join(self.directory, name)
+        tmp_path = path + ".tmp"
+        with open(tmp_path, 'wb') as f:
+            np.savez(f, sources=_column(list(sources), str), **columns)
+        os.replace(tmp_path, path)
+        return path
+
+    def segment_paths(self):
+        """세그먼트 파일 경로 (쓴 순서)"""
+        try:
+            names = sorted(n for n in os.listdir(self.directory) if n.startswith("seg-") and n.endswith(".npz"))
+        except FileNotFoundError:
+            return []
+        return [os.path.join(self.directory, n) for n in names]
+
+    def _load(self, path):
+        name = os.path.basename(path)
+        with self._cache_lock:
+            columns = self._cache.get(name)
+        if columns is None:
+            with np.load(path) as data:
+                columns = {key: data[key] for key in data.files}
+            count = len(columns['attempt_id'])
+            for field, default in ATTEMPT_DEFAULTS.items():
+                if field not in columns:
+                    columns[field] = np.full(count, default, dtype=ATTEMPT_FIELDS[field])
+            with self._cache_lock:
+                self._cache[name] = columns
+        return columns
+
+    def segments(self, with_names=False):
+        """살아 있는 세그먼트의 열 배열 (합친 세그먼트가 대신하는 옛 세그먼트는 건너뜀)"""
+        while True:
+            try:
+                return self._live_segments(self.segment_paths(), with_names)
+            except FileNotFoundError:
+                # 목록을 읽은 뒤 다른 쪽에서 합치고 지운 세그먼트 - 목록부터 다시 읽음
+                continue
+
+    def _live_segments(self, paths, with_names=False):
+        loaded = [(os.path.basename(path), self._load(path)) for path in paths]
+        superseded = set()
+        for _, columns in loaded:
+            superseded.update(columns['sources'].tolist())
+        with self._cache_lock:
+            for name in [n for n in self._cache if n in superseded]:
+                del self._cache[name]
+        live = [(name, columns) for name, columns in loaded if name not in superseded]
+        return live if with_names else [columns for _, columns in live]
+
+    def compact(self):
+        """세그먼트를 하나로 합침 (다른 프로세스가 합치는 중이면 건너뜀)"""
+        lock_path = os.path.join(self.directory, "compact.lock")
+        try:
+            if time.time() - os.path.getmtime(lock_path) > COMPACT_LOCK_TIMEOUT:
+                os.remove(lock_path)
+        except OSError:
+            pass
+        try:
+            os.close(os.open(lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+        except FileExistsError:
+            return False
+        try:
+            # 합치는 동안 새로 쓰인 세그먼트는 다음에 합치도록 목록을 한 번만 읽음
+            paths = self.segment_paths()
+            if len(paths) < 2:
+                return False
+            segments = self._live_segments(paths)
+            columns = {name: np.concatenate([segment[name] for segment in segments])
+                       for name in (*ATTEMPT_FIELDS, *ANSWER_FIELDS)}
+            self._write_segment(columns, sources=[os.path.basename(path) for path in paths])
+            for path in paths:
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+            with self._cache_lock:
+                self._cache.clear()
+            return True
+        finally:
+            os.remove(lock_path)
+
+    def frames(self, bank_id=None, session_id=None):
+        """(시험 DataFrame, 답안 DataFrame) - 답안에는 attempt_id, session, bank 열을 붙임"""
+        live = self.segments(with_names=True)
+        # 세그먼트가 그대로면 이어 붙인 결과를 다시 사용 (조건 거르기만 새로 함)
+        names = tuple(name for name, _ in live)
+        cached = self._frames
+        if cached is not None and cached[0] == names:
+            attempts, answers = cached[1], cached[2]
+        else:
+            attempts, answers = self._concat([columns for _, columns in live])
+            self._frames = (names, attempts, answers)
+        if bank_id is not None:
+            attempts, answers = attempts[attempts['bank'] == bank_id], answers[answers['bank'] == bank_id]
+        if session_id is not None:
+            attempts, answers = attempts[attempts['session'] == session_id], answers[answers['session'] == session_id]
+        return attempts.reset_index(drop=True), answers.reset_index(drop=True)
+
+    @staticmethod
+    def _concat(segments):
+        attempts = pd.DataFrame({
+            name: np.concatenate([segment[name] for segment in segments]) if segments else _column([], dtype)
+            for name, dtype in ATTEMPT_FIELDS.items()
+        })
+        answers = pd.DataFrame({
+            name: np.concatenate([segment[name] for segment in segments]) if segments else _column([], dtype)
+            for name, dtype in ANSWER_FIELDS.items()
+        })
+        # 시험별 문제 수만큼 시험 열을 반복해 답안 행에 붙임 (문자열 열은 범주형으로)
+        counts = attempts['question_count'].to_numpy()
+        answers.insert(0, 'attempt_id', np.repeat(attempts['attempt_id'].to_numpy(), counts))
+        for name in ('session', 'bank'):
+            attempts[name] = attempts[name].astype('category')
+            answers[name] = pd.Categorical.from_codes(
+                np.repeat(attempts[name].cat.codes.to_numpy(), counts), attempts[name].cat.categories)
+        return attempts, answers
+
+
+# 시험별 점수 추이 - 종료 시각 순 점수(%)와 세션별 최근 window번 이동 평균
+def score_trend(attempts, window=5):
+    trend = attempts.sort_values('finished_at')[['attempt_id', 'session', 'finished_at', 'score', 'question_count']]
+    trend = trend.assign(
+        finished_at=_to_datetime(trend['finished_at']),
+        score_pct=100 * trend['score'] / trend['question_count'].clip(lower=1),
+    )
+    trend['rolling_pct'] = (trend.groupby('session', observed=True)['score_pct']
+                            .transform(lambda s: s.rolling(window, min_periods=1).mean()))
+    return trend.reset_index(drop=True)
+
+
+# 정답률이 낮은 문제 - 답한 문제만 번호별로 묶어 (답안 수, 정답 수, 정답률) 계산
+def weak_questions(answers, limit=20, min_answers=2):
+    answered = answers[(answers['selected'] != 0) & (answers['number'] >= 0)]
+    grouped = answered.groupby('number').agg(answers=('correct', 'size'), correct=('correct', 'sum'))
+    grouped = grouped[grouped['answers'] >= min_answers]
+    grouped['accuracy'] = grouped['correct'] / grouped['answers']
+    return grouped.sort_values(['accuracy', 'answers'], ascending=[True, False]).head(limit).reset_index()
+
+
+# 비트마스크 열을 선택지 문자열로 (서로 다른 마스크마다 한 번만 변환)
+def _mask_labels(masks):
+    unique = np.unique(masks)
+    labels = np.array([",".join(mask_to_options(int(mask))) for mask in unique], dtype=object)
+    return labels[np.searchsorted(unique, masks)]
+
+
+# 기록된 시험의 문제 순서를 다시 만듦 - 시험 범위와 섞기 seed로 (같은 버전의 문제 은행 필요)
+def replay_view(bank, selection, shuffle_seed):
+    view = select_questions(bank, parse_question_numbers(selection))
+    return view if shuffle_seed < 0 else view.shuffled(int(shuffle_seed))
+
+
+# 세그먼트 하나씩 내보내기용 DataFrame으로 변환 (문제 은행으로 거를 수 있음)
+def iter_export_frames(store, bank_id=None):
+    for segment in store.segments():
+        counts = segment['question_count']
+        attempt_index = np.repeat(np.arange(len(counts)), counts)
+        frame = pd.DataFrame({
+            'attempt_id': segment['attempt_id'][attempt_index],
+            'session': segment['session'][attempt_index],
+            'bank': segment['bank'][attempt_index],
+            'bank_version': segment['bank_version'][attempt_index],
+            'started_at': _to_datetime(segment['started_at'][attempt_index]),
+            'finished_at': _to_datetime(segment['finished_at'][attempt_index]),
+            'timed_out': segment['timed_out'][attempt_index],
+            'shuffle_seed': segment['shuffle_seed'][attempt_index],
+            'number': segment['number'],
+            'answer': _mask_labels(segment['answer_mask']),
+            'selected': _mask_labels(segment['selected']),
+            'correct': segment['correct'],
+            'multi': segment['multi'],
+        }, columns=EXPORT_COLUMNS)
+        if bank_id is not None:
+            frame = frame[frame['bank'] == bank_id]
+        if len(frame):
+            yield frame
+
+
+# CSV로 내보내기 (세그먼트 단위로 이어 씀) - 내보낸 답안 행 수 반환
+def export_csv(store, out, bank_id=None):
+    rows = 0
+    for frame in iter_export_frames(store, bank_id):
+        frame.to_csv(out, header=rows == 0, index=False)
+        rows += len(frame)
+    if rows == 0:
+        pd.DataFrame(columns=EXPORT_COLUMNS).to_csv(out, index=False)
+    return rows
+
+
+# Parquet으로 내보내기 (세그먼트마다 행 그룹 하나, pyarrow 필요) - 내보낸 답안 행 수 반환
+def export_parquet(store, path, bank_id=None):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    rows = 0
+    writer = None
+    try:
+        for frame in iter_export_frames(store, bank_id):
+            table = pa.Table.from_pandas(frame, preserve_index=False)
+            if writer is None:
+                writer = pq.ParquetWriter(path, table.schema)
+            writer.write_table(table)
+            rows += len(frame)
+    finally:
+        if writer is not None:
+            writer.close()
+    if writer is None:
+        pq.write_table(pa.Table.from_pandas(pd.DataFrame(columns=EXPORT_COLUMNS), preserve_index=False), path)
+    return rows
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+# 프로세스 전체에서 공유하는 시험 기록 저장소 (프로세스 종료 시 남은 시험 저장)
+def get_history_store():
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = HistoryStore()
+                atexit.register(_store.flush)
+    return _store
@@ -0,0 +1,105 @@
+"""
+seed로 정해지는 지연 순열 - 섞은 배열을 만들지 않고 i번째 값을 그때그때 계산
+
+0..n-1 위의 전단사 함수를 Feistel 네트워크로 만든다. n 이상인 가장 작은 짝수 비트 폭(2^bits)
+위에서 4라운드를 돌리고, 결과가 n 이상이면 n 미만이 될 때까지 다시 돌린다(cycle walking).
+2^bits < 4n이므로 평균 네 번 안에 끝나고, 같은 seed면 어느 프로세스에서나 같은 순서가 나온다.
+
+한 값 조회는 파이썬 정수 연산, 전체 순서는 같은 연산을 NumPy uint64 배열로 한 번에 계산한다.
+"""
+import operator
+from collections.abc import Sequence
+
+import numpy as np
+
+ROUNDS = 4
+
+_MASK64 = (1 << 64) - 1
+_GOLDEN = 0x9E3779B97F4A7C15
+_MIX1 = 0xBF58476D1CE4E5B9
+_MIX2 = 0x94D049BB133111EB
+
+
+# splitmix64 섞기 함수 (파이썬 정수)
+def _mix(x):
+    x = ((x ^ (x >> 30)) * _MIX1) & _MASK64
+    x = ((x ^ (x >> 27)) * _MIX2) & _MASK64
+    return x ^ (x >> 31)
+
+
+# splitmix64 섞기 함수 (uint64 배열, 곱셈 넘침은 2^64로 나눈 나머지)
+def _mix_array(x):
+    x = (x ^ (x >> np.uint64(30))) * np.uint64(_MIX1)
+    x = (x ^ (x >> np.uint64(27))) * np.uint64(_MIX2)
+    return x ^ (x >> np.uint64(31))
+
+
+class FeistelPermutation(Sequence):
+    """0..n-1의 seed별 순열 (상태는 n과 seed뿐, 조회는 평균 O(1))"""
+
+    def __init__(self, n, seed):
+        self.n = n
+        self.seed = seed
+        bits = max(2, (n - 1).bit_length())
+        self._half = (bits + 1) // 2
+        self._half_mask = (1 << self._half) - 1
+        self._keys = [_mix((seed + (i + 1) * _GOLDEN) & _MASK64) for i in range(ROUNDS)]
+
+    def __len__(self):
+        return self.n
+
+    def _encrypt(self, x):
+        left, right = x >> self._half, x & self._half_mask
+        for key in self._keys:
+            left, right = right, left ^ (_mix(right ^ key) & self._half_mask)
+        return (left << self._half) | right
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self.n))]
+        # NumPy 정수는 64비트 라운드 키와 섞을 때 넘치므로 파이썬 정수로 바꿈
+        index = operator.index(index)
+        if index < 0:
+            index += self.n
+        if not 0 <= index < self.n:
+            raise IndexError("permutation index out of range")
+        value = self._encrypt(index)
+        while value >= self.n:
+            value = self._encrypt(value)
+        return value
+
+    def _decrypt(self, x):
+        left, right = x >> self._half, x & self._half_mask
+        for key in reversed(self._keys):
+            left, right = right ^ (_mix(left ^ key) & self._half_mask), left
+        return (left << self._half) | right
+
+    def index(self, value):
+        """value가 나오는 인덱스 (역순열, 조회와 같은 평균 O(1))"""
+        value = operator.index(value)
+        if not 0 <= value < self.n:
+            raise ValueError(f"{value} is not in permutation")
+        index = self._decrypt(value)
+        while index >= self.n:
+            index = self._decrypt(index)
+        return index
+
+    def _encrypt_array(self, x):
+        half = np.uint64(self._half)
+        half_mask = np.uint64(self._half_mask)
+        left, right = x >> half, x & half_mask
+        for key in self._keys:
+            left, right = right, left ^ (_mix_array(right ^ np.uint64(key)) & half_mask)
+        return (left << half) | right
+
+    def to_array(self):
+        """전체 순서를 int64 배열로 (__getitem__과 같은 값)"""
+        values = self._encrypt_array(np.arange(self.n, dtype=np.uint64))
+        outside = np.flatnonzero(values >= self.n)
+        while len(outside):
+            values[outside] = self._encrypt_array(values[outside])
+            outside = outside[values[outside] >= self.n]
+        return values.astype(np.int64)
+
+    def __iter__(self):
+        return iter(self.to_array().tolist())
@@ -0,0 +1,117 @@
+"""
+문제 화면 HTML 조각 렌더링 - 문제 본문과 정답 해설을 한 번만 만들어 세션 사이에서 공유
+
+문제 은행 버전(원본 경로와 내용 해시/파일 버전)과 위치로 구분하는 크기 제한 LRU에 보관하므로
+문제 파일이 바뀌면 새 조각을 만들고, 이전 버전의 조각은 쓰이지 않다가 밀려난다.
+문제 텍스트는 모두 이스케이프해 HTML로 해석되지 않게 한다.
+"""
+import html
+import re
+import threading
+from collections import OrderedDict
+
+from quiz.grading import mask_to_options, option_bit
+
+FRAGMENT_CACHE_SIZE = 4096
+
+# 세 페이지가 함께 쓰는 스타일 (import 시 한 번 공백을 줄여 둠)
+_STYLESHEET = """
+.main { padding: 2rem; }
+.smaller-question { font-size: 0.95rem; }
+.nav-grid { display: flex; flex-wrap: wrap; gap: 2px; margin-bottom: 0.25rem; }
+.nav-cell { width: 10px; height: 10px; border-radius: 2px; background-color: #dee2e6; }
+.nav-correct { background-color: #28a745; }
+.nav-wrong { background-color: #dc3545; }
+.nav-current { outline: 2px solid #0d6efd; }
+.review-option { padding: 0.25rem 0.5rem; border-radius: 5px; margin-bottom: 0.25rem; }
+.review-answer { background-color: #d4edda; font-weight: bold; }
+.review-wrong { background-color: #f8d7da; font-weight: bold; }
+.review-summary { margin-top: 0.5rem; }
+"""
+STYLESHEET = re.sub(r'\s*([{};:,])\s*', r'\1', re.sub(r'\s+', ' ', _STYLESHEET)).strip()
+
+
+# 문제 텍스트를 안전한 HTML로 변환 (줄바꿈 유지, 마크다운 수식 기호 무력화)
+def escape_text(text):
+    return html.escape(str(text)).replace('$', '&#36;').replace('\n', '<br>')
+
+
+class FragmentCache:
+    """스레드 안전한 크기 제한 LRU (키 -> HTML 문자열)"""
+
+    def __init__(self, maxsize=FRAGMENT_CACHE_SIZE):
+        self.maxsize = maxsize
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_render(self, key, render):
+        with self._lock:
+            value = self._items.get(key)
+            if value is not None:
+                self._items.move_to_end(key)
+                self.hits += 1
+                return value
+            self.misses += 1
+        value = render()
+        with self._lock:
+            self._items[key] = value
+            while len(self._items) > self.maxsize:
+                self._items.popitem(last=False)
+        return value
+
+    def __len__(self):
+        return len(self._items)
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+
+
+_fragments = FragmentCache()
+
+
+# 문제 은행 버전 식별값 (파일에서 읽지 않은 문제 은행은 객체 자체로 구분)
+def _bank_version(bank):
+    if bank.source is None:
+        return id(bank)
+    return bank.source, bank.content_hash or bank.version
+
+
+def _render_question(q):
+    return f"<div class='smaller-question'>{escape_text(q.get('question', ''))}</div>"
+
+
+def _render_review(q, answer_mask, selected_mask, with_question):
+    parts = [_render_question(q)] if with_question else []
+    for opt_key, opt_text in (q.get('options') or {}).items():
+        bit = option_bit(opt_key)
+        if answer_mask & bit:
+            css_class, mark = "review-option review-answer", " ✓ (정답)"
+        elif selected_mask & bit:
+            css_class, mark = "review-option review-wrong", " ✗ (선택한 답)"
+        else:
+            css_class, mark = "review-option", ""
+        parts.append(f"<div class='{css_class}'>{escape_text(opt_key)}) {escape_text(opt_text)}{mark}</div>")
+    selected = ", ".join(mask_to_options(selected_mask)) or "-"
+    parts.append(f"<div class='review-summary'>선택한 답변: {selected} · 정답: {escape_text(q.get('answer', ''))}</div>")
+    return "".join(parts)
+
+
+# 문제 본문 HTML (문제 은행 버전과 위치별로 한 번만 생성)
+def question_html(bank, position):
+    return _fragments.get_or_render(
+        (_bank_version(bank), 'question', position),
+        lambda: _render_question(bank[position]))
+
+
+# 정답 해설 HTML - 선택지별 정답/선택 표시와 선택한 답 요약을 한 요소로 (선택 조합별로 캐시)
+def review_html(bank, position, selected_mask, with_question=False):
+    return _fragments.get_or_render(
+        (_bank_version(bank), 'review', position, selected_mask, with_question),
+        lambda: _render_review(bank[position], bank.answer_masks[position], selected_mask, with_question))
+
+
+def fragment_cache():
+    return _fragments
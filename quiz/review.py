@@ -0,0 +1,222 @@
+"""
+간격 반복(SM-2) 복습 스케줄러 - 학습 모드의 복습 모드에서 다음에 풀 문제를 고른다
+
+한 번 이상 푼 문제만 상태를 가지며, 상태는 문제 하나당 고정 폭 열(column) 배열에 보관한다:
+- numbers: int64     문제 번호 (문제 파일이 바뀌어도 위치와 달리 그대로이므로 세션 복원 후에도 유지)
+- due: uint32        다음 복습 시각 (유닉스 초)
+- interval: float32  복습 간격 (일)
+- easiness: uint16   SM-2 쉬움 계수 x 100 (130 ~)
+- repetitions: uint8 연속 정답 횟수
+
+다음 문제는 복습 시각 기준 최소 힙에서 O(log n)으로 고른다. 다시 예약된 문제의 이전 힙 항목은
+꺼낼 때 상태 배열의 due와 비교해 버린다(지연 삭제). 지금 문제 은행에 없는 번호는 건너뛴다.
+복습할 문제가 없으면 아직 풀지 않은 문제를 번호 순서대로 낸다.
+"""
+import base64
+import heapq
+import sys
+import time
+import zlib
+from array import array
+
+import numpy as np
+
+DAY = 24 * 3600
+# 틀린 문제는 같은 학습 시간 안에 다시 나오도록 짧게 예약
+RELEARN_DELAY = 10 * 60
+DEFAULT_EASINESS = 250
+MIN_EASINESS = 130
+MAX_REPETITIONS = 255
+# 정답/오답을 SM-2 응답 품질(0~5)로 변환
+QUALITY_CORRECT = 4
+QUALITY_WRONG = 1
+
+_COLUMNS = (('numbers', 'q'), ('due', 'I'), ('interval', 'f'), ('easiness', 'H'), ('repetitions', 'B'))
+
+
+class ReviewScheduler:
+    """한 사용자의 문제별 SM-2 상태와 복습 시각 힙"""
+
+    def __init__(self):
+        for name, typecode in _COLUMNS:
+            setattr(self, name, array(typecode))
+        # 문제 번호 -> 열 배열의 행 번호
+        self._rows = {}
+        # (due, 번호) 최소 힙 - 상태 배열의 due와 다른 항목은 이미 다시 예약된 항목
+        self._heap = []
+        # 아직 풀지 않은 문제를 찾기 시작할 available_numbers 인덱스와 그 기준 문제 은행
+        self._new_cursor = 0
+        self._cursor_bank = None
+
+    def __len__(self):
+        return len(self._rows)
+
+    def __contains__(self, number):
+        return number in self._rows
+
+    def _valid_top(self):
+        heap = self._heap
+        while heap:
+            due, number = heap[0]
+            if self.due[self._rows[number]] == due:
+                return heap[0]
+            heapq.heappop(heap)
+        return None
+
+    def _next_new(self, bank, exclude=None):
+        numbers = bank.available_numbers
+        # 문제 은행이 바뀌면 번호 배치가 달라졌을 수 있으므로 처음부터 다시 찾음
+        if bank is not self._cursor_bank:
+            self._new_cursor = 0
+            self._cursor_bank = bank
+        cursor = self._new_cursor
+        while cursor < len(numbers) and numbers[cursor] in self._rows:
+            cursor += 1
+        self._new_cursor = cursor
+        while cursor < len(numbers) and (numbers[cursor] in self._rows or numbers[cursor] == exclude):
+            cursor += 1
+        return numbers[cursor] if cursor < len(numbers) else None
+
+    def next_number(self, bank, now=None, exclude=None):
+        """
+        다음에 풀 문제의 번호 (복습 시각이 된 문제 -> 아직 풀지 않은 문제 순)
+        exclude: 건너뛸 번호 (지금 보고 있는 문제), 지금 풀 문제가 없으면 None
+        문제 파일에서 삭제된 번호는 상태를 남겨 둔 채 건너뜀 (다시 추가되면 이어서 복습)
+        """
+        now = time.time() if now is None else now
+        skipped = []
+        found = None
+        while True:
+            top = self._valid_top()
+            if top is None or top[0] > now:
+                break
+            if top[1] != exclude and bank.has_number(top[1]):
+                found = top[1]
+                break
+            # 현재 문제와 없는 문제는 잠시 꺼내 두고 그다음 항목을 확인한 뒤 되돌림
+            skipped.append(heapq.heappop(self._heap))
+        for item in skipped:
+            heapq.heappush(self._heap, item)
+        return found if found is not None else self._next_new(bank, exclude)
+
+    def review(self, number, quality, now=None):
+        """응답 품질(0~5)로 SM-2 상태를 갱신하고 다음 복습 시각을 예약, 다음 복습 시각 반환"""
+        now = time.time() if now is None else now
+        row = self._rows.get(number)
+        if row is None:
+            row = len(self.numbers)
+            self._rows[number] = row
+            self.numbers.append(number)
+            self.due.append(0)
+            self.interval.append(0.0)
+            self.easiness.append(DEFAULT_EASINESS)
+            self.repetitions.append(0)
+
+        easiness = self.easiness[row] + round(100 * (0.1 - (5 - quality) * (0.08 + (5 - quality) * 0.02)))
+        self.easiness[row] = max(MIN_EASINESS, easiness)
+        if quality < 3:
+            self.repetitions[row] = 0
+            self.interval[row] = 0.0
+            due = now + RELEARN_DELAY
+        else:
+            repetitions = self.repetitions[row]
+            if repetitions == 0:
+                interval = 1.0
+            elif repetitions == 1:
+                interval = 6.0
+            else:
+                interval = self.interval[row] * self.easiness[row] / 100
+            self.repetitions[row] = min(MAX_REPETITIONS, repetitions + 1)
+            self.interval[row] = interval
+            due = now + interval * DAY
+        self.due[row] = int(due)
+        heapq.heappush(self._heap, (self.due[row], number))
+        # 지연 삭제로 쌓인 항목이 많아지면 힙을 다시 만듦
+        if len(self._heap) > 2 * len(self._rows) + 64:
+            self._rebuild_heap()
+        return self.due[row]
+
+    def due_count(self, now=None):
+        """지금 복습할 문제 수"""
+        now = time.time() if now is None else now
+        return int(np.count_nonzero(np.frombuffer(self.due, dtype=np.uint32) <= now)) if self.due else 0
+
+    def next_due(self):
+        """가장 먼저 돌아올 복습 시각 (복습한 문제가 없으면 None)"""
+        top = self._valid_top()
+        return top[0] if top is not None else None
+
+    def state(self, number):
+        """문제의 (due, interval, easiness, repetitions), 풀지 않은 문제는 None"""
+        row = self._rows.get(number)
+        if row is None:
+            return None
+        return self.due[row], self.interval[row], self.easiness[row] / 100, self.repetitions[row]
+
+    def _rebuild_heap(self):
+        self._heap = list(zip(self.due, self.numbers))
+        heapq.heapify(self._heap)
+
+    def to_payload(self):
+        """열 배열을 이어 붙여 압축한 저장용 값 (리틀 엔디언)"""
+        chunks = []
+        for name, _ in _COLUMNS:
+            column = getattr(self, name)
+            if sys.byteorder != 'little':
+                column = array(column.typecode, column)
+                column.byteswap()
+            chunks.append(column.tobytes())
+        data = base64.b64encode(zlib.compress(b''.join(chunks))).decode('ascii')
+        return {'key': 'number', 'count': len(self), 'data': data}
+
+    @classmethod
+    def from_payload(cls, payload, bank=None):
+        """
+        저장용 값에서 복원
+        문제 은행 위치로 저장된 이전 형식은 그 위치를 기록한 문제 은행(bank)으로 번호를 찾아 옮김
+        """
+        if payload.get('key') != 'number':
+            return cls._from_position_payload(payload, bank)
+        scheduler = cls()
+        count = payload['count']
+        data = zlib.decompress(base64.b64decode(payload['data']))
+        offset = 0
+        for name, typecode in _COLUMNS:
+            column = array(typecode)
+            size = column.itemsize * count
+            column.frombytes(data[offset:offset + size])
+            if sys.byteorder != 'little':
+                column.byteswap()
+            setattr(scheduler, name, column)
+            offset += size
+        scheduler._rows = {number: row for row, number in enumerate(scheduler.numbers)}
+        scheduler._rebuild_heap()
+        return scheduler
+
+    @classmethod
+    def _from_position_payload(cls, payload, bank):
+        scheduler = cls()
+        if bank is None:
+            return scheduler
+        count = payload['count']
+        data = zlib.decompress(base64.b64decode(payload['data']))
+        columns = {}
+        offset = 0
+        for name, typecode in (('positions', 'I'),) + _COLUMNS[1:]:
+            column = array(typecode)
+            size = column.itemsize * count
+            column.frombytes(data[offset:offset + size])
+            if sys.byteorder != 'little':
+                column.byteswap()
+            columns[name] = column
+            offset += size
+        for row, position in enumerate(columns['positions']):
+            number = bank.numbers[position] if position < len(bank) else None
+            if number is None or number in scheduler._rows:
+                continue
+            scheduler._rows[number] = len(scheduler.numbers)
+            scheduler.numbers.append(number)
+            for name, _ in _COLUMNS[1:]:
+                getattr(scheduler, name).append(columns[name][row])
+        scheduler._rebuild_heap()
+        return scheduler
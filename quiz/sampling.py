@@ -0,0 +1,244 @@
+"""
+시험 문제 무작위 추출 - 구간 선택에서 번호 목록을 펼치지 않고 k문제를 바로 뽑음
+
+구간 선택(IntervalSet)은 정렬된 번호 배열의 (시작, 끝) 인덱스 구간 몇 개가 되고, 단일/다중 정답 층은
+문제 은행이 미리 나눠 둔 인덱스 배열(QuestionBank.answer_strata)의 연속 구간 몇 개가 된다.
+층 안의 r번째 문제는 구간 길이 누적합을 이분 탐색해 찾으므로 문제 하나를 순위(rank) 하나로 가리킨다.
+
+- 균등 추출: Floyd 알고리즘으로 0..N-1에서 서로 다른 순위 k개를 O(k)에 뽑음
+- 가중 추출: 기본 가중치로 전체를 균등하게 뽑거나 기본보다 무거운 문제를 별칭(alias) 테이블로 뽑는
+  혼합 분포에서 하나씩 뽑고, 실제 가중치에 맞게 받아들이거나 버림. 이미 뽑은 문제를 버리므로 남은 문제 중
+  가중치에 비례해 하나씩 뽑는 비복원 추출과 같음 (가중치가 있는 문제 수 m에 대해 O(k + m))
+- 같은 문제 은행, 선택, 가중치, seed면 언제나 같은 문제가 나옴 (파이썬 random의 메르센 트위스터)
+"""
+import random
+import secrets
+from bisect import bisect_right
+
+import numpy as np
+
+from quiz.selection import IntervalSet
+
+# 통계가 없는 문제의 가중치 (정답 0번, 오답 0번일 때의 평활 오답률)
+UNSEEN_WEIGHT = 0.5
+
+
+class QuestionWeights:
+    """번호별 추출 가중치 - numbers는 정렬된 번호 배열, 목록에 없는 번호는 default"""
+
+    def __init__(self, numbers, weights, default=UNSEEN_WEIGHT):
+        order = np.argsort(numbers, kind='stable')
+        self.numbers = np.asarray(numbers, dtype=np.int64)[order]
+        self.weights = np.asarray(weights, dtype=np.float64)[order]
+        self.default = default
+
+    def __len__(self):
+        return len(self.numbers)
+
+    @classmethod
+    def from_stats(cls, rows):
+        """
+        (번호, 시도 수, 정답 수) 행에서 자주 틀리는 문제일수록 무거운 가중치
+        가중치는 라플라스 평활 오답률 (오답 + 1) / (시도 + 2) - 처음 보는 문제는 0.5
+        """
+        rows = np.array(rows, dtype=np.float64).reshape(-1, 3)
+        attempts, correct = rows[:, 1], rows[:, 2]
+        return cls(rows[:, 0].astype(np.int64), (attempts - correct + 1) / (attempts + 2))
+
+
+class StratumPool:
+    """
+    구간 선택 안의 한 층 - index 배열의 연속 구간들 (index가 None이면 정렬된 번호 배열의 구간)
+    길이 N인 순위 공간 0..N-1을 번호로 바꾸는 일만 하고 번호 목록은 만들지 않음
+    """
+
+    def __init__(self, bank, ranges, index=None):
+        self._numbers = bank.available_numbers
+        self._index = index
+        self._starts = []
+        self._offsets = [0]
+        for lo, hi in ranges:
+            if lo < hi:
+                self._starts.append(lo)
+                self._offsets.append(self._offsets[-1] + hi - lo)
+
+    def __len__(self):
+        return self._offsets[-1]
+
+    def sorted_index(self, rank):
+        """순위 rank 문제의 available_numbers 인덱스"""
+        i = bisect_right(self._offsets, rank) - 1
+        j = self._starts[i] + rank - self._offsets[i]
+        return j if self._index is None else int(self._index[j])
+
+    def ranks_of(self, numbers):
+        """번호 배열 중 이 층에 있는 번호의 (위치, 순위) 배열 - 가중치를 순위 공간으로 옮길 때 사용"""
+        available = np.asarray(self._numbers)
+        numbers = np.asarray(numbers, dtype=np.int64)
+        sorted_index = np.searchsorted(available, numbers)
+        found = sorted_index < len(available)
+        found[found] = available[sorted_index[found]] == numbers[found]
+        where = np.flatnonzero(found)
+        local = sorted_index[where]
+        if self._index is not None:
+            local = np.searchsorted(self._index, sorted_index[where])
+            inside = local < len(self._index)
+            inside[inside] = self._index[local[inside]] == sorted_index[where][inside]
+            where, local = where[inside], local[inside]
+        starts = np.array(self._starts, dtype=np.int64)
+        offsets = np.array(self._offsets, dtype=np.int64)
+        k = np.searchsorted(starts, local, side='right') - 1
+        inside = k >= 0
+        inside[inside] = local[inside] - starts[k[inside]] < offsets[k[inside] + 1] - offsets[k[inside]]
+        return where[inside], offsets[k[inside]] + local[inside] - starts[k[inside]]
+
+
+class AliasTable:
+    """Vose 별칭 테이블 - 만들 때 O(m), 한 번 뽑을 때 O(1)"""
+
+    def __init__(self, weights):
+        count = len(weights)
+        scaled = [w * count / sum(weights) for w in weights]
+        self.prob = [1.0] * count
+        self.alias = list(range(count))
+        small = [i for i, p in enumerate(scaled) if p < 1.0]
+        large = [i for i, p in enumerate(scaled) if p >= 1.0]
+        while small and large:
+            s, l = small.pop(), large.pop()
+            self.prob[s] = scaled[s]
+            self.alias[s] = l
+            scaled[l] -= 1.0 - scaled[s]
+            (small if scaled[l] < 1.0 else large).append(l)
+
+    def draw(self, rng):
+        i = rng.randrange(len(self.prob))
+        return i if rng.random() < self.prob[i] else self.alias[i]
+
+
+# Floyd 알고리즘 - 0..n-1에서 서로 다른 k개를 O(k)에 균등하게 뽑음
+def floyd_sample(n, k, rng):
+    chosen = set()
+    for j in range(n - k, n):
+        t = rng.randrange(j + 1)
+        chosen.add(j if t in chosen else t)
+    return chosen
+
+
+# 순위 공간 0..n-1에서 가중치가 0보다 큰 순위 수 (가중 추출로 뽑을 수 있는 최대 문제 수)
+def positive_count(n, rank_weights, default):
+    explicit = sum(1 for w in rank_weights.values() if w > 0)
+    return explicit + (n - len(rank_weights) if default > 0 else 0)
+
+
+# 가중 비복원 추출 - 순위 공간 0..n-1, 가중치가 있는 순위만 {순위: 가중치}, 나머지는 default
+# 가중치가 0인 문제는 뽑지 않으므로 k가 가중치가 0보다 큰 문제 수보다 많으면 ValueError
+def weighted_sample(n, k, rank_weights, default, rng):
+    default = max(default, 0.0)
+    available = positive_count(n, rank_weights, default)
+    if k > available:
+        raise ValueError(f"가중치가 0보다 큰 문제 {available}개에서 {k}개를 뽑을 수 없습니다")
+    if not k:
+        return set()
+    if 2 * k > n:
+        # 층 대부분을 뽑을 때는 버리는 횟수가 늘어나므로 지수 키(Efraimidis-Spirakis)로 한 번에 뽑음
+        weights = np.full(n, float(default))
+        if rank_weights:
+            weights[list(rank_weights)] = list(rank_weights.values())
+        with np.errstate(divide='ignore'):
+            keys = np.random.default_rng(rng.getrandbits(64)).exponential(size=n) / np.maximum(weights, 0)
+        return set(np.argpartition(keys, k - 1)[:k].tolist())
+
+    heavy = [(rank, w - default) for rank, w in rank_weights.items() if w > default]
+    table = AliasTable([excess for _, excess in heavy]) if heavy else None
+    uniform_mass = n * default
+    total_mass = uniform_mass + sum(excess for _, excess in heavy)
+    chosen = set()
+    while len(chosen) < k:
+        if table is None or rng.random() * total_mass < uniform_mass:
+            rank = rng.randrange(n)
+            weight = rank_weights.get(rank, default)
+            # 기본보다 가벼운 문제는 가중치 비율만큼만 받아들임
+            if weight < default and rng.random() * default >= weight:
+                continue
+        else:
+            rank = heavy[table.draw(rng)][0]
+        chosen.add(rank)
+    return chosen
+
+
+class ExamSample:
+    """추출 결과 - 뽑은 번호의 구간 집합, 다시 뽑을 때 쓰는 seed, 층별 문제 수"""
+
+    __slots__ = ('selection', 'seed', 'single_count', 'multi_count')
+
+    def __init__(self, selection, seed, single_count, multi_count):
+        self.selection = selection
+        self.seed = seed
+        self.single_count = single_count
+        self.multi_count = multi_count
+
+    def __repr__(self):
+        return f"ExamSample({self.selection.format()!r}, seed={self.seed})"
+
+
+# 층별 추출 문제 수 - 다중 정답 비율대로 나누고 한 층이 모자라면 다른 층에서 채움
+def _stratum_sizes(size, single_total, multi_total, multi_ratio):
+    multi = min(multi_total, round(size * multi_ratio))
+    single = min(single_total, size - multi)
+    multi = min(multi_total, size - single)
+    return single, multi
+
+
+# 구간 선택에서 size문제를 뽑는 함수
+# - multi_ratio: 다중 정답 문제 비율 (None이면 층을 나누지 않음)
+# - weights: QuestionWeights (None이면 균등, 가중치가 0인 문제는 뽑지 않으므로 size보다 적게 뽑힐 수 있음)
+# - seed: 같은 seed면 같은 결과 (None이면 새로 뽑아 결과에 남김)
+def sample_questions(bank, selection, size, multi_ratio=None, weights=None, seed=None):
+    if seed is None:
+        seed = secrets.randbits(63)
+    rng = random.Random(seed)
+    ranges = list(selection.slice_sorted(bank.available_numbers))
+    if multi_ratio is None:
+        pools = [StratumPool(bank, ranges)]
+    else:
+        pools = []
+        for index in bank.answer_strata:
+            # 층 인덱스 배열은 정렬되어 있으므로 선택 구간 [lo, hi)는 층 배열의 연속 구간이 됨
+            pools.append(StratumPool(bank, [(int(np.searchsorted(index, lo)), int(np.searchsorted(index, hi)))
+                                            for lo, hi in ranges], index))
+
+    # 층마다 가중치를 순위 공간으로 옮기고, 가중치가 0인 문제는 뽑을 수 있는 문제 수에서 뺌
+    uniform = weights is None or (not len(weights) and weights.default > 0)
+    pool_weights = []
+    available = []
+    for pool in pools:
+        if uniform:
+            pool_weights.append(None)
+            available.append(len(pool))
+        else:
+            where, pool_ranks = pool.ranks_of(weights.numbers)
+            rank_weights = dict(zip(pool_ranks.tolist(), weights.weights[where].tolist()))
+            pool_weights.append(rank_weights)
+            available.append(positive_count(len(pool), rank_weights, weights.default))
+    if multi_ratio is None:
+        sizes = [min(size, available[0])]
+    else:
+        sizes = _stratum_sizes(size, available[0], available[1], multi_ratio)
+
+    chosen = []
+    for pool, rank_weights, count in zip(pools, pool_weights, sizes):
+        if rank_weights is None:
+            ranks = floyd_sample(len(pool), count, rng)
+        else:
+            ranks = weighted_sample(len(pool), count, rank_weights, weights.default, rng)
+        chosen.extend(map(pool.sorted_index, ranks))
+
+    chosen.sort()
+    selected = IntervalSet.from_sorted_numbers([bank.available_numbers[i] for i in chosen])
+    if multi_ratio is not None:
+        return ExamSample(selected, seed, sizes[0], sizes[1])
+    multi_index = bank.answer_strata[1]
+    found = np.searchsorted(multi_index, chosen)
+    multi_count = int(np.count_nonzero(multi_index[np.minimum(found, len(multi_index) - 1)] == chosen)) \
+        if len(multi_index) and chosen else 0
+    return ExamSample(selected, seed, len(chosen) - multi_count, multi_count)
@@ -0,0 +1,85 @@
+"""시험 채점 단계 - 한 번의 NumPy 연산으로 시험 전체를 채점하고 결과를 캐시"""
+import numpy as np
+
+from quiz.grading import OPTION_LETTERS
+from quiz.views import ShuffledPositions
+
+_BIT_SHIFTS = np.arange(len(OPTION_LETTERS), dtype=np.uint32)
+
+
+# 비트마스크 배열을 (문제 수, width) 크기의 bool 행렬로 펼침
+def _unpack_bits(masks, width):
+    return ((masks[:, None] >> _BIT_SHIFTS[:width]) & 1).astype(bool)
+
+
+# 위치 배열(array/range/지연 순열)을 NumPy 인덱스 배열로 변환 (array는 복사 없이)
+def _as_index_array(positions):
+    if isinstance(positions, ShuffledPositions):
+        return positions.to_array()
+    if isinstance(positions, range):
+        return np.arange(positions.start, positions.stop, positions.step, dtype=np.intp)
+    return np.frombuffer(positions, dtype=np.uint32) if len(positions) else np.empty(0, dtype=np.uint32)
+
+
+class AttemptResult:
+    """
+    시험 한 번의 채점 결과
+    - correct: 문제별 정답 여부 (bool 배열, 시험 문제 순서)
+    - partial: 문제별 부분 점수 (0~1)
+    - selected: 문제별 선택한 답 비트마스크
+    - answer_masks: 문제별 정답 비트마스크
+    - option_counts: 선택지별 (정답 선택, 오답 선택, 정답 놓침) 횟수, 크기 (26, 3)
+    - multi: 문제별 다중 정답 여부
+    - numbers: 문제별 정수 문제 번호 (없으면 -1)
+    """
+
+    def __init__(self, answer_masks, selected, numbers=None):
+        self.answer_masks = answer_masks
+        self.selected = selected
+        self.numbers = np.full(len(answer_masks), -1, dtype=np.int64) if numbers is None else numbers
+        self.correct = answer_masks == selected
+        self.score = int(self.correct.sum())
+
+        # 실제로 쓰인 선택지 수만큼만 펼쳐서 계산 (보통 A~E)
+        used = int(np.bitwise_or.reduce(answer_masks | selected)) if len(answer_masks) else 0
+        width = used.bit_length()
+        answer_bits = _unpack_bits(answer_masks, width)
+        selected_bits = _unpack_bits(selected, width)
+        hits = answer_bits & selected_bits
+        wrong = selected_bits & ~answer_bits
+        missed = answer_bits & ~selected_bits
+
+        totals = answer_bits.sum(axis=1)
+        self.multi = totals > 1
+        net = hits.sum(axis=1) - wrong.sum(axis=1)
+        self.partial = np.maximum(net, 0) / np.maximum(totals, 1)
+
+        self.option_counts = np.zeros((len(OPTION_LETTERS), 3), dtype=np.int64)
+        self.option_counts[:width, 0] = hits.sum(axis=0)
+        self.option_counts[:width, 1] = wrong.sum(axis=0)
+        self.option_counts[:width, 2] = missed.sum(axis=0)
+
+    def __len__(self):
+        return len(self.correct)
+
+    @property
+    def partial_score(self):
+        return float(self.partial.sum())
+
+
+# 시험 문제 뷰와 답안(문제 은행 위치 -> 선택 비트마스크)으로 시험 전체를 한 번에 채점
+def score_attempt(view, user_answers):
+    positions = _as_index_array(view.positions)
+    answer_masks = np.asarray(view.bank.answer_masks, dtype=np.uint32)[positions]
+    position_list = positions.tolist()
+    selected = np.fromiter(
+        (user_answers.get(pos, 0) for pos in position_list),
+        dtype=np.uint32,
+        count=len(positions),
+    )
+    numbers = np.fromiter(
+        (-1 if num is None else num for num in map(view.bank.numbers.__getitem__, position_list)),
+        dtype=np.int64,
+        count=len(positions),
+    )
+    return AttemptResult(answer_masks, selected, numbers)
@@ -0,0 +1,216 @@
+"""
+문제 본문/선택지 전문 검색 - 역색인
+
+토큰화:
+- 영문/숫자: 소문자 단어 + 인접한 두 단어 쌍("goods receipt") - 구문 검색에 사용
+- 한글: 글자 바이그램("입고처리" -> 입고, 고처, 처리), 한 글자 단어는 그대로
+
+질의 문법:
+- 공백으로 구분한 검색어는 모두 포함 (AND): MIGO 입고
+- OR 또는 | 로 구분한 묶음 중 하나라도 포함: MIGO OR "goods receipt"
+- 따옴표로 감싼 구문은 단어 쌍/바이그램이 모두 있는 문제 (인접 단어 기준 근사)
+
+색인은 문제 은행 파일 옆(<이름>.idx)에 저장하고 문제 은행이 바뀌지 않았으면 다시 만들지 않는다.
+"""
+import json
+import mmap
+import os
+import re
+import struct
+import tempfile
+import threading
+import weakref
+from array import array
+
+import numpy as np
+
+from quiz.selection import IntervalSet
+
+MAGIC = b'SAPQIDX1'
+HEADER = struct.Struct('<8sIQ')
+TOKEN_PATTERN = re.compile(r'[0-9a-z]+|[가-힣]+')
+QUERY_PATTERN = re.compile(r'"([^"]*)"|(\S+)')
+OR_WORDS = ('OR', '|')
+
+_EMPTY = np.empty(0, dtype=np.uint32)
+
+
+# 문자열을 색인 토큰 목록으로 변환
+def tokenize(text):
+    tokens = []
+    append = tokens.append
+    previous_word = None
+    for word in TOKEN_PATTERN.findall(str(text).lower()):
+        if word[0] <= 'z':
+            append(word)
+            if previous_word is not None:
+                append(previous_word + ' ' + word)
+            previous_word = word
+        else:
+            previous_word = None
+            if len(word) == 1:
+                append(word)
+            else:
+                tokens += [word[i:i + 2] for i in range(len(word) - 1)]
+    return tokens
+
+
+# 문제 하나의 검색 대상 텍스트 (본문과 선택지)
+def question_text(q):
+    options = q.get('options') or {}
+    return " \n ".join([str(q.get('question', ''))] + [str(v) for v in options.values()])
+
+
+class SearchIndex:
+    """토큰 -> 문제 은행 위치(uint32, 오름차순) 역색인"""
+
+    def __init__(self, vocab, postings, key=None):
+        self.vocab = vocab
+        self.postings_data = postings
+        self.key = key
+        # 위치별 정수 문제 번호 (없으면 -1), get_index에서 채움
+        self.numbers = None
+
+    @classmethod
+    def build(cls, bank, key=None):
+        # (토큰 ID, 위치) 쌍을 모은 뒤 토큰 ID로 안정 정렬하면 토큰별 위치 목록이 오름차순으로 이어짐
+        token_ids = {}
+        ids = array('I')
+        positions = array('I')
+        for pos, q in enumerate(bank.questions):
+            question_ids = {token_ids.setdefault(token, len(token_ids)) for token in tokenize(question_text(q))}
+            ids.extend(question_ids)
+            positions.extend([pos] * len(question_ids))
+        ids = np.frombuffer(ids, dtype=np.uint32) if len(ids) else _EMPTY
+        order = np.argsort(ids, kind='stable')
+        postings = np.frombuffer(positions, dtype=np.uint32)[order] if len(positions) else _EMPTY
+        counts = np.bincount(ids, minlength=len(token_ids)).tolist()
+        offsets = np.concatenate(([0], np.cumsum(counts)[:-1])).tolist() if counts else []
+        vocab = {token: (offsets[i], counts[i]) for token, i in token_ids.items()}
+        return cls(vocab, postings, key)
+
+    def postings(self, token):
+        entry = self.vocab.get(token)
+        if entry is None:
+            return _EMPTY
+        offset, count = entry
+        return self.postings_data[offset:offset + count]
+
+    # 토큰 목록을 모두 포함하는 위치 (짧은 목록부터 교집합)
+    def _match_all(self, tokens):
+        lists = sorted((self.postings(token) for token in set(tokens)), key=len)
+        if not lists:
+            return _EMPTY
+        result = lists[0]
+        for postings in lists[1:]:
+            if not len(result):
+                break
+            result = np.intersect1d(result, postings, assume_unique=True)
+        return result
+
+    def search(self, query):
+        """질의에 맞는 문제 은행 위치 배열 (오름차순)"""
+        groups = [[]]
+        for match in QUERY_PATTERN.finditer(query):
+            phrase, word = match.groups()
+            if word in OR_WORDS:
+                groups.append([])
+                continue
+            groups[-1].extend(tokenize(phrase if phrase is not None else word))
+
+        matches = [self._match_all(tokens) for tokens in groups if tokens]
+        if not matches:
+            return _EMPTY
+        if len(matches) == 1:
+            return matches[0]
+        return np.unique(np.concatenate(matches))
+
+    def save(self, path):
+        """임시 파일에 쓴 뒤 원자적으로 교체"""
+        meta = json.dumps({'key': self.key, 'vocab': self.vocab}, ensure_ascii=False).encode('utf-8')
+        padding = b'\0' * (-(HEADER.size + len(meta)) % 8)
+        postings = np.ascontiguousarray(self.postings_data, dtype='<u4')
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)), suffix='.idx.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(HEADER.pack(MAGIC, len(meta), len(postings)))
+                f.write(meta)
+                f.write(padding)
+                f.write(postings.tobytes())
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+    @classmethod
+    def load(cls, path):
+        """저장된 색인을 mmap으로 열기 (형식이 다르면 ValueError)"""
+        with open(path, 'rb') as f:
+            buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, meta_length, count = HEADER.unpack_from(buffer)
+        if magic != MAGIC:
+            raise ValueError(f"지원하지 않는 색인 형식입니다: {path}")
+        meta = json.loads(buffer[HEADER.size:HEADER.size + meta_length].decode('utf-8'))
+        offset = HEADER.size + meta_length
+        offset += -offset % 8
+        postings = np.frombuffer(buffer, dtype='<u4', count=count, offset=offset)
+        vocab = {token: tuple(entry) for token, entry in meta['vocab'].items()}
+        return cls(vocab, postings, meta.get('key'))
+
+
+# 문제 은행 파일 옆의 색인 파일 경로 (questions.json -> questions.idx)
+def index_path(source):
+    return os.path.splitext(source)[0] + '.idx'
+
+
+# 색인이 만들어진 문제 은행을 식별하는 값 (내용 해시, 없으면 파일 버전)
+def _bank_key(bank):
+    return bank.content_hash or repr(bank.version)
+
+
+_indexes = weakref.WeakKeyDictionary()
+_indexes_lock = threading.Lock()
+
+
+# 문제 은행의 검색 색인 (저장된 색인이 같은 문제 은행의 것이면 불러오고, 아니면 만들어 저장)
+def get_index(bank):
+    index = _indexes.get(bank)
+    if index is not None:
+        return index
+    with _indexes_lock:
+        index = _indexes.get(bank)
+        if index is not None:
+            return index
+        key = _bank_key(bank)
+        path = index_path(bank.source) if bank.source else None
+        if path is not None:
+            try:
+                index = SearchIndex.load(path)
+                if index.key != key:
+                    index = None
+            except (OSError, ValueError, KeyError):
+                index = None
+        if index is None:
+            index = SearchIndex.build(bank, key)
+            if path is not None:
+                try:
+                    index.save(path)
+                except OSError:
+                    pass
+        index.numbers = np.fromiter((-1 if num is None else num for num in bank.numbers),
+                                    dtype=np.int64, count=len(bank))
+        _indexes[bank] = index
+        return index
+
+
+# 질의에 맞는 문제 번호의 구간 집합 (시험 문제 선택에 그대로 사용)
+def search_selection(bank, query):
+    index = get_index(bank)
+    numbers = index.numbers[index.search(query)]
+    numbers = np.unique(numbers[numbers >= 0])
+    if not len(numbers):
+        return IntervalSet()
+    breaks = np.flatnonzero(np.diff(numbers) != 1)
+    starts = numbers[np.concatenate(([0], breaks + 1))]
+    ends = numbers[np.concatenate((breaks, [len(numbers) - 1]))]
+    return IntervalSet(zip(starts.tolist(), ends.tolist()))
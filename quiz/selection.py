@@ -0,0 +1,155 @@
+"""
+문제 번호 선택 - 정렬된 구간 집합
+
+"1,5~8,12" 같은 선택을 번호 목록으로 펼치지 않고 [(1, 1), (5, 8), (12, 12)]처럼
+겹치지 않고 이어지지 않는 닫힌 구간의 정렬된 목록으로 보관한다.
+파싱, 합집합/교집합/차집합, 표시 문자열 생성은 모두 구간 수에 비례하는 시간에 끝난다.
+"""
+from bisect import bisect_left, bisect_right
+
+
+class IntervalSet:
+    """정렬된 닫힌 구간 (start, end)의 불변 집합"""
+
+    __slots__ = ('_starts', '_ends')
+
+    def __init__(self, intervals=()):
+        starts = []
+        ends = []
+        for start, end in sorted((int(s), int(e)) for s, e in intervals if s <= e):
+            if starts and start <= ends[-1] + 1:
+                if end > ends[-1]:
+                    ends[-1] = end
+            else:
+                starts.append(start)
+                ends.append(end)
+        self._starts = starts
+        self._ends = ends
+
+    @classmethod
+    def _from_normalized(cls, starts, ends):
+        obj = cls.__new__(cls)
+        obj._starts = starts
+        obj._ends = ends
+        return obj
+
+    @classmethod
+    def from_sorted_numbers(cls, numbers):
+        """정렬된 번호 목록에서 연속 구간을 묶어 만듦"""
+        starts = []
+        ends = []
+        for num in numbers:
+            if ends and num <= ends[-1] + 1:
+                if num > ends[-1]:
+                    ends[-1] = num
+            else:
+                starts.append(num)
+                ends.append(num)
+        return cls._from_normalized(starts, ends)
+
+    @property
+    def intervals(self):
+        return list(zip(self._starts, self._ends))
+
+    def __len__(self):
+        """집합에 포함된 번호 수"""
+        return sum(end - start + 1 for start, end in zip(self._starts, self._ends))
+
+    def __bool__(self):
+        return bool(self._starts)
+
+    def __eq__(self, other):
+        return isinstance(other, IntervalSet) and self._starts == other._starts and self._ends == other._ends
+
+    def __repr__(self):
+        return f"IntervalSet({self.intervals!r})"
+
+    def __contains__(self, number):
+        i = bisect_right(self._starts, number) - 1
+        return i >= 0 and number <= self._ends[i]
+
+    def __iter__(self):
+        for start, end in zip(self._starts, self._ends):
+            yield from range(start, end + 1)
+
+    def union(self, other):
+        return IntervalSet(self.intervals + other.intervals)
+
+    def intersection(self, other):
+        starts = []
+        ends = []
+        i = j = 0
+        while i < len(self._starts) and j < len(other._starts):
+            start = max(self._starts[i], other._starts[j])
+            end = min(self._ends[i], other._ends[j])
+            if start <= end:
+                starts.append(start)
+                ends.append(end)
+            if self._ends[i] < other._ends[j]:
+                i += 1
+            else:
+                j += 1
+        return IntervalSet._from_normalized(starts, ends)
+
+    def difference(self, other):
+        starts = []
+        ends = []
+        j = 0
+        for start, end in zip(self._starts, self._ends):
+            while j < len(other._ends) and other._ends[j] < start:
+                j += 1
+            k = j
+            while start <= end:
+                if k >= len(other._starts) or other._starts[k] > end:
+                    starts.append(start)
+                    ends.append(end)
+                    break
+                if other._starts[k] > start:
+                    starts.append(start)
+                    ends.append(other._starts[k] - 1)
+                start = max(start, other._ends[k] + 1)
+                k += 1
+        return IntervalSet._from_normalized(starts, ends)
+
+    __or__ = union
+    __and__ = intersection
+    __sub__ = difference
+
+    def format(self, separator=", "):
+        """'1~10, 20' 형식의 표시 문자열"""
+        return separator.join(
+            str(start) if start == end else f"{start}~{end}"
+            for start, end in zip(self._starts, self._ends)
+        )
+
+    def slice_sorted(self, sorted_numbers):
+        """정렬된 번호 배열에서 집합에 포함되는 (시작, 끝) 인덱스 범위들을 반환"""
+        for start, end in zip(self._starts, self._ends):
+            lo = bisect_left(sorted_numbers, start)
+            hi = bisect_right(sorted_numbers, end, lo)
+            if lo < hi:
+                yield lo, hi
+
+
+# 입력 문자열을 파싱하여 문제 번호 구간 집합 반환 (형식 오류 시 빈 집합)
+# 예시:
+# - "1,2,3,5" -> 1~3, 5
+# - "1~10" -> 1~10
+# - "1,5~8,12" -> 1, 5~8, 12
+def parse_question_numbers(input_text):
+    try:
+        intervals = []
+        for part in input_text.strip().split(','):
+            part = part.strip()
+            if '~' in part or '-' in part:
+                # 범위 처리
+                separator = '~' if '~' in part else '-'
+                start, end = part.split(separator)
+                intervals.append((int(start.strip()), int(end.strip())))
+            else:
+                # 단일 번호
+                num = int(part)
+                intervals.append((num, num))
+        return IntervalSet(intervals)
+    except (ValueError, AttributeError):
+        return IntervalSet()
@@ -0,0 +1,349 @@
+"""
+세션 저장소 - 세션 상태를 저장/복원하는 교체 가능한 백엔드
+
+기본 백엔드는 WAL 모드의 로컬 SQLite 데이터베이스로, 세션별 한 행에 압축된 JSON을 원자적으로 쓰고
+오래된 세션은 TTL과 전체 용량 한도에 따라 정리한다.
+환경 변수 SAP_QUIZ_SESSION_STORE로 백엔드를 선택할 수 있다 (sqlite, json).
+저장 위치는 SAP_QUIZ_SESSION_DIR로 바꿀 수 있다 (기본: session_data).
+"""
+import json
+import os
+import re
+import secrets
+import sqlite3
+import tempfile
+import threading
+import time
+import zlib
+
+from quiz.review import ReviewScheduler
+from quiz.selection import IntervalSet
+from quiz.views import QuestionView, ShuffledPositions
+
+SESSION_DIR = "session_data"
+DEFAULT_TTL = 7 * 24 * 3600
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+GC_INTERVAL = 300
+
+# 저장 대상 세션 키 (위젯 키는 복원할 수 없으므로 제외)
+STATE_KEYS = (
+    'questions', 'current_question_index', 'user_answers', 'show_result', 'score', 'shuffled',
+    'learning_questions', 'current_learning_index', 'learning_showed_answer',
+    'learning_selected_options', 'learning_shuffled', 'learning_results',
+    'learning_review', 'learning_review_mode', 'learning_review_number',
+    'exam_questions', 'selected_question_numbers', 'filtered_exam_questions', 'current_exam_index',
+    'exam_user_answers', 'show_exam_result', 'exam_score', 'exam_shuffled',
+    'exam_time_limit', 'exam_deadline', 'exam_timed_out', 'exam_started_at', 'exam_sample',
+)
+
+
+# 세션 식별자 형식 - 추측할 수 없는 128비트 무작위 토큰 (이전 형식인 uuid4도 허용)
+# 주소의 sid는 세션을 여는 열쇠이므로 이 형식이 아닌 값은 받아들이지 않음 (파일 이름에도 쓰임)
+_SESSION_ID_PATTERN = re.compile(
+    r"user_(?:[0-9a-f]{32}|[0-9a-f]{8}-[0-9a-f]{4}-4[0-9a-f]{3}-[89ab][0-9a-f]{3}-[0-9a-f]{12})")
+
+
+# 새 세션 식별자
+def new_session_id():
+    return "user_" + secrets.token_hex(16)
+
+
+# 세션 식별자로 쓸 수 있는 값인지 확인
+def is_valid_session_id(session_id):
+    return isinstance(session_id, str) and _SESSION_ID_PATTERN.fullmatch(session_id) is not None
+
+
+# 세션 저장 디렉터리 (환경 변수 SAP_QUIZ_SESSION_DIR로 변경 가능)
+def session_dir():
+    return os.environ.get('SAP_QUIZ_SESSION_DIR', SESSION_DIR)
+
+
+# 문제 은행 식별값 - 위치 기반 값(뷰, 위치 키 답안)은 같은 문제 은행에서만 복원
+def _bank_key(bank):
+    return bank.content_hash or repr(bank.version)
+
+
+def _encode_value(value):
+    if isinstance(value, QuestionView):
+        positions = value.positions
+        if isinstance(positions, ShuffledPositions):
+            # 섞은 뷰는 원래 위치와 seed만 저장 (섞은 순서는 복원할 때 다시 계산)
+            base, _ = _encode_value(QuestionView(value.bank, positions.base))
+            return {'__shuffled__': {'base': base, 'seed': positions.seed}}, True
+        if isinstance(positions, range):
+            return {'__range__': [positions.start, positions.stop]}, True
+        return {'__view__': list(positions)}, True
+    if isinstance(value, IntervalSet):
+        return {'__intervals__': value.intervals}, False
+    if isinstance(value, ReviewScheduler):
+        # 복습 상태는 문제 번호 기준이므로 문제 파일이 바뀌어도 복원
+        return {'__review__': value.to_payload()}, False
+    if isinstance(value, dict) and value and all(isinstance(k, int) for k in value):
+        return {'__intkeys__': [[k, v] for k, v in value.items()]}, True
+    if isinstance(value, (str, int, float, bool, list, dict)) or value is None:
+        return value, False
+    raise TypeError(type(value).__name__)
+
+
+def _decode_value(value, bank):
+    if isinstance(value, dict):
+        if '__view__' in value:
+            return QuestionView(bank, value['__view__'])
+        if '__range__' in value:
+            return QuestionView(bank, range(*value['__range__']))
+        if '__shuffled__' in value:
+            base = _decode_value(value['__shuffled__']['base'], bank)
+            return QuestionView(bank, ShuffledPositions(base.positions, value['__shuffled__']['seed']))
+        if '__intervals__' in value:
+            return IntervalSet(value['__intervals__'])
+        if '__review__' in value:
+            return ReviewScheduler.from_payload(value['__review__'], bank)
+        if '__intkeys__' in value:
+            return {k: v for k, v in value['__intkeys__']}
+    return value
+
+
+# 세션 상태에서 저장할 값만 골라 JSON으로 저장 가능한 형태로 변환 (keys를 주면 그 키만)
+def encode_state(state, bank, keys=STATE_KEYS):
+    values = {}
+    bank_bound = []
+    for key in keys:
+        if key not in state:
+            continue
+        try:
+            values[key], bound = _encode_value(state[key])
+        except TypeError:
+            continue
+        if bound:
+            bank_bound.append(key)
+    return {'bank': _bank_key(bank), 'bank_bound': bank_bound, 'values': values}
+
+
+# 저장된 문서에 일부 키만 인코딩한 문서를 병합
+def merge_documents(data, changes):
+    if not data or data.get('bank') != changes['bank']:
+        # 문제 은행이 바뀌었으면 이전 문제 은행 기준의 위치 기반 값은 버림
+        old_values = (data or {}).get('values', {})
+        old_bound = set((data or {}).get('bank_bound', ()))
+        data = {'values': {k: v for k, v in old_values.items() if k not in old_bound}, 'bank_bound': []}
+    values = dict(data['values'])
+    values.update(changes['values'])
+    bank_bound = (set(data['bank_bound']) - set(changes['values'])) | set(changes['bank_bound'])
+    return {'bank': changes['bank'], 'bank_bound': sorted(bank_bound), 'values': values}
+
+
+# 저장된 값을 세션 상태 값으로 복원 (문제 은행이 바뀐 경우 위치 기반 값은 건너뜀)
+def decode_state(data, bank):
+    values = data.get('values', {})
+    same_bank = data.get('bank') == _bank_key(bank)
+    bank_bound = set(data.get('bank_bound', ()))
+    return {k: _decode_value(v, bank) for k, v in values.items() if same_bank or k not in bank_bound}
+
+
+class SessionStore:
+    """세션 저장소 인터페이스 - 세션 ID별로 dict를 저장/조회"""
+
+    def load(self, session_id):
+        raise NotImplementedError
+
+    def save(self, session_id, data):
+        raise NotImplementedError
+
+    def merge(self, session_id, changes):
+        """저장된 문서에 바뀐 키만 인코딩한 문서(encode_state 결과)를 병합"""
+        self.merge_many({session_id: changes})
+
+    def merge_many(self, batch):
+        """여러 세션의 변경분을 한 번에 병합 (session_id -> 변경 문서)"""
+        for session_id, changes in batch.items():
+            self.save(session_id, merge_documents(self.load(session_id), changes))
+
+    def delete(self, session_id):
+        raise NotImplementedError
+
+    def gc(self):
+        """오래된 세션 정리"""
+
+
+class SQLiteSessionStore(SessionStore):
+    """
+    WAL 모드 SQLite 세션 저장소
+    - 세션별 한 행 (session_id 기본 키로 조회)
+    - zlib으로 압축한 JSON 저장, 트랜잭션 단위의 원자적 쓰기
+    - TTL이 지난 세션 삭제 후 전체 크기가 max_bytes를 넘으면 오래된 세션부터 삭제
+    """
+
+    def __init__(self, path=None, ttl=DEFAULT_TTL, max_bytes=DEFAULT_MAX_BYTES):
+        self.path = path or os.path.join(session_dir(), "sessions.db")
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._local = threading.local()
+        self._gc_lock = threading.Lock()
+        self._last_gc = 0.0
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA auto_vacuum=INCREMENTAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS sessions (
+                    session_id TEXT PRIMARY KEY,
+                    payload BLOB NOT NULL,
+                    size INTEGER NOT NULL,
+                    updated_at REAL NOT NULL
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS sessions_updated_at ON sessions (updated_at)")
+
+    # 스레드별 연결 (Streamlit 세션은 서로 다른 스레드에서 실행됨)
+    def _connect(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=10)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def load(self, session_id):
+        row = self._connect().execute(
+            "SELECT payload FROM sessions WHERE session_id = ?", (session_id,)).fetchone()
+        if row is None:
+            return None
+        try:
+            return json.loads(zlib.decompress(row[0]).decode('utf-8'))
+        except (zlib.error, ValueError):
+            return None
+
+    def save(self, session_id, data):
+        self.save_many({session_id: data})
+
+    def save_many(self, sessions):
+        """여러 세션을 한 트랜잭션으로 저장"""
+        now = time.time()
+        rows = []
+        for session_id, data in sessions.items():
+            payload = zlib.compress(json.dumps(data, ensure_ascii=False).encode('utf-8'))
+            rows.append((session_id, payload, len(payload), now))
+        with self._connect() as conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO sessions (session_id, payload, size, updated_at) VALUES (?, ?, ?, ?)",
+                rows)
+        self._maybe_gc(now)
+
+    def merge_many(self, batch):
+        now = time.time()
+        conn = self._connect()
+        with conn:
+            # 읽기-수정-쓰기를 한 쓰기 트랜잭션 안에서 처리
+            conn.execute("BEGIN IMMEDIATE")
+            rows = []
+            for session_id, changes in batch.items():
+                data = merge_documents(self.load(session_id), changes)
+                payload = zlib.compress(json.dumps(data, ensure_ascii=False).encode('utf-8'))
+                rows.append((session_id, payload, len(payload), now))
+            conn.executemany(
+                "INSERT OR REPLACE INTO sessions (session_id, payload, size, updated_at) VALUES (?, ?, ?, ?)",
+                rows)
+        self._maybe_gc(now)
+
+    def delete(self, session_id):
+        with self._connect() as conn:
+            conn.execute("DELETE FROM sessions WHERE session_id = ?", (session_id,))
+
+    def _maybe_gc(self, now):
+        if now - self._last_gc < GC_INTERVAL or not self._gc_lock.acquire(blocking=False):
+            return
+        try:
+            self._last_gc = now
+            self.gc(now)
+        finally:
+            self._gc_lock.release()
+
+    def gc(self, now=None):
+        now = time.time() if now is None else now
+        conn = self._connect()
+        with conn:
+            conn.execute("DELETE FROM sessions WHERE updated_at < ?", (now - self.ttl,))
+            total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM sessions").fetchone()[0]
+            if total > self.max_bytes:
+                # 용량 한도를 넘으면 가장 오래된 세션부터 삭제
+                excess = total - self.max_bytes
+                cutoff = None
+                for updated_at, size in conn.execute(
+                        "SELECT updated_at, size FROM sessions ORDER BY updated_at"):
+                    excess -= size
+                    cutoff = updated_at
+                    if excess <= 0:
+                        break
+                conn.execute("DELETE FROM sessions WHERE updated_at <= ?", (cutoff,))
+        conn.execute("PRAGMA incremental_vacuum").fetchall()
+        conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+
+
+class JSONFileSessionStore(SessionStore):
+    """세션별 JSON 파일 저장소 (이전 방식, 임시 파일에 쓴 뒤 교체하여 원자적으로 저장)"""
+
+    def __init__(self, directory=None):
+        self.directory = directory or session_dir()
+        os.makedirs(self.directory, exist_ok=True)
+
+    def _path(self, session_id):
+        return os.path.join(self.directory, f"session_{session_id}.json")
+
+    def load(self, session_id):
+        try:
+            with open(self._path(session_id), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+    def save(self, session_id, data):
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False)
+            os.replace(tmp_path, self._path(session_id))
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+    def delete(self, session_id):
+        try:
+            os.remove(self._path(session_id))
+        except FileNotFoundError:
+            pass
+
+
+# 세션 상태를 저장소에 저장하는 함수
+def save_session_state(state, session_id, bank, store=None):
+    (store or get_session_store()).save(session_id, encode_state(state, bank))
+
+
+# 저장소에서 세션 상태를 불러와 아직 없는 키만 채우는 함수 (기본 키 인덱스로 한 번 조회)
+def load_session_state(state, session_id, bank, store=None):
+    data = (store or get_session_store()).load(session_id)
+    if not data:
+        return False
+    for k, v in decode_state(data, bank).items():
+        if k not in state:
+            state[k] = v
+    return True
+
+
+BACKENDS = {
+    'sqlite': SQLiteSessionStore,
+    'json': JSONFileSessionStore,
+}
+
+_store = None
+_store_lock = threading.Lock()
+
+
+# 프로세스 전체에서 공유하는 세션 저장소
+def get_session_store():
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                backend = os.environ.get('SAP_QUIZ_SESSION_STORE', 'sqlite')
+                _store = BACKENDS[backend]()
+    return _store
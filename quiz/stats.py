@@ -0,0 +1,224 @@
+"""
+문제별 난이도 통계 - 채점된 답안마다 문제별 카운터를 갱신
+
+학습 모드와 시험 모드에서 채점한 답안 하나는 문제 카운터 한 행(시도 수, 정답 수)과
+고른 선택지 수만큼의 선택 카운터를 더하는 O(1) 갱신이다. 요청 스레드는 메모리의 대기 카운터에
+더하기만 하고, 백그라운드 스레드가 주기적으로 한 트랜잭션의 UPSERT로 SQLite(WAL)에 반영한다.
+
+통계는 문제 은행 식별자(카탈로그 id)와 정수 문제 번호로 구분하므로 문제 파일을 고쳐도 유지된다.
+"가장 어려운 문제", "가장 많이 고른 오답" 조회는 정답률/선택 수 인덱스를 따라 상위 몇 행만 읽는다.
+"""
+import atexit
+import logging
+import os
+import sqlite3
+import threading
+import time
+
+from quiz.grading import OPTION_LETTERS
+from quiz.sampling import QuestionWeights
+from quiz.selection import IntervalSet
+from quiz.session_store import session_dir
+
+STATS_FILE = "stats.db"
+FLUSH_INTERVAL = 0.5
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS question_stats (
+        bank TEXT NOT NULL,
+        number INTEGER NOT NULL,
+        attempts INTEGER NOT NULL,
+        correct INTEGER NOT NULL,
+        PRIMARY KEY (bank, number)
+    ) WITHOUT ROWID
+    """,
+    "CREATE INDEX IF NOT EXISTS question_stats_accuracy ON question_stats (bank, correct * 1.0 / attempts)",
+    """
+    CREATE TABLE IF NOT EXISTS option_picks (
+        bank TEXT NOT NULL,
+        number INTEGER NOT NULL,
+        option TEXT NOT NULL,
+        picks INTEGER NOT NULL,
+        wrong INTEGER NOT NULL,
+        PRIMARY KEY (bank, number, option)
+    ) WITHOUT ROWID
+    """,
+    "CREATE INDEX IF NOT EXISTS option_picks_wrong ON option_picks (bank, wrong, picks)",
+)
+
+_UPSERT_QUESTION = """
+    INSERT INTO question_stats (bank, number, attempts, correct) VALUES (?, ?, ?, ?)
+    ON CONFLICT (bank, number) DO UPDATE SET
+        attempts = attempts + excluded.attempts, correct = correct + excluded.correct
+"""
+_UPSERT_OPTION = """
+    INSERT INTO option_picks (bank, number, option, picks, wrong) VALUES (?, ?, ?, ?, ?)
+    ON CONFLICT (bank, number, option) DO UPDATE SET
+        picks = picks + excluded.picks, wrong = excluded.wrong
+"""
+
+
+# 통계 데이터베이스 경로 (세션 저장 디렉터리 안)
+def stats_path():
+    return os.path.join(session_dir(), STATS_FILE)
+
+
+class StatsStore:
+    """
+    문제별 카운터 저장소
+    - question_stats: (문제 은행, 번호)별 시도 수, 정답 수
+    - option_picks: (문제 은행, 번호, 선택지)별 선택 수와 오답 선택지 여부
+    """
+
+    def __init__(self, path=None, interval=FLUSH_INTERVAL):
+        self.path = path or stats_path()
+        self.interval = interval
+        self._local = threading.local()
+        # (문제 은행, 번호) -> [시도 수, 정답 수, 정답 마스크, {선택지 비트: 선택 수}]
+        self._pending = {}
+        self._lock = threading.Lock()
+        # 조회 전에 flush를 부르면 다른 스레드가 쓰고 있는 카운터까지 반영된 뒤 반환
+        self._flush_lock = threading.Lock()
+        self._thread = None
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        with self._connect() as conn:
+            for statement in _SCHEMA:
+                conn.execute(statement)
+
+    # 스레드별 연결 (Streamlit 세션은 서로 다른 스레드에서 실행됨)
+    def _connect(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=10)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def record(self, bank_id, number, answer_mask, selected_mask):
+        """채점한 답안 하나를 대기 카운터에 더함 (번호가 없거나 답하지 않은 문제는 건너뜀)"""
+        if number is None or not selected_mask:
+            return
+        with self._lock:
+            counters = self._pending.get((bank_id, number))
+            if counters is None:
+                counters = self._pending[(bank_id, number)] = [0, 0, answer_mask, {}]
+            counters[0] += 1
+            counters[1] += answer_mask == selected_mask
+            counters[2] = answer_mask
+            picks = counters[3]
+            while selected_mask:
+                bit = selected_mask & -selected_mask
+                picks[bit] = picks.get(bit, 0) + 1
+                selected_mask ^= bit
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="quiz-stats", daemon=True)
+                self._thread.start()
+
+    def record_attempt(self, bank_id, result):
+        """시험 한 번의 채점 결과(quiz.scoring.AttemptResult)를 문제별로 기록"""
+        for number, answer_mask, selected in zip(result.numbers.tolist(), result.answer_masks.tolist(),
+                                                 result.selected.tolist()):
+            self.record(bank_id, None if number < 0 else number, answer_mask, selected)
+
+    def flush(self):
+        """대기 중인 카운터를 한 트랜잭션으로 반영"""
+        with self._flush_lock:
+            self._flush()
+
+    def _flush(self):
+        with self._lock:
+            batch, self._pending = self._pending, {}
+        if not batch:
+            return
+        question_rows = []
+        option_rows = []
+        for (bank_id, number), (attempts, correct, answer_mask, picks) in batch.items():
+            question_rows.append((bank_id, number, attempts, correct))
+            for bit, count in picks.items():
+                option = OPTION_LETTERS[bit.bit_length() - 1]
+                option_rows.append((bank_id, number, option, count, int(not answer_mask & bit)))
+        try:
+            with self._connect() as conn:
+                conn.executemany(_UPSERT_QUESTION, question_rows)
+                conn.executemany(_UPSERT_OPTION, option_rows)
+        except sqlite3.Error:
+            logger.exception("문제 통계 저장에 실패했습니다 (%d개 문제)", len(batch))
+
+    def _run(self):
+        while True:
+            time.sleep(self.interval)
+            self.flush()
+
+    def hardest(self, bank_id, limit=50, min_attempts=1):
+        """정답률이 낮은 순 (번호, 시도 수, 정답 수) 목록 - 정답률이 같으면 시도가 많은 문제 먼저"""
+        return self._connect().execute(
+            "SELECT number, attempts, correct FROM question_stats"
+            " WHERE bank = ? AND attempts >= ?"
+            " ORDER BY correct * 1.0 / attempts, attempts DESC LIMIT ?",
+            (bank_id, min_attempts, limit)).fetchall()
+
+    def question_rows(self, bank_id):
+        """통계가 있는 모든 문제의 (번호, 시도 수, 정답 수) 목록"""
+        return self._connect().execute(
+            "SELECT number, attempts, correct FROM question_stats WHERE bank = ?", (bank_id,)).fetchall()
+
+    def wrong_options(self, bank_id, limit=50):
+        """가장 많이 고른 오답 선택지 순 (번호, 선택지, 선택 수) 목록"""
+        return self._connect().execute(
+            "SELECT number, option, picks FROM option_picks"
+            " WHERE bank = ? AND wrong = 1 ORDER BY picks DESC LIMIT ?",
+            (bank_id, limit)).fetchall()
+
+    def option_picks(self, bank_id, numbers):
+        """번호별 {선택지: 선택 수}"""
+        result = {number: {} for number in numbers}
+        conn = self._connect()
+        for number in result:
+            for option, picks in conn.execute(
+                    "SELECT option, picks FROM option_picks WHERE bank = ? AND number = ?", (bank_id, number)):
+                result[number][option] = picks
+        return result
+
+    def totals(self, bank_id):
+        """(통계가 있는 문제 수, 전체 시도 수, 전체 정답 수)"""
+        return self._connect().execute(
+            "SELECT COUNT(*), COALESCE(SUM(attempts), 0), COALESCE(SUM(correct), 0)"
+            " FROM question_stats WHERE bank = ?", (bank_id,)).fetchone()
+
+    def reset(self, bank_id):
+        """문제 은행의 통계 삭제 (대기 중인 카운터 포함)"""
+        with self._lock:
+            self._pending = {k: v for k, v in self._pending.items() if k[0] != bank_id}
+        with self._connect() as conn:
+            conn.execute("DELETE FROM question_stats WHERE bank = ?", (bank_id,))
+            conn.execute("DELETE FROM option_picks WHERE bank = ?", (bank_id,))
+
+
+# 정답률이 낮은 문제 번호의 구간 집합 (시험 문제 선택에 그대로 사용)
+def hardest_selection(store, bank_id, limit=50, min_attempts=1):
+    numbers = sorted(number for number, _, _ in store.hardest(bank_id, limit, min_attempts))
+    return IntervalSet.from_sorted_numbers(numbers)
+
+
+# 자주 틀리는 문제일수록 무거운 추출 가중치 (무작위 출제에 사용)
+def miss_weights(store, bank_id):
+    return QuestionWeights.from_stats(store.question_rows(bank_id))
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+# 프로세스 전체에서 공유하는 통계 저장소 (프로세스 종료 시 남은 카운터 저장)
+def get_stats_store():
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = StatsStore()
+                atexit.register(_store.flush)
+    return _store
@@ -0,0 +1,100 @@
+"""
+실행(rerun) 단위 구간 추적
+
+?trace=1 쿼리 파라미터나 환경 변수 SAP_QUIZ_TRACE=1로 켠다.
+켜져 있으면 span()으로 감싼 구간의 시작/소요 시간을 기록해 페이지 하단에 폭포형 그래프로 보여주고
+session_data/traces.jsonl에 한 줄씩 추가한다. 꺼져 있으면 span()은 공유된 빈 컨텍스트를 돌려줄 뿐이다.
+"""
+import contextlib
+import json
+import os
+import threading
+import time
+
+from quiz.session_store import session_dir
+
+TRACE_FILE = "traces.jsonl"
+
+_NULL_SPAN = contextlib.nullcontext()
+_current = threading.local()
+_file_lock = threading.Lock()
+
+
+class Tracer:
+    """한 번의 실행 동안 구간 기록 (name, 시작 ms, 소요 ms, 깊이)"""
+
+    def __init__(self, page, session_id=None):
+        self.page = page
+        self.session_id = session_id
+        self.started_at = time.time()
+        self.spans = []
+        self.finished = False
+        self._origin = time.perf_counter()
+        self._depth = 0
+
+    @contextlib.contextmanager
+    def span(self, name):
+        record = [name, (time.perf_counter() - self._origin) * 1000, 0.0, self._depth]
+        self.spans.append(record)
+        self._depth += 1
+        try:
+            yield
+        finally:
+            self._depth -= 1
+            record[2] = (time.perf_counter() - self._origin) * 1000 - record[1]
+
+    @property
+    def total_ms(self):
+        return (time.perf_counter() - self._origin) * 1000
+
+    def to_record(self, interrupted=False):
+        return {
+            'ts': self.started_at,
+            'page': self.page,
+            'sid': self.session_id,
+            'interrupted': interrupted,
+            'spans': [{'name': name, 'start_ms': round(start, 3), 'ms': round(ms, 3), 'depth': depth}
+                      for name, start, ms, depth in self.spans],
+        }
+
+
+# 추적 활성화 여부 (쿼리 파라미터 값은 호출하는 쪽에서 전달)
+def trace_enabled(query_value=None):
+    return query_value == "1" or os.environ.get('SAP_QUIZ_TRACE') == "1"
+
+
+# 현재 스레드(= 현재 Streamlit 실행)의 추적기 설정
+def start(page, session_id=None):
+    tracer = Tracer(page, session_id)
+    _current.tracer = tracer
+    return tracer
+
+
+def stop():
+    _current.tracer = None
+
+
+def current():
+    return getattr(_current, 'tracer', None)
+
+
+# 이름 붙은 구간 - 추적이 꺼져 있으면 아무것도 하지 않음
+def span(name):
+    tracer = getattr(_current, 'tracer', None)
+    if tracer is None:
+        return _NULL_SPAN
+    return tracer.span(name)
+
+
+# 추적 기록 파일 경로 (세션 저장 디렉터리 안)
+def trace_path():
+    return os.path.join(session_dir(), TRACE_FILE)
+
+
+# 추적 결과를 JSONL 파일에 한 줄 추가
+def write_trace(tracer, path=None, interrupted=False):
+    path = path or trace_path()
+    line = json.dumps(tracer.to_record(interrupted), ensure_ascii=False)
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with _file_lock, open(path, 'a', encoding='utf-8') as f:
+        f.write(line + "\n")
@@ -0,0 +1,218 @@
+"""Streamlit 페이지에서 공통으로 사용하는 도우미 함수"""
+import hmac
+import html
+import os
+import time
+
+import streamlit as st
+import streamlit.components.v1 as components
+
+from quiz import catalog, render, session_store, tracing
+from quiz.autosave import get_autosaver
+from quiz.bank import QuestionBank, load_bank
+from quiz.views import QuestionView
+
+# 문제 은행별로 따로 보관하는 세션 키 (문제 은행을 바꾸면 저장 후 비우고 새 문제 은행의 값을 복원)
+BANK_SCOPED_KEYS = session_store.STATE_KEYS + (
+    'exam_result', 'learning_nav_page', 'results_page', 'results_filter', 'results_from', 'results_to',
+)
+
+
+# 관리자 비밀번호 (환경 변수 SAP_QUIZ_ADMIN_PASSWORD, 없으면 관리 기능을 표시하지 않음)
+def admin_password():
+    return os.environ.get('SAP_QUIZ_ADMIN_PASSWORD') or None
+
+
+# 입력한 비밀번호가 관리자 비밀번호와 같은지 확인 (비교 시간으로 비밀번호를 추측할 수 없도록 상수 시간 비교)
+def is_admin(password):
+    expected = admin_password()
+    return expected is not None and hmac.compare_digest(str(password or '').encode(), expected.encode())
+
+
+# 공용 스타일시트 삽입 (페이지마다 스타일 블록을 따로 두지 않고 공백을 줄인 한 벌을 사용)
+def inject_styles():
+    st.markdown(f"<style>{render.STYLESHEET}</style>", unsafe_allow_html=True)
+
+
+# 공유 문제 은행을 가져오는 함수 - 실패 시 오류를 표시하고 빈 문제 은행 반환
+# 카탈로그에 문제 은행이 여러 개면 URL의 bank 파라미터(없으면 첫 번째)로 선택
+def get_bank():
+    banks = catalog.discover_banks()
+    info = catalog.find_bank(st.query_params.get("bank") or st.session_state.get('bank_id'), banks) or banks[0]
+    previous = st.session_state.get('bank_id')
+    if previous is not None and previous != info.id:
+        _switch_bank_scope(previous)
+    st.session_state.bank_id = info.id
+    if len(banks) > 1 and st.query_params.get("bank") != info.id:
+        st.query_params["bank"] = info.id
+    try:
+        with tracing.span("bank.load"):
+            return load_bank(info.path)
+    except Exception as e:
+        st.error(f"문제 데이터를 불러오는 데 실패했습니다: {e}")
+        return QuestionBank([])
+
+
+# 이전 문제 은행의 진행 상황을 저장하고 문제 은행별 세션 키를 비우는 함수
+def _switch_bank_scope(previous_id):
+    old_bank = next((v.bank for v in st.session_state.values() if isinstance(v, QuestionView)), None)
+    if old_bank is not None and 'session_id' in st.session_state:
+        changes = session_store.encode_state(st.session_state, old_bank)
+        autosaver = get_autosaver()
+        autosaver.submit(storage_id(previous_id), changes)
+        autosaver.flush()
+    for key in BANK_SCOPED_KEYS:
+        st.session_state.pop(key, None)
+
+
+# 세션 저장소 식별자 - 세션 식별자와 문제 은행 조합 (기본 문제 은행은 세션 식별자 그대로)
+def storage_id(bank_id=None):
+    bank_id = bank_id or st.session_state.get('bank_id', catalog.DEFAULT_BANK_ID)
+    session_id = st.session_state.session_id
+    return session_id if bank_id == catalog.DEFAULT_BANK_ID else f"{session_id}@{bank_id}"
+
+
+# 세션 식별자를 준비하고 문제 은행별로 저장된 세션을 한 번 복원하는 함수
+# 식별자는 URL 쿼리 파라미터(sid)에 남겨 새로고침이나 서버 재시작 후에도 이어서 진행
+# sid는 추측할 수 없는 토큰이지만 주소를 아는 사람은 누구나 그 세션을 이어서 쓸 수 있으므로 공유하면 안 됨
+# 형식이 맞지 않는 sid(직접 지어낸 값 등)는 받아들이지 않고 새 세션을 시작
+def ensure_session(bank):
+    if 'session_id' not in st.session_state:
+        sid = st.query_params.get("sid")
+        if sid and not session_store.is_valid_session_id(sid):
+            st.toast("주소의 세션 식별자가 올바르지 않아 새 세션을 시작합니다.", icon="⚠️")
+            sid = None
+        st.session_state.session_id = sid or session_store.new_session_id()
+    key = storage_id()
+    if st.session_state.get('_restored_storage_id') != key:
+        with tracing.span("session.restore"):
+            session_store.load_session_state(st.session_state, key, bank)
+        st.session_state._restored_storage_id = key
+    if st.query_params.get("sid") != st.session_state.session_id:
+        st.query_params["sid"] = st.session_state.session_id
+
+
+# 바뀐 세션 키만 자동 저장 대기열에 넣는 함수 (디스크 쓰기는 백그라운드 스레드에서 처리)
+def autosave(bank, *keys):
+    changes = session_store.encode_state(st.session_state, bank, keys=keys)
+    get_autosaver().submit(storage_id(), changes)
+
+
+# 사이드바 문제 은행 선택 상자 (문제 은행이 둘 이상일 때만 표시)
+def bank_selector():
+    banks = catalog.discover_banks()
+    if len(banks) < 2:
+        return
+    ids = [info.id for info in banks]
+    titles = {info.id: info.title for info in banks}
+    if st.session_state.get('bank_selector') != st.session_state.get('bank_id'):
+        st.session_state.bank_selector = st.session_state.get('bank_id')
+    st.selectbox(
+        "문제 은행",
+        ids,
+        format_func=titles.get,
+        key="bank_selector",
+        on_change=_select_bank,
+    )
+
+
+def _select_bank():
+    st.query_params["bank"] = st.session_state.bank_selector
+
+
+# 남은 시간 표시 HTML - 넘겨받은 남은 밀리초부터 브라우저가 1초마다 스스로 줄여 나감
+_COUNTDOWN_HTML = """
+<div id="countdown" style="font-family: sans-serif; font-size: 1.1rem; font-weight: bold; text-align: center;
+     padding: 0.4rem; border-radius: 5px; background-color: #f8f9fa;"></div>
+<script>
+const end = Date.now() + %(remaining_ms)d;
+const box = document.getElementById("countdown");
+const pad = (n) => String(n).padStart(2, "0");
+function tick() {
+  const left = Math.max(0, Math.ceil((end - Date.now()) / 1000));
+  const h = Math.floor(left / 3600), m = Math.floor(left %% 3600 / 60), s = left %% 60;
+  box.textContent = left > 0
+    ? "⏱️ 남은 시간 " + (h ? h + ":" + pad(m) : m) + ":" + pad(s)
+    : "⏰ 시간 종료 - 답을 제출하거나 '시험 종료 및 채점'을 누르면 결과가 표시됩니다";
+  box.style.backgroundColor = left > %(warning_seconds)d ? "#f8f9fa" : "#f8d7da";
+  if (left > 0) setTimeout(tick, (end - Date.now()) %% 1000 || 1000);
+}
+tick();
+</script>
+"""
+
+
+# 제한 시간 카운트다운 표시 (서버 재실행 없이 브라우저에서만 갱신)
+# 서버 시계로 계산한 남은 시간을 넘기므로 브라우저 시계가 달라도 맞고, 마감 판정은 서버가 따로 함
+def countdown(deadline, warning_seconds=60):
+    remaining_ms = max(0, int((deadline - time.time()) * 1000))
+    components.html(_COUNTDOWN_HTML % {'remaining_ms': remaining_ms, 'warning_seconds': warning_seconds},
+                    height=50)
+
+
+# 시험 모드의 선택 문제를 바꾸는 함수 - 이전 무작위 출제 조건과 seed는 새 선택에 해당하지 않으므로 지움
+# 시험 모드 밖(문제 통계 페이지 등)에서 시험 문제를 넘길 때도 이 함수를 사용
+def select_exam_questions(numbers):
+    st.session_state.selected_question_numbers = numbers
+    st.session_state.exam_sample = None
+
+
+# 조각(fragment) 안 위젯의 콜백이 페이지 전체를 다시 그려야 할 때 호출
+# 콜백 안에서는 st.rerun()을 쓸 수 없으므로 표시만 남기고, 조각이 다시 실행될 때 전체 실행으로 바꿈
+def request_app_rerun():
+    st.session_state._app_rerun = True
+
+
+# 조각 안 위젯의 콜백에서 알림을 띄울 때 사용 (조각 재실행 중 콜백에서 바로 그리지 않고 조각 시작 때 표시)
+def notify(message, icon=None):
+    st.session_state.setdefault('_notifications', []).append((message, icon))
+
+
+# 조각 함수 맨 앞에서 호출 - 전체 실행 요청이 있으면 페이지 전체를 다시 실행하고, 없으면 남긴 알림을 표시
+def start_fragment():
+    if st.session_state.pop('_app_rerun', False):
+        st.rerun(scope="app")
+    for message, icon in st.session_state.pop('_notifications', ()):
+        st.toast(message, icon=icon)
+
+
+# 이번 실행의 구간 추적을 시작하는 함수 (?trace=1 또는 SAP_QUIZ_TRACE=1일 때만)
+# st.rerun() 등으로 페이지 끝까지 가지 못한 이전 실행의 기록은 중단된 실행으로 파일에 남김
+def start_trace(page):
+    pending = st.session_state.pop('_pending_trace', None)
+    if pending is not None and not pending.finished:
+        tracing.write_trace(pending, interrupted=True)
+    if not tracing.trace_enabled(st.query_params.get("trace")):
+        tracing.stop()
+        return None
+    tracer = tracing.start(page, st.session_state.get('session_id'))
+    st.session_state._pending_trace = tracer
+    return tracer
+
+
+# 페이지 끝에서 추적을 마치고 폭포형 그래프를 접힌 패널로 표시하는 함수
+def show_trace():
+    tracer = tracing.current()
+    if tracer is None:
+        return
+    tracing.stop()
+    tracer.finished = True
+    tracer.session_id = tracer.session_id or st.session_state.get('session_id')
+    st.session_state.pop('_pending_trace', None)
+    total = max(tracer.total_ms, 0.001)
+    tracing.write_trace(tracer)
+
+    rows = []
+    for name, start, ms, depth in tracer.spans:
+        left = start / total * 100
+        width = max(ms / total * 100, 0.5)
+        rows.append(
+            f"<div style='display: flex; align-items: center; font-size: 0.8rem;'>"
+            f"<div style='width: 40%; padding-left: {depth}rem;'>{html.escape(name)} ({ms:.1f} ms)</div>"
+            f"<div style='width: 60%; position: relative; height: 0.8rem; background-color: #f1f3f5;'>"
+            f"<div style='position: absolute; left: {left:.2f}%; width: {width:.2f}%; height: 100%; "
+            f"background-color: #0d6efd;'></div></div></div>"
+        )
+    with st.expander(f"⏱️ 성능 추적 ({total:.1f} ms)"):
+        st.markdown("".join(rows), unsafe_allow_html=True)
+        st.caption(f"구간 기록: {tracing.trace_path()}")
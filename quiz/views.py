@@ -0,0 +1,105 @@
+"""세션별 문제 목록 뷰 - 공유 문제 은행을 복사하지 않고 위치 배열만 보관"""
+import operator
+import secrets
+from array import array
+from collections.abc import Sequence
+
+import numpy as np
+
+from quiz.permutation import FeistelPermutation
+
+
+class ShuffledPositions(Sequence):
+    """
+    위치 배열(base)을 seed로 정한 순서로 읽는 지연 순열
+    - 섞은 배열을 만들지 않으므로 세션 상태는 base와 seed 정수 하나
+    - 같은 base와 seed면 언제든 같은 순서를 다시 만들 수 있음
+    """
+
+    def __init__(self, base, seed):
+        self.base = base
+        self.seed = seed
+        self.permutation = FeistelPermutation(len(base), seed)
+
+    def __len__(self):
+        return len(self.base)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        return self.base[self.permutation[operator.index(index)]]
+
+    def __iter__(self):
+        return iter(self.to_array().tolist())
+
+    def index(self, position):
+        """위치 position이 나오는 인덱스 (base 안의 인덱스를 역순열로 되돌림)"""
+        return self.permutation.index(self.base.index(position))
+
+    def to_array(self):
+        """섞은 순서의 위치 전체를 int64 배열로 (채점처럼 전체가 필요할 때만)"""
+        order = self.permutation.to_array()
+        if not len(order):
+            return order
+        if isinstance(self.base, range):
+            return self.base.start + order * self.base.step
+        return np.frombuffer(self.base, dtype=np.uint32)[order].astype(np.int64)
+
+
+class QuestionView(Sequence):
+    """
+    공유 문제 은행 위의 읽기 전용 문제 목록
+    - bank: 뷰가 가리키는 문제 은행 (문제 파일이 바뀌어도 뷰는 만든 시점의 은행을 유지)
+    - positions: 문제 은행 위치 배열 (전체 문제는 range로 표현해 메모리를 쓰지 않음)
+    """
+
+    def __init__(self, bank, positions=None):
+        self.bank = bank
+        if positions is None:
+            positions = range(len(bank))
+        if not isinstance(positions, (range, ShuffledPositions)):
+            positions = array('I', positions)
+        self.positions = positions
+
+    def __len__(self):
+        return len(self.positions)
+
+    def __getitem__(self, index):
+        return self.bank[self.positions[index]]
+
+    def position(self, index):
+        """뷰의 index번째 문제의 문제 은행 위치"""
+        return self.positions[index]
+
+    def index_of(self, position):
+        """문제 은행 위치 position이 뷰의 몇 번째인지 (뷰에 없으면 None)"""
+        try:
+            return self.positions.index(position)
+        except ValueError:
+            return None
+
+    @property
+    def shuffle_seed(self):
+        """섞은 뷰의 seed (섞지 않았으면 None)"""
+        return self.positions.seed if isinstance(self.positions, ShuffledPositions) else None
+
+    def shuffled(self, seed=None):
+        """
+        seed로 섞은 새 뷰 반환 (seed가 없으면 새로 뽑음)
+        이미 섞은 뷰는 원래 순서에 새 seed를 적용하므로 몇 번을 섞어도 상태는 seed 하나
+        """
+        if seed is None:
+            seed = secrets.randbits(63)
+        base = self.positions.base if isinstance(self.positions, ShuffledPositions) else self.positions
+        return QuestionView(self.bank, ShuffledPositions(base, seed))
+
+    def unshuffled(self):
+        """섞기 전 순서의 뷰 (섞지 않은 뷰는 그대로 반환)"""
+        if isinstance(self.positions, ShuffledPositions):
+            return QuestionView(self.bank, self.positions.base)
+        return self
+
+
+# 번호 구간 선택(IntervalSet)에 포함된 문제만 담은 뷰 (번호 순서)
+def select_questions(bank, selection):
+    return QuestionView(bank, bank.positions_in(selection))
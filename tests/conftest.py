@@ -0,0 +1,42 @@
+"""테스트 공용 설정 - 페이지 테스트가 임시 문제 파일과 임시 세션 저장 디렉터리를 쓰도록 환경 변수를 맞춤"""
+import json
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+QUESTION_COUNT = 12
+
+
+# 단일 정답 문제만 있는 작은 문제 은행 (선택지 버튼 하나로 답할 수 있음)
+def make_questions(count=QUESTION_COUNT):
+    return [
+        {
+            'number': str(number),
+            'question': f"문제 {number}",
+            'options': {letter: f"선택지 {letter}" for letter in 'ABCD'},
+            'answer': 'ABCD'[number % 4],
+        }
+        for number in range(1, count + 1)
+    ]
+
+
+@pytest.fixture(scope="session", autouse=True)
+def app_environment(tmp_path_factory):
+    base = tmp_path_factory.mktemp("app")
+    bank_path = base / "questions.json"
+    bank_path.write_text(json.dumps(make_questions(), ensure_ascii=False), encoding='utf-8')
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setenv('SAP_QUIZ_BANK', str(bank_path))
+        mp.setenv('SAP_QUIZ_BANK_DIR', str(base / "banks"))
+        mp.setenv('SAP_QUIZ_SESSION_DIR', str(base / "session_data"))
+        yield bank_path
+
+
+# 페이지 스크립트 경로
+def page_path(name):
+    return os.path.join(ROOT, name)
@@ -0,0 +1,102 @@
+from streamlit.testing.v1 import AppTest
+
+from conftest import page_path
+
+
+def run_exam_page():
+    at = AppTest.from_file(page_path("pages/exam_mode.py"), default_timeout=30)
+    at.run()
+    assert not at.exception
+    return at
+
+
+# 시험 문제를 모두 풀어 결과 화면까지 진행
+def answer_all(at):
+    for _ in range(len(at.session_state["filtered_exam_questions"])):
+        if at.session_state["show_exam_result"]:
+            break
+        [b for b in at.button if b.key and b.key.startswith("exam_opt_")][0].click().run()
+        assert not at.exception, [e.message for e in at.exception]
+
+
+def test_shuffled_exam_results_render():
+    at = run_exam_page()
+    at.button(key="quick_all").click().run()
+    at.button(key="start_exam_btn").click().run()
+    at.button(key="shuffle_btn").click().run()
+    assert at.session_state["filtered_exam_questions"].shuffle_seed is not None
+
+    answer_all(at)
+
+    assert at.session_state["show_exam_result"]
+    assert not at.exception, [e.message for e in at.exception]
+
+
+def test_reset_order_unshuffles_the_exam():
+    at = run_exam_page()
+    at.button(key="quick_all").click().run()
+    at.button(key="start_exam_btn").click().run()
+    original = list(at.session_state["filtered_exam_questions"].positions)
+    at.button(key="shuffle_btn").click().run()
+
+    at.button(key="reset_order_btn").click().run()
+
+    view = at.session_state["filtered_exam_questions"]
+    assert view.shuffle_seed is None
+    assert list(view.positions) == original
+    assert not at.session_state["exam_shuffled"]
+    assert not [c for c in at.caption if "seed" in c.value]
+
+
+def test_starting_an_exam_clears_the_shuffle_flag():
+    at = run_exam_page()
+    at.button(key="quick_all").click().run()
+    at.button(key="start_exam_btn").click().run()
+    at.button(key="shuffle_btn").click().run()
+    assert at.session_state["exam_shuffled"]
+
+    at.button(key="start_exam_btn").click().run()
+
+    assert not at.session_state["exam_shuffled"]
+    assert at.session_state["filtered_exam_questions"].shuffle_seed is None
+
+
+def test_search_index_is_built_only_when_searching(monkeypatch):
+    import quiz.search
+
+    calls = []
+    get_index = quiz.search.get_index
+    monkeypatch.setattr(quiz.search, 'get_index', lambda bank: calls.append(bank) or get_index(bank))
+    at = run_exam_page()
+    at.button(key="quick_all").click().run()
+    assert not calls
+
+    at.text_input(key="search_query").input("문제").run()
+
+    assert calls
+    assert not at.exception, [e.message for e in at.exception]
+
+
+def test_finishing_twice_records_the_exam_once(monkeypatch):
+    from quiz.history import HistoryStore
+    from quiz.stats import StatsStore
+
+    calls = []
+    for cls in (HistoryStore, StatsStore):
+        record_attempt = cls.record_attempt
+        monkeypatch.setattr(cls, 'record_attempt',
+                            lambda self, *args, _record=record_attempt, **kwargs:
+                            calls.append(type(self)) or _record(self, *args, **kwargs))
+    at = run_exam_page()
+    at.button(key="quick_all").click().run()
+    at.number_input(key="exam_time_limit_input").set_value(5).run()
+    at.button(key="start_exam_btn").click().run()
+    finish = at.button(key="exam_finish_btn")
+
+    finish.click().run()
+    assert at.session_state["show_exam_result"]
+    # 이전 화면에 남은 종료 버튼을 다시 누름
+    finish.click().run()
+
+    assert not at.exception, [e.message for e in at.exception]
+    assert sorted(cls.__name__ for cls in calls) == ['HistoryStore', 'StatsStore']
@@ -0,0 +1,103 @@
+import os
+import shutil
+
+import numpy as np
+
+from quiz.history import HistoryStore, score_trend, weak_questions
+from quiz.scoring import AttemptResult
+
+
+# 문제 세 개짜리 시험 결과 (정답 비트마스크, 선택한 답, 번호)
+def make_result(selected, numbers=(1, 2, 3)):
+    return AttemptResult(np.array([1, 2, 4], dtype=np.uint32), np.array(selected, dtype=np.uint32),
+                         np.array(numbers, dtype=np.int64))
+
+
+def record(store, session_id, selected, finished_at=1000.0):
+    return store.record_attempt(session_id, "bank", "v1", make_result(selected), finished_at - 60, finished_at)
+
+
+def test_segment_cache_is_keyed_by_file_name(tmp_path):
+    store = HistoryStore(str(tmp_path), compact_after=100)
+    for i in range(3):
+        record(store, "user_a", [1, 2, 4], 1000.0 + i)
+        store.flush()
+
+    attempts, answers = store.frames()
+
+    names = [os.path.basename(path) for path in store.segment_paths()]
+    assert sorted(store._cache) == names
+    assert len(attempts) == 3 and len(answers) == 9
+    # 캐시가 맞으면 두 번째 조회는 파일을 다시 읽지 않음
+    cached = dict(store._cache)
+    store.frames()
+    assert all(store._cache[name] is cached[name] for name in names)
+
+
+def test_segments_compacted_by_another_process_leave_the_cache(tmp_path):
+    store = HistoryStore(str(tmp_path), compact_after=100)
+    for i in range(2):
+        record(store, "user_a", [1, 2, 4], 1000.0 + i)
+        store.flush()
+    store.frames()
+
+    assert HistoryStore(str(tmp_path)).compact()
+
+    attempts, _ = store.frames()
+    assert len(attempts) == 2
+    assert sorted(store._cache) == [os.path.basename(path) for path in store.segment_paths()]
+
+
+def test_compaction_keeps_every_attempt_once(tmp_path):
+    store = HistoryStore(str(tmp_path), compact_after=3)
+    ids = []
+    for i in range(3):
+        ids.append(record(store, "user_a" if i else "user_b", [1, 1, 4], 1000.0 + i))
+        store.flush()
+
+    assert len(store.segment_paths()) == 1
+    attempts, answers = store.frames()
+    assert sorted(attempts['attempt_id']) == sorted(ids)
+    assert list(attempts['score']) == [2, 2, 2]
+    assert list(answers['number']) == [1, 2, 3] * 3
+
+    mine, my_answers = store.frames(bank_id="bank", session_id="user_a")
+    assert len(mine) == 2 and len(my_answers) == 6
+    assert set(my_answers['attempt_id']) == set(ids[1:])
+
+
+def test_segments_left_behind_by_a_compaction_are_not_counted_twice(tmp_path):
+    store = HistoryStore(str(tmp_path), compact_after=100)
+    for i in range(2):
+        record(store, "user_a", [1, 2, 4], 1000.0 + i)
+        store.flush()
+    backup = tmp_path / "backup"
+    backup.mkdir()
+    old_paths = store.segment_paths()
+    for path in old_paths:
+        shutil.copy(path, backup)
+
+    assert store.compact()
+    # 합친 세그먼트를 쓴 뒤 옛 세그먼트를 지우기 전에 멈춘 경우
+    for path in old_paths:
+        shutil.copy(backup / os.path.basename(path), path)
+
+    assert len(store.segment_paths()) == 3
+    assert len(store.frames()[0]) == 2
+
+
+def test_score_trend_and_weak_questions(tmp_path):
+    store = HistoryStore(str(tmp_path))
+    record(store, "user_a", [1, 2, 4], 1000.0)
+    record(store, "user_a", [1, 1, 0], 2000.0)
+    store.flush()
+    attempts, answers = store.frames(session_id="user_a")
+
+    trend = score_trend(attempts, window=2)
+    assert list(trend['score_pct'].round(1)) == [100.0, 33.3]
+    assert list(trend['rolling_pct'].round(1)) == [100.0, 66.7]
+    # 두 번째 시험에서 답하지 않은 3번은 한 번만 셈, 정답률이 같으면 답한 횟수가 많은 문제 먼저
+    weak = weak_questions(answers, min_answers=1)
+    assert list(weak['number']) == [2, 1, 3]
+    assert list(weak['answers']) == [2, 2, 1]
+    assert list(weak['accuracy']) == [0.5, 1.0, 1.0]
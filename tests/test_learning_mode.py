@@ -0,0 +1,41 @@
+from streamlit.testing.v1 import AppTest
+
+from conftest import page_path
+
+
+def run_learning_page():
+    at = AppTest.from_file(page_path("pages/learning_mode.py"), default_timeout=30)
+    at.run()
+    assert not at.exception
+    return at
+
+
+# 현재 문제의 문제 번호
+def current_number(at):
+    view = at.session_state["learning_questions"]
+    return view.bank.numbers[view.position(at.session_state["current_learning_index"])]
+
+
+def test_jump_goes_to_question_number_in_shuffled_list():
+    at = run_learning_page()
+    [b for b in at.button if b.label == "문제 섞기"][0].click().run()
+    assert at.session_state["learning_questions"].shuffle_seed is not None
+
+    for number in (1, 5, 12):
+        at.number_input(key="learning_jump_number").set_value(number).run()
+        at.button(key="learning_jump_btn").click().run()
+
+        assert not at.exception, [e.message for e in at.exception]
+        assert current_number(at) == number
+
+
+def test_jump_to_missing_number_stays_put():
+    at = run_learning_page()
+    index = at.session_state["current_learning_index"]
+
+    at.number_input(key="learning_jump_number").set_value(99).run()
+    at.button(key="learning_jump_btn").click().run()
+
+    assert not at.exception
+    assert at.session_state["current_learning_index"] == index
+    assert any("99번" in toast.value for toast in at.toast)
@@ -0,0 +1,57 @@
+from quiz.bank import QuestionBank
+from quiz.review import DAY, QUALITY_CORRECT, QUALITY_WRONG, RELEARN_DELAY, ReviewScheduler
+
+from conftest import make_questions
+
+NOW = 1_000_000
+
+
+def test_sm2_intervals_grow_and_reset_on_a_wrong_answer():
+    scheduler = ReviewScheduler()
+
+    assert scheduler.review(1, QUALITY_CORRECT, NOW) == NOW + DAY
+    assert scheduler.review(1, QUALITY_CORRECT, NOW) == NOW + 6 * DAY
+    _, interval, easiness, repetitions = scheduler.state(1)
+    assert (interval, easiness, repetitions) == (6.0, 2.5, 2)
+    third = scheduler.review(1, QUALITY_CORRECT, NOW)
+    assert third == NOW + int(6 * 2.5 * DAY)
+
+    assert scheduler.review(1, QUALITY_WRONG, NOW) == NOW + RELEARN_DELAY
+    _, interval, easiness, repetitions = scheduler.state(1)
+    assert (interval, repetitions) == (0.0, 0)
+    assert easiness < 2.5
+
+
+def test_due_questions_come_first_then_new_ones_in_number_order():
+    bank = QuestionBank(make_questions())
+    scheduler = ReviewScheduler()
+    scheduler.review(3, QUALITY_CORRECT, NOW)
+    scheduler.review(7, QUALITY_WRONG, NOW)
+    scheduler.review(5, QUALITY_WRONG, NOW + 60)
+
+    # 복습 시각 전에는 아직 풀지 않은 문제를 번호 순서대로
+    assert scheduler.next_number(bank, NOW) == 1
+    # 복습 시각이 먼저 된 문제부터, 지금 보고 있는 문제는 건너뜀
+    later = NOW + RELEARN_DELAY + 120
+    assert scheduler.next_number(bank, later) == 7
+    assert scheduler.next_number(bank, later, exclude=7) == 5
+    assert scheduler.due_count(later) == 2
+
+    # 다시 예약한 문제의 이전 힙 항목은 버림
+    scheduler.review(7, QUALITY_CORRECT, later)
+    assert scheduler.next_number(bank, later) == 5
+    assert scheduler.next_due() == NOW + 60 + RELEARN_DELAY
+
+
+def test_missing_numbers_are_skipped_and_payload_round_trips():
+    scheduler = ReviewScheduler()
+    scheduler.review(2, QUALITY_WRONG, NOW)
+    scheduler.review(4, QUALITY_WRONG, NOW + 1)
+    # 2번이 빠진 문제 은행
+    bank = QuestionBank([q for q in make_questions() if q['number'] != '2'])
+
+    assert scheduler.next_number(bank, NOW + DAY) == 4
+
+    restored = ReviewScheduler.from_payload(scheduler.to_payload())
+    assert [restored.state(n) for n in (2, 4)] == [scheduler.state(n) for n in (2, 4)]
+    assert restored.next_number(QuestionBank(make_questions()), NOW + DAY) == 2
@@ -0,0 +1,50 @@
+import random
+
+import pytest
+
+from quiz.bank import QuestionBank
+from quiz.sampling import QuestionWeights, sample_questions, weighted_sample
+from quiz.selection import IntervalSet
+
+
+def make_bank(count=100, multi_every=4):
+    return QuestionBank([
+        {'number': str(number), 'answer': 'A,B' if number % multi_every == 0 else 'A'}
+        for number in range(1, count + 1)
+    ])
+
+
+def test_same_seed_draws_same_questions():
+    bank = make_bank()
+    selection = IntervalSet([(1, 60)])
+    first = sample_questions(bank, selection, 20, multi_ratio=0.25)
+    again = sample_questions(bank, selection, 20, multi_ratio=0.25, seed=first.seed)
+
+    assert again.selection == first.selection
+    assert len(first.selection) == 20
+    assert (first.single_count, first.multi_count) == (15, 5)
+    assert all(number in selection for number in first.selection)
+
+
+def test_weighted_sample_rejects_more_than_positive_weights():
+    # 기본 가중치 0 - 가중치가 있는 두 순위만 뽑을 수 있음
+    with pytest.raises(ValueError):
+        weighted_sample(100, 3, {5: 1.0, 7: 2.0}, 0.0, random.Random(1))
+    # 명시한 가중치 0 - 2k <= n인 버리기 경로
+    with pytest.raises(ValueError):
+        weighted_sample(10, 5, {i: 0.0 for i in range(6)}, 1.0, random.Random(1))
+
+    assert weighted_sample(100, 2, {5: 1.0, 7: 2.0}, 0.0, random.Random(1)) == {5, 7}
+    assert weighted_sample(10, 4, {i: 0.0 for i in range(6)}, 1.0, random.Random(1)) == {6, 7, 8, 9}
+
+
+def test_sample_questions_skips_zero_weight_questions():
+    bank = make_bank()
+    weights = QuestionWeights([3, 12, 50], [1.0, 1.0, 1.0], default=0.0)
+
+    sample = sample_questions(bank, IntervalSet([(1, 100)]), 20, weights=weights, seed=7)
+
+    assert list(sample.selection) == [3, 12, 50]
+    stratified = sample_questions(bank, IntervalSet([(1, 100)]), 20, multi_ratio=0.5, weights=weights, seed=7)
+    assert list(stratified.selection) == [3, 12, 50]
+    assert (stratified.single_count, stratified.multi_count) == (2, 1)
@@ -0,0 +1,58 @@
+import pytest
+
+from quiz import session_store
+from quiz.bank import QuestionBank
+from quiz.session_store import SQLiteSessionStore, decode_state, encode_state, merge_documents
+from quiz.views import QuestionView
+
+from conftest import make_questions
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1_000_000.0]
+    monkeypatch.setattr(session_store.time, 'time', lambda: now[0])
+    return now
+
+
+def test_gc_drops_sessions_past_ttl(tmp_path, clock):
+    store = SQLiteSessionStore(str(tmp_path / "sessions.db"), ttl=3600)
+    store.save("user_old", {'values': {}})
+    clock[0] += 1800
+    store.save("user_new", {'values': {}})
+
+    store.gc(clock[0] + 2400)
+
+    assert store.load("user_old") is None
+    assert store.load("user_new") == {'values': {}}
+
+
+def test_gc_drops_oldest_sessions_over_size_limit(tmp_path, clock):
+    store = SQLiteSessionStore(str(tmp_path / "sessions.db"))
+    for i in range(4):
+        clock[0] += 1
+        # 압축해도 줄지 않는 값으로 세션마다 비슷한 크기
+        store.save(f"user_{i}", {'values': {'blob': session_store.secrets.token_hex(500)}})
+    store.max_bytes = 2 * store._connect().execute("SELECT MAX(size) FROM sessions").fetchone()[0]
+
+    store.gc(clock[0])
+
+    assert [store.load(f"user_{i}") is not None for i in range(4)] == [False, False, True, True]
+
+
+def test_merge_keeps_other_keys_and_drops_positions_from_another_bank(tmp_path):
+    store = SQLiteSessionStore(str(tmp_path / "sessions.db"))
+    bank = QuestionBank(make_questions(), version=1)
+    state = {'learning_questions': QuestionView(bank).shuffled(7), 'exam_time_limit': 600}
+    store.save("user_a", encode_state(state, bank))
+
+    store.merge("user_a", encode_state({'current_learning_index': 3}, bank, keys=('current_learning_index',)))
+    restored = decode_state(store.load("user_a"), bank)
+    assert restored['current_learning_index'] == 3
+    assert restored['exam_time_limit'] == 600
+    assert list(restored['learning_questions'].positions) == list(state['learning_questions'].positions)
+
+    # 문제 은행이 바뀌면 위치 기반 값만 버림
+    other = QuestionBank(make_questions(20), version=2)
+    merged = merge_documents(store.load("user_a"), encode_state({'exam_timed_out': True}, other))
+    assert set(decode_state(merged, other)) == {'current_learning_index', 'exam_time_limit', 'exam_timed_out'}
@@ -0,0 +1,48 @@
+from quiz.grading import option_bit
+from quiz.stats import StatsStore, hardest_selection
+
+A, B, C = (option_bit(letter) for letter in 'ABC')
+
+
+def test_counters_add_up_across_flushes(tmp_path):
+    store = StatsStore(str(tmp_path / "stats.db"))
+    store.record("bank", 1, A, A)
+    store.record("bank", 1, A, B)
+    store.flush()
+    store.record("bank", 1, A, A | B)
+    store.record("bank", 2, B, B)
+    # 번호가 없거나 답하지 않은 문제는 세지 않음
+    store.record("bank", None, A, A)
+    store.record("bank", 2, B, 0)
+    store.flush()
+
+    assert sorted(store.question_rows("bank")) == [(1, 3, 1), (2, 1, 1)]
+    assert store.option_picks("bank", [1]) == {1: {'A': 2, 'B': 2}}
+    assert store.wrong_options("bank") == [(1, 'B', 2)]
+    assert store.totals("bank") == (2, 4, 2)
+
+
+def test_hardest_orders_by_accuracy_then_attempts(tmp_path):
+    store = StatsStore(str(tmp_path / "stats.db"))
+    for number, results in {5: [0, 0, 1], 6: [1, 1], 7: [0, 1], 8: [0, 0, 1, 1]}.items():
+        for correct in results:
+            store.record("bank", number, A, A if correct else C)
+    store.flush()
+
+    assert [number for number, _, _ in store.hardest("bank")] == [5, 8, 7, 6]
+    assert [number for number, _, _ in store.hardest("bank", min_attempts=3)] == [5, 8]
+    assert list(hardest_selection(store, "bank", limit=3)) == [5, 7, 8]
+
+
+def test_reset_clears_one_bank_including_pending_counters(tmp_path):
+    store = StatsStore(str(tmp_path / "stats.db"))
+    store.record("bank", 1, A, A)
+    store.record("other", 1, A, B)
+    store.flush()
+    store.record("bank", 2, A, A)
+
+    store.reset("bank")
+    store.flush()
+
+    assert store.totals("bank") == (0, 0, 0)
+    assert store.question_rows("other") == [(1, 1, 0)]
@@ -0,0 +1,31 @@
+import numpy as np
+
+from quiz.bank import QuestionBank
+from quiz.views import QuestionView
+
+from conftest import make_questions
+
+
+def test_shuffled_view_accepts_numpy_indexes():
+    view = QuestionView(QuestionBank(make_questions())).shuffled(12345)
+    indexes = np.flatnonzero(np.ones(len(view), dtype=bool))
+
+    assert [view.position(i) for i in indexes] == list(view.positions)
+    assert view[np.int64(-1)] is view[len(view) - 1]
+    assert sorted(view.position(i) for i in indexes) == list(range(len(view)))
+
+
+def test_shuffle_seed_reproduces_order():
+    bank = QuestionBank(make_questions())
+    view = QuestionView(bank).shuffled()
+
+    assert list(QuestionView(bank).shuffled(view.shuffle_seed).positions) == list(view.positions)
+    assert view.shuffled(view.shuffle_seed).shuffle_seed == view.shuffle_seed
+
+
+def test_index_of_finds_positions_in_shuffled_view():
+    view = QuestionView(QuestionBank(make_questions())).shuffled(987)
+
+    assert [view.index_of(view.position(i)) for i in range(len(view))] == list(range(len(view)))
+    assert view.index_of(len(view)) is None
+    assert view.unshuffled().index_of(3) == 3